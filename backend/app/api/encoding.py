@@ -0,0 +1,164 @@
+"""Content negotiation and columnar response encodings."""
+
+import datetime
+import functools
+import importlib
+import importlib.util
+import io
+import json
+from typing import Any
+
+import numpy as np
+from fastapi import HTTPException, Response
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.etf-simulator.columnar+json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Media types that may be requested under another name
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK}
+
+# Optional modules each encoding needs
+ENCODING_MODULES = {COLUMNAR_JSON: None, MSGPACK: "msgpack", ARROW: "pyarrow"}
+
+# OpenAPI documentation of the alternative response encodings
+COLUMNAR_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {media_type: {} for media_type in ENCODING_MODULES}}
+}
+
+Columns = dict[str, np.ndarray | list]
+
+
+def negotiate(accept: str | None) -> str:
+    """
+    Pick the response media type for an Accept header.
+
+    Plain JSON answers wildcards and missing headers. Binary encodings are
+    only offered when their optional dependency is installed.
+
+    Args:
+        accept: Accept header value
+
+    Returns:
+        Selected media type
+
+    Raises:
+        HTTPException: If no acceptable media type is supported
+    """
+    if not accept:
+        return JSON
+
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            ranges.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(ranges):
+        media_type = MEDIA_TYPE_ALIASES.get(media_type, media_type)
+        if media_type in (JSON, "application/*", "*/*"):
+            return JSON
+        if media_type in ENCODING_MODULES and _is_available(media_type):
+            return media_type
+
+    supported = [JSON] + [
+        media_type for media_type in ENCODING_MODULES if _is_available(media_type)
+    ]
+    raise HTTPException(
+        status_code=406,
+        detail=f"Supported media types: {', '.join(supported)}",
+    )
+
+
+def model_columns(items: list[Any], fields: list[str]) -> Columns:
+    """
+    Transpose model instances into one list per field.
+
+    Args:
+        items: Model instances
+        fields: Field names to extract
+
+    Returns:
+        Column values by field name
+    """
+    return {field: [getattr(item, field) for item in items] for field in fields}
+
+
+def columnar_response(
+    media_type: str, fields: dict[str, Any], table: str, columns: Columns
+) -> Response:
+    """
+    Encode a response holding one table in a columnar media type.
+
+    In JSON and MessagePack the table is an object of equally long arrays
+    next to the other fields. In Arrow IPC the table is the record batch
+    stream and the other fields are JSON values in the schema metadata.
+
+    Args:
+        media_type: Media type returned by `negotiate`, other than JSON
+        fields: JSON-compatible top-level fields besides the table
+        table: Name of the table field
+        columns: Table column values by name
+
+    Returns:
+        Encoded response
+    """
+    if media_type == ARROW:
+        content = _encode_arrow(fields, columns)
+    else:
+        document = {
+            **fields,
+            table: {name: _plain_values(values) for name, values in columns.items()},
+        }
+        if media_type == MSGPACK:
+            msgpack = importlib.import_module("msgpack")
+            content = msgpack.packb(document)
+        else:
+            content = json.dumps(document, separators=(",", ":")).encode()
+
+    return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
+
+
+@functools.cache
+def _is_available(media_type: str) -> bool:
+    """Check whether the optional module of an encoding is installed."""
+    module = ENCODING_MODULES[media_type]
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _plain_values(values: np.ndarray | list) -> list:
+    """Convert column values to JSON-compatible Python values."""
+    if isinstance(values, np.ndarray):
+        if np.issubdtype(values.dtype, np.datetime64):
+            return np.datetime_as_string(values, unit="D").tolist()
+        return values.tolist()
+
+    return [
+        value.isoformat() if isinstance(value, datetime.date) else value
+        for value in values
+    ]
+
+
+def _encode_arrow(fields: dict[str, Any], columns: Columns) -> bytes:
+    """Encode a table as an Arrow IPC stream."""
+    pa = importlib.import_module("pyarrow")
+
+    table = pa.table({name: pa.array(values) for name, values in columns.items()})
+    table = table.replace_schema_metadata(
+        {name: json.dumps(value) for name, value in fields.items()}
+    )
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue()
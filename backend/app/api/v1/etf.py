@@ -1,21 +1,40 @@
 """ETF API endpoints."""
 
-from datetime import date
+import itertools
+import json
+from collections.abc import Iterator
+from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.models.etf import ETFDetail, ETFHistory, ETFSearchResponse
+from app.api.encoding import COLUMNAR_RESPONSES, JSON, columnar_response, negotiate
+from app.db.database import SessionLocal, get_async_db
+from app.models.etf import (
+    ETFDetail,
+    ETFHistory,
+    ETFSearchResponse,
+    PriceData,
+    Resolution,
+)
+from app.services.async_etf_service import AsyncETFService
 from app.services.etf_service import ETFService
+from app.services.price_panel import PriceSeries
+from app.utils.downsampling import downsample_rows
 
 router = APIRouter(prefix="/etf", tags=["etf"])
 
+# Maximum number of prices per history page
+MAX_PAGE_SIZE = 5000
+
 
 @router.get("/search", response_model=ETFSearchResponse)
-def search_etfs(
+async def search_etfs(
     q: str = Query(..., min_length=1, description="Search query"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> ETFSearchResponse:
     """
     Search for ETFs by ticker or name.
@@ -27,15 +46,15 @@ def search_etfs(
     Returns:
         List of matching ETF search results
     """
-    service = ETFService(db)
-    results = service.search_etfs(q)
+    service = AsyncETFService(db)
+    results = await service.search_etfs(q)
     return ETFSearchResponse(results=results)
 
 
 @router.get("/{ticker}", response_model=ETFDetail)
-def get_etf_detail(
+async def get_etf_detail(
     ticker: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> ETFDetail:
     """
     Get detailed information about an ETF.
@@ -47,8 +66,8 @@ def get_etf_detail(
     Returns:
         ETF detail information
     """
-    service = ETFService(db)
-    etf_detail = service.get_etf_detail(ticker)
+    service = AsyncETFService(db)
+    etf_detail = await service.get_etf_detail(ticker)
 
     if not etf_detail:
         raise HTTPException(status_code=404, detail=f"ETF {ticker} not found")
@@ -56,20 +75,57 @@ def get_etf_detail(
     return etf_detail
 
 
-@router.get("/{ticker}/history", response_model=ETFHistory)
-def get_etf_history(
+@router.get(
+    "/{ticker}/history", response_model=ETFHistory, responses=COLUMNAR_RESPONSES
+)
+async def get_etf_history(
     ticker: str,
+    response: Response,
     start: date = Query(..., description="Start date"),
     end: date = Query(..., description="End date"),
-    db: Session = Depends(get_db),
-) -> ETFHistory:
+    cursor: date | None = Query(
+        None, description="Return prices after this date (next_cursor of a page)"
+    ),
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of prices"
+    ),
+    stream: bool = Query(False, description="Stream all prices as NDJSON"),
+    resolution: Resolution = Query(Resolution.DAILY, description="Price resolution"),
+    max_points: int | None = Query(
+        None, ge=3, description="Maximum number of prices (LTTB downsampled)"
+    ),
+    accept: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> ETFHistory | Response:
     """
     Get price history for an ETF.
 
+    With `limit`, prices are returned in pages; pass the returned
+    `next_cursor` as `cursor` to get the next one. With `stream`, all
+    prices are streamed as newline-delimited JSON objects read through a
+    server-side cursor, so memory use does not grow with the range.
+
+    With a coarser `resolution` only the first price of each period and
+    the last price are returned, and `max_points` further reduces them
+    while keeping the shape of the chart. Dividends of the dropped days
+    are added to the preceding returned price. Downsampling works on the
+    whole range, so it cannot be combined with paging or streaming.
+
+    Outside of streaming, the `Accept` header selects the encoding: JSON
+    rows by default, or prices as one array per field in columnar JSON,
+    MessagePack or Arrow IPC.
+
     Args:
         ticker: ETF ticker symbol
+        response: Response headers
         start: Start date
         end: End date
+        cursor: Date after which the page starts
+        limit: Page size
+        stream: Whether to stream the prices as NDJSON
+        resolution: Price resolution
+        max_points: Maximum number of prices
+        accept: Accept header
         db: Database session
 
     Returns:
@@ -80,12 +136,125 @@ def get_etf_history(
             status_code=400, detail="Start date must be before end date"
         )
 
-    service = ETFService(db)
-    prices = service.get_price_history(ticker, start, end)
+    is_downsampled = resolution != Resolution.DAILY or max_points is not None
+    if is_downsampled and (stream or limit is not None or cursor is not None):
+        raise HTTPException(
+            status_code=400,
+            detail="resolution and max_points cannot be combined with paging",
+        )
+
+    media_type = JSON if stream else negotiate(accept)
 
-    if not prices:
+    if cursor is not None:
+        start = max(start, cursor + timedelta(days=1))
+
+    service = AsyncETFService(db)
+
+    if stream:
+        await service.prefetch_price_history([ticker], start, end)
+        chunks = _stream_price_chunks(ticker, start, end)
+        first_chunk = await run_in_threadpool(next, chunks, None)
+        if first_chunk is None and cursor is None:
+            raise HTTPException(
+                status_code=404, detail=f"No price data found for {ticker}"
+            )
+
+        return StreamingResponse(
+            itertools.chain([first_chunk or ""], chunks),
+            media_type="application/x-ndjson",
+        )
+
+    # One extra row tells whether there is a next page
+    series = await service.get_price_history(
+        ticker, start, end, limit + 1 if limit is not None else None
+    )
+
+    if len(series) == 0 and cursor is None:
         raise HTTPException(
             status_code=404, detail=f"No price data found for {ticker}"
         )
 
-    return ETFHistory(ticker=ticker, prices=prices)
+    next_cursor = None
+    if limit is not None and len(series) > limit:
+        next_cursor = series.dates[limit - 1].item()
+        series = series.between(start, next_cursor)
+
+    if is_downsampled:
+        series = _downsample_series(series, resolution, max_points)
+
+    if media_type != JSON:
+        return columnar_response(
+            media_type,
+            fields={
+                "ticker": ticker,
+                "next_cursor": next_cursor.isoformat() if next_cursor else None,
+            },
+            table="prices",
+            columns={
+                "date": series.dates,
+                "close": series.close,
+                "adj_close": series.adj_close,
+                "dividend": series.dividend,
+            },
+        )
+
+    response.headers["Vary"] = "Accept"
+    prices = [
+        PriceData(date=day, close=close, adj_close=adj_close, dividend=dividend)
+        for day, close, adj_close, dividend in _price_rows(series)
+    ]
+
+    return ETFHistory(ticker=ticker, prices=prices, next_cursor=next_cursor)
+
+
+def _price_rows(series: PriceSeries) -> Iterator[tuple[date, float, float, float]]:
+    """Iterate over (date, close, adj_close, dividend) rows of a series."""
+    return zip(
+        series.dates.tolist(),
+        series.close.tolist(),
+        series.adj_close.tolist(),
+        series.dividend.tolist(),
+    )
+
+
+def _downsample_series(
+    series: PriceSeries, resolution: Resolution, max_points: int | None
+) -> PriceSeries:
+    """Keep the rows of a series at a resolution, summing skipped dividends."""
+    rows = downsample_rows(series.dates, series.adj_close, resolution, max_points)
+    if len(rows) == 0:
+        return series
+
+    return PriceSeries(
+        ticker=series.ticker,
+        dates=series.dates[rows],
+        adj_close=series.adj_close[rows],
+        close=series.close[rows],
+        dividend=np.add.reduceat(series.dividend, rows),
+    )
+
+
+def _stream_price_chunks(ticker: str, start: date, end: date) -> Iterator[str]:
+    """
+    Serialize stored prices as NDJSON, one chunk of lines at a time.
+
+    The generator outlives the request, so it uses its own database
+    session.
+    """
+    db = SessionLocal()
+    try:
+        for series in ETFService(db).stream_price_history(ticker, start, end):
+            yield "".join(
+                json.dumps(
+                    {
+                        "date": day.isoformat(),
+                        "close": close,
+                        "adj_close": adj_close,
+                        "dividend": dividend,
+                    }
+                )
+                + "\n"
+                for day, close, adj_close, dividend in _price_rows(series)
+            )
+    finally:
+        db.close()
@@ -0,0 +1,114 @@
+"""Background simulation job API endpoints."""
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.api.encoding import JSON
+from app.core.config import settings
+from app.db.database import get_db
+from app.db.models import SimulationJob
+from app.models.job import JobKind, JobResponse, JobStatus, JobSubmission
+from app.services.job_service import JobService
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+def submit_job(
+    response: Response,
+    submission: JobSubmission = Body(...),
+    db: Session = Depends(get_db),
+) -> JobResponse:
+    """
+    Queue a simulation to run in the background.
+
+    The request body holds the job kind and the request of the matching
+    simulation endpoint. Poll the returned job for progress and fetch its
+    result once it succeeded.
+
+    Args:
+        response: Response headers
+        submission: Job kind and simulation request
+        db: Database session
+
+    Returns:
+        Queued job
+    """
+    request = submission.request
+    if request.start_date >= request.end_date:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before end date"
+        )
+
+    job = JobService(db).submit(submission.kind, request)
+
+    response.headers["Location"] = f"{settings.api_v1_prefix}/jobs/{job.id}"
+    return _job_response(job)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_db)) -> JobResponse:
+    """
+    Get the status and progress of a job.
+
+    Args:
+        job_id: Job ID
+        db: Database session
+
+    Returns:
+        Job status
+    """
+    return _job_response(_find_job(db, job_id))
+
+
+@router.get(
+    "/{job_id}/result",
+    responses={
+        200: {
+            "description": "Response of the simulation endpoint of the job kind",
+            "content": {JSON: {}},
+        }
+    },
+)
+def get_job_result(job_id: str, db: Session = Depends(get_db)) -> Response:
+    """
+    Get the result of a succeeded job.
+
+    Args:
+        job_id: Job ID
+        db: Database session
+
+    Returns:
+        Simulation response stored by the job
+    """
+    job = _find_job(db, job_id)
+
+    if job.status == JobStatus.FAILED.value:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != JobStatus.SUCCEEDED.value:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    return Response(content=job.result, media_type=JSON)
+
+
+def _find_job(db: Session, job_id: str) -> SimulationJob:
+    """Get a job or raise 404 if it does not exist or has expired."""
+    job = JobService(db).get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+def _job_response(job: SimulationJob) -> JobResponse:
+    """Convert a job row to its API model."""
+    return JobResponse(
+        id=job.id,
+        kind=JobKind(job.kind),
+        status=JobStatus(job.status),
+        progress=job.progress,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        expires_at=job.expires_at,
+    )
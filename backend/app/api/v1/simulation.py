@@ -1,31 +1,57 @@
 """Simulation API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.api.encoding import (
+    COLUMNAR_RESPONSES,
+    JSON,
+    columnar_response,
+    model_columns,
+    negotiate,
+)
+from app.db.database import get_async_db
 from app.models.simulation import (
     ComparisonRequest,
     ComparisonResponse,
+    MonteCarloRequest,
+    MonteCarloResponse,
+    MonthlySnapshot,
+    RollingWindowRequest,
+    RollingWindowResponse,
+    RollingWindowResult,
     ScenarioResult,
     SimulationRequest,
     SimulationResponse,
+    WeightGridPoint,
+    WeightGridRequest,
+    WeightGridResponse,
 )
-from app.services.simulation_service import SimulationService
+from app.services.async_simulation_service import AsyncSimulationService
 
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
 
-@router.post("/run", response_model=SimulationResponse)
-def run_simulation(
+@router.post(
+    "/run", response_model=SimulationResponse, responses=COLUMNAR_RESPONSES
+)
+async def run_simulation(
     request: SimulationRequest,
-    db: Session = Depends(get_db),
-) -> SimulationResponse:
+    response: Response,
+    accept: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> SimulationResponse | Response:
     """
     Run investment simulation.
 
+    The `Accept` header selects the encoding: JSON rows by default, or
+    monthly data as one array per field in columnar JSON, MessagePack or
+    Arrow IPC.
+
     Args:
         request: Simulation request parameters
+        response: Response headers
+        accept: Accept header
         db: Database session
 
     Returns:
@@ -36,9 +62,11 @@ def run_simulation(
             status_code=400, detail="Start date must be before end date"
         )
 
+    media_type = negotiate(accept)
+
     try:
-        service = SimulationService(db)
-        summary, monthly_data = service.run_simulation(
+        service = AsyncSimulationService(db)
+        summary, monthly_data = await service.run_simulation(
             portfolio=request.portfolio,
             investment_type=request.investment_type,
             initial_amount=request.initial_amount,
@@ -46,8 +74,22 @@ def run_simulation(
             start_date=request.start_date,
             end_date=request.end_date,
             rebalancing=request.rebalancing,
+            engine=request.engine,
+            resolution=request.resolution,
+            max_points=request.max_points,
         )
 
+        if media_type != JSON:
+            return columnar_response(
+                media_type,
+                fields={"summary": summary.model_dump()},
+                table="monthly_data",
+                columns=model_columns(
+                    monthly_data, list(MonthlySnapshot.model_fields)
+                ),
+            )
+
+        response.headers["Vary"] = "Accept"
         return SimulationResponse(summary=summary, monthly_data=monthly_data)
 
     except ValueError as e:
@@ -58,16 +100,200 @@ def run_simulation(
         )
 
 
-@router.post("/compare", response_model=ComparisonResponse)
-def compare_scenarios(
+@router.post("/monte-carlo", response_model=MonteCarloResponse)
+async def run_monte_carlo(
+    request: MonteCarloRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> MonteCarloResponse:
+    """
+    Run a Monte Carlo simulation on bootstrapped historical returns.
+
+    Args:
+        request: Monte Carlo request parameters
+        db: Database session
+
+    Returns:
+        Percentile bands of final value, CAGR and MDD over all paths
+    """
+    if request.start_date >= request.end_date:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before end date"
+        )
+
+    try:
+        service = AsyncSimulationService(db)
+        return await service.run_monte_carlo(
+            portfolio=request.portfolio,
+            investment_type=request.investment_type,
+            initial_amount=request.initial_amount,
+            monthly_contribution=request.monthly_contribution,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalancing=request.rebalancing,
+            horizon_years=request.horizon_years,
+            num_paths=request.num_paths,
+            block_days=request.block_days,
+            seed=request.seed,
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Monte Carlo simulation failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/rolling", response_model=RollingWindowResponse, responses=COLUMNAR_RESPONSES
+)
+async def run_rolling_windows(
+    request: RollingWindowRequest,
+    response: Response,
+    accept: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> RollingWindowResponse | Response:
+    """
+    Backtest a portfolio from every start month over a fixed horizon.
+
+    The `Accept` header selects the encoding of the windows as for
+    `/run`.
+
+    Args:
+        request: Rolling window request parameters
+        response: Response headers
+        accept: Accept header
+        db: Database session
+
+    Returns:
+        Outcome of every window and percentiles over all windows
+    """
+    if request.start_date >= request.end_date:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before end date"
+        )
+
+    media_type = negotiate(accept)
+
+    try:
+        service = AsyncSimulationService(db)
+        result = await service.run_rolling_windows(
+            portfolio=request.portfolio,
+            investment_type=request.investment_type,
+            initial_amount=request.initial_amount,
+            monthly_contribution=request.monthly_contribution,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalancing=request.rebalancing,
+            horizon_years=request.horizon_years,
+        )
+
+        if media_type != JSON:
+            return columnar_response(
+                media_type,
+                fields=result.model_dump(mode="json", exclude={"windows"}),
+                table="windows",
+                columns=model_columns(
+                    result.windows, list(RollingWindowResult.model_fields)
+                ),
+            )
+
+        response.headers["Vary"] = "Accept"
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Rolling window backtest failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/weight-grid", response_model=WeightGridResponse, responses=COLUMNAR_RESPONSES
+)
+async def run_weight_grid(
+    request: WeightGridRequest,
+    response: Response,
+    accept: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> WeightGridResponse | Response:
+    """
+    Simulate every allocation of a weight grid over a set of tickers.
+
+    The `Accept` header selects the encoding of the grid points as for
+    `/run`.
+
+    Args:
+        request: Weight grid request parameters
+        response: Response headers
+        accept: Accept header
+        db: Database session
+
+    Returns:
+        Final value, CAGR and MDD of every allocation
+    """
+    if request.start_date >= request.end_date:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before end date"
+        )
+
+    media_type = negotiate(accept)
+
+    try:
+        service = AsyncSimulationService(db)
+        result = await service.run_weight_grid(
+            tickers=request.tickers,
+            step_pct=request.step_pct,
+            investment_type=request.investment_type,
+            initial_amount=request.initial_amount,
+            monthly_contribution=request.monthly_contribution,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalancing=request.rebalancing,
+        )
+
+        if media_type != JSON:
+            return columnar_response(
+                media_type,
+                fields=result.model_dump(mode="json", exclude={"points"}),
+                table="points",
+                columns=model_columns(
+                    result.points, list(WeightGridPoint.model_fields)
+                ),
+            )
+
+        response.headers["Vary"] = "Accept"
+        return result
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Weight grid sweep failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/compare", response_model=ComparisonResponse, responses=COLUMNAR_RESPONSES
+)
+async def compare_scenarios(
     request: ComparisonRequest,
-    db: Session = Depends(get_db),
-) -> ComparisonResponse:
+    response: Response,
+    accept: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> ComparisonResponse | Response:
     """
     Compare multiple investment scenarios.
 
+    The `Accept` header selects the encoding: JSON rows by default, or
+    scenarios as one array per field in columnar JSON, MessagePack or
+    Arrow IPC.
+
     Args:
         request: Comparison request with multiple scenarios
+        response: Response headers
+        accept: Accept header
         db: Database session
 
     Returns:
@@ -78,31 +304,42 @@ def compare_scenarios(
             status_code=400, detail="Start date must be before end date"
         )
 
+    media_type = negotiate(accept)
+
     try:
-        service = SimulationService(db)
-        results = []
-
-        for scenario in request.scenarios:
-            summary, _ = service.run_simulation(
-                portfolio=scenario.portfolio,
-                investment_type=scenario.investment_type,
-                initial_amount=scenario.initial_amount,
-                monthly_contribution=scenario.monthly_contribution,
-                start_date=request.start_date,
-                end_date=request.end_date,
-                rebalancing=request.rebalancing,
+        service = AsyncSimulationService(db)
+        summaries = await service.run_batch(
+            scenarios=request.scenarios,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalancing=request.rebalancing,
+        )
+
+        if media_type != JSON:
+            # Every scenario result field but the name comes from the summary
+            summary_fields = list(ScenarioResult.model_fields)[1:]
+            return columnar_response(
+                media_type,
+                fields={},
+                table="scenarios",
+                columns={
+                    "name": [scenario.name for scenario in request.scenarios],
+                    **model_columns(summaries, summary_fields),
+                },
             )
 
-            results.append(
-                ScenarioResult(
-                    name=scenario.name,
-                    final_value=summary.final_value,
-                    total_invested=summary.total_invested,
-                    total_return_pct=summary.total_return_pct,
-                    cagr=summary.cagr,
-                    mdd=summary.mdd,
-                )
+        response.headers["Vary"] = "Accept"
+        results = [
+            ScenarioResult(
+                name=scenario.name,
+                final_value=summary.final_value,
+                total_invested=summary.total_invested,
+                total_return_pct=summary.total_return_pct,
+                cagr=summary.cagr,
+                mdd=summary.mdd,
             )
+            for scenario, summary in zip(request.scenarios, summaries)
+        ]
 
         return ComparisonResponse(scenarios=results)
 
@@ -25,8 +25,43 @@ class Settings(BaseSettings):
     api_v1_prefix: str = "/api/v1"
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:3001"]
 
+    # Market data
+    market_data_provider: str = "yfinance"  # "yfinance", "yahoo_chart" or "local"
+    market_data_dir: str = "data/market"
+    price_fetch_concurrency: int = 4
+    # Serialize fetches of the same price history across workers (PostgreSQL)
+    price_fetch_advisory_lock: bool = False
+
     # Cache
     cache_ttl_seconds: int = 86400  # 24 hours
+    etf_metadata_ttl_seconds: int = 7 * 86400  # 7 days
+    price_cache_max_bytes: int = 256 * 1024 * 1024
+    price_cache_dir: str = "/tmp/etf-simulator/price-cache"  # "" disables
+    price_store_dir: str = "/tmp/etf-simulator/price-store"  # "" disables
+    simulation_cache_max_entries: int = 1024
+    search_index_refresh_seconds: int = 300
+
+    # Threads running simulations for async endpoints
+    simulation_threads: int = 8
+
+    # Process pool for Monte Carlo and grid sweeps
+    process_pool_workers: int = 4  # 0 simulates in the request thread
+    process_chunk_bytes: int = 128 * 1024 * 1024
+
+    # Background simulation jobs
+    job_workers: int = 2
+    job_result_ttl_seconds: int = 86400  # 24 hours
+    job_lease_seconds: int = 60  # running jobs without a heartbeat are requeued
+
+    # Startup
+    auto_create_tables: bool = True  # false: run `python -m app.db.schema`
+    startup_budget_seconds: float = 10.0
+
+    # Warm-up and daily refresh of popular and most requested tickers
+    warmup_enabled: bool = True
+    warmup_top_tickers: int = 20
+    warmup_history_years: int = 20
+    warmup_refresh_hour_utc: int = 22  # after the US market close
 
     # Rate Limiting
     rate_limit_per_minute: int = 60
@@ -0,0 +1,102 @@
+"""Application startup time measurement."""
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from app.core.config import settings
+
+
+def process_uptime() -> float | None:
+    """
+    Get the number of seconds since the current process started.
+
+    Returns:
+        Process uptime, or None where /proc is not available
+    """
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # Fields after the parenthesized command name start at field 3
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime_file:
+            system_uptime = float(uptime_file.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    start_ticks = int(fields[19])  # field 22, starttime
+    return system_uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+class StartupReport:
+    """
+    Durations of the steps run before the application serves requests.
+
+    Time spent before the lifespan starts, which is mostly interpreter
+    startup and imports, is measured from the process start time where the
+    OS reports it, and from the import of this module otherwise.
+    """
+
+    def __init__(self):
+        """Start measuring."""
+        self._imported_at = time.perf_counter()
+        self._imported_uptime = process_uptime()
+        self._steps: dict[str, float] = {}
+        self._boot_seconds: float | None = None
+        self._ready_seconds: float | None = None
+
+    def begin(self) -> None:
+        """Record the end of imports at the start of the lifespan."""
+        self._boot_seconds = self._elapsed()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Measure one startup step.
+
+        Args:
+            name: Step name shown in the report
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._steps[name] = round(time.perf_counter() - started, 3)
+
+    def finish(self) -> None:
+        """Record that the application is ready to serve requests."""
+        self._ready_seconds = self._elapsed()
+
+    def over_budget(self) -> bool:
+        """Check whether startup took longer than STARTUP_BUDGET_SECONDS."""
+        return (
+            self._ready_seconds is not None
+            and self._ready_seconds > settings.startup_budget_seconds
+        )
+
+    def report(self) -> dict[str, Any]:
+        """
+        Get the startup durations.
+
+        Returns:
+            Seconds until the lifespan started and until the application
+            was ready, the seconds of each startup step, and the budget
+        """
+        return {
+            "boot_seconds": self._boot_seconds,
+            "ready_seconds": self._ready_seconds,
+            "steps": dict(self._steps),
+            "budget_seconds": settings.startup_budget_seconds,
+        }
+
+    def _elapsed(self) -> float:
+        """Get the seconds since the process, or this module, started."""
+        elapsed = time.perf_counter() - self._imported_at
+        if self._imported_uptime is not None:
+            elapsed += self._imported_uptime
+        return round(elapsed, 3)
+
+
+# Startup durations of this process
+startup_report = StartupReport()
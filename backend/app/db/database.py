@@ -1,10 +1,41 @@
 """Database connection and session management."""
 
+from collections.abc import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.config import settings
 
+# Async driver used for each database backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Get the async driver variant of a database URL.
+
+    Args:
+        database_url: SQLAlchemy URL using a sync driver
+
+    Returns:
+        The same URL with the async driver of its backend
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for database {url.get_backend_name()}")
+
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
@@ -15,6 +46,16 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory for async endpoints
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    pool_pre_ping=True,
+    echo=settings.debug,
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
@@ -29,3 +70,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Get async database session dependency."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,69 @@
+"""Database advisory locks shared by all workers."""
+
+import hashlib
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from sqlalchemy import Engine, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def advisory_lock_key(name: str) -> int:
+    """
+    Map a lock name to a PostgreSQL advisory lock key.
+
+    Args:
+        name: Lock name
+
+    Returns:
+        Signed 64-bit key
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@contextmanager
+def advisory_lock(engine: Engine, names: list[str]) -> Iterator[None]:
+    """
+    Hold transaction-level advisory locks for the duration of the block.
+
+    Locks are taken in key order, so callers locking overlapping names
+    cannot deadlock, on a dedicated connection whose transaction ends with
+    the block. Databases other than PostgreSQL have no advisory locks and
+    the block runs unlocked.
+
+    Args:
+        engine: Database engine
+        names: Lock names
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.begin() as connection:
+        for key in sorted({advisory_lock_key(name) for name in names}):
+            connection.execute(select(func.pg_advisory_xact_lock(key)))
+        yield
+
+
+@asynccontextmanager
+async def async_advisory_lock(
+    engine: AsyncEngine, names: list[str]
+) -> AsyncIterator[None]:
+    """
+    Hold transaction-level advisory locks without blocking the event loop.
+
+    See advisory_lock.
+
+    Args:
+        engine: Async database engine
+        names: Lock names
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    async with engine.begin() as connection:
+        for key in sorted({advisory_lock_key(name) for name in names}):
+            await connection.execute(select(func.pg_advisory_xact_lock(key)))
+        yield
@@ -48,3 +48,39 @@ class PriceHistory(Base):
     __table_args__ = (
         Index("ix_price_history_ticker_date", "ticker", "date", unique=True),
     )
+
+
+class PriceCoverage(Base):
+    """Date ranges of price history loaded per ticker."""
+
+    __tablename__ = "price_coverage"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ticker: Mapped[str] = mapped_column(String(10), nullable=False, index=True)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class SimulationJob(Base):
+    """Simulation run in the background job queue."""
+
+    __tablename__ = "simulation_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    progress: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    request: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    result: Mapped[str] = mapped_column(Text, nullable=True)  # JSON
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True, index=True)
+    worker_id: Mapped[str] = mapped_column(String(100), nullable=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
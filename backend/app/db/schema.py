@@ -0,0 +1,19 @@
+"""Database schema management."""
+
+import app.db.models  # noqa: F401  (registers the tables on Base.metadata)
+from app.db.database import Base, engine
+
+
+def create_tables() -> None:
+    """
+    Create tables missing from the database.
+
+    Existing tables are left as they are. Run as `python -m app.db.schema`
+    to create them before starting the server, for example when
+    AUTO_CREATE_TABLES is disabled for deployments with several replicas.
+    """
+    Base.metadata.create_all(bind=engine)
+
+
+if __name__ == "__main__":
+    create_tables()
@@ -1,20 +1,59 @@
 """FastAPI application main module."""
 
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1 import etf, simulation
+from app.api.v1 import etf, jobs, simulation
 from app.core.config import settings
-from app.db.database import Base, engine
+from app.core.startup import startup_report
+from app.db.database import async_engine
+from app.db.schema import create_tables
+from app.services.etf_service import price_fetch_flights
+from app.services.job_service import resume_jobs_in_session
+from app.services.price_cache import price_cache
+from app.services.result_cache import simulation_result_cache
+from app.services.warmup import price_warmup
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Prepare the database, resume background jobs and start the warm-up.
+
+    Each step is timed for the startup report. The warm-up is stopped and
+    async connections are closed on exit.
+    """
+    startup_report.begin()
+    if settings.auto_create_tables:
+        with startup_report.step("create_tables"):
+            create_tables()
+    with startup_report.step("resume_jobs"):
+        resume_jobs_in_session()
+    if settings.warmup_enabled:
+        price_warmup.start()
+    startup_report.finish()
+
+    if startup_report.over_budget():
+        logger.warning("Slow startup: %s", startup_report.report())
+
+    yield
+    price_warmup.stop()
+    await async_engine.dispose()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="ETF Investment Simulator Backend API",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -29,6 +68,7 @@ app.add_middleware(
 # Include routers
 app.include_router(etf.router, prefix=settings.api_v1_prefix)
 app.include_router(simulation.router, prefix=settings.api_v1_prefix)
+app.include_router(jobs.router, prefix=settings.api_v1_prefix)
 
 
 @app.get("/")
@@ -42,6 +82,20 @@ def root() -> dict[str, str]:
 
 
 @app.get("/health")
-def health_check() -> dict[str, str]:
-    """Health check endpoint."""
-    return {"status": "healthy"}
+def health_check() -> dict[str, Any]:
+    """Health check endpoint with startup durations and warm-up progress."""
+    return {
+        "status": "healthy",
+        "startup": startup_report.report(),
+        "warmup": price_warmup.status(),
+    }
+
+
+@app.get("/cache/stats")
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Cache statistics endpoint."""
+    return {
+        "price_series": price_cache.stats(),
+        "simulation_results": simulation_result_cache.stats(),
+        "price_fetches": price_fetch_flights.stats(),
+    }
@@ -1,10 +1,21 @@
 """ETF related Pydantic models for API."""
 
+import datetime
 from datetime import date
+from enum import Enum
 
 from pydantic import BaseModel, Field
 
 
+class Resolution(str, Enum):
+    """Time series resolution enum."""
+
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    QUARTERLY = "quarterly"
+
+
 class ETFBase(BaseModel):
     """Base ETF model."""
 
@@ -32,7 +43,7 @@ class ETFDetail(ETFBase):
 class PriceData(BaseModel):
     """Single price data point."""
 
-    date: date = Field(..., description="Date of the price")
+    date: datetime.date = Field(..., description="Date of the price")
     close: float = Field(..., description="Closing price")
     adj_close: float = Field(..., description="Adjusted closing price")
     dividend: float = Field(0.0, description="Dividend amount")
@@ -43,6 +54,9 @@ class ETFHistory(BaseModel):
 
     ticker: str = Field(..., description="ETF ticker symbol")
     prices: list[PriceData] = Field(..., description="List of price data")
+    next_cursor: date | None = Field(
+        None, description="Cursor of the next page, or None on the last page"
+    )
 
 
 class ETFSearchResponse(BaseModel):
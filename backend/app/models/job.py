@@ -0,0 +1,95 @@
+"""Background simulation job related Pydantic models for API."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+from app.models.simulation import (
+    ComparisonRequest,
+    MonteCarloRequest,
+    RollingWindowRequest,
+    SimulationRequest,
+    WeightGridRequest,
+)
+
+
+class JobKind(str, Enum):
+    """Simulation job kind enum."""
+
+    RUN = "run"
+    COMPARE = "compare"
+    MONTE_CARLO = "monte_carlo"
+    ROLLING = "rolling"
+    WEIGHT_GRID = "weight_grid"
+
+
+class JobStatus(str, Enum):
+    """Simulation job status enum."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class RunJobSubmission(BaseModel):
+    """Simulation run submitted as a job."""
+
+    kind: Literal[JobKind.RUN] = Field(..., description="Job kind")
+    request: SimulationRequest = Field(..., description="Simulation request")
+
+
+class CompareJobSubmission(BaseModel):
+    """Scenario comparison submitted as a job."""
+
+    kind: Literal[JobKind.COMPARE] = Field(..., description="Job kind")
+    request: ComparisonRequest = Field(..., description="Comparison request")
+
+
+class MonteCarloJobSubmission(BaseModel):
+    """Monte Carlo simulation submitted as a job."""
+
+    kind: Literal[JobKind.MONTE_CARLO] = Field(..., description="Job kind")
+    request: MonteCarloRequest = Field(..., description="Monte Carlo request")
+
+
+class RollingJobSubmission(BaseModel):
+    """Rolling window backtest submitted as a job."""
+
+    kind: Literal[JobKind.ROLLING] = Field(..., description="Job kind")
+    request: RollingWindowRequest = Field(..., description="Rolling window request")
+
+
+class WeightGridJobSubmission(BaseModel):
+    """Weight grid sweep submitted as a job."""
+
+    kind: Literal[JobKind.WEIGHT_GRID] = Field(..., description="Job kind")
+    request: WeightGridRequest = Field(..., description="Weight grid request")
+
+
+JobSubmission = Annotated[
+    RunJobSubmission
+    | CompareJobSubmission
+    | MonteCarloJobSubmission
+    | RollingJobSubmission
+    | WeightGridJobSubmission,
+    Field(discriminator="kind"),
+]
+
+
+class JobResponse(BaseModel):
+    """Simulation job status model."""
+
+    id: str = Field(..., description="Job ID")
+    kind: JobKind = Field(..., description="Job kind")
+    status: JobStatus = Field(..., description="Job status")
+    progress: float = Field(..., description="Completed share of the job (%)")
+    error: str | None = Field(None, description="Failure reason")
+    created_at: datetime = Field(..., description="Submission time (UTC)")
+    started_at: datetime | None = Field(None, description="Start time (UTC)")
+    finished_at: datetime | None = Field(None, description="Completion time (UTC)")
+    expires_at: datetime | None = Field(
+        None, description="Time the job and its result are deleted (UTC)"
+    )
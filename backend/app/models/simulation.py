@@ -1,10 +1,13 @@
 """Simulation related Pydantic models for API."""
 
+import datetime
 from datetime import date
 from enum import Enum
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.models.etf import Resolution
+
 
 class InvestmentType(str, Enum):
     """Investment type enum."""
@@ -21,12 +24,38 @@ class RebalancingFrequency(str, Enum):
     YEARLY = "yearly"
 
 
+class SimulationEngine(str, Enum):
+    """Simulation engine enum."""
+
+    LOOP = "loop"
+    VECTORIZED = "vectorized"
+
+
+def normalize_ticker(ticker: str) -> str:
+    """Strip and upper case a ticker symbol, the form prices are stored by."""
+    return ticker.strip().upper()
+
+
 class PortfolioItem(BaseModel):
     """Single portfolio item with ticker and weight."""
 
     ticker: str = Field(..., max_length=10, description="ETF ticker symbol")
     weight: float = Field(..., ge=0, le=100, description="Portfolio weight (%)")
 
+    @field_validator("ticker")
+    @classmethod
+    def validate_ticker(cls, v: str) -> str:
+        """Normalize the ticker symbol."""
+        return normalize_ticker(v)
+
+
+def check_portfolio_weights(portfolio: list[PortfolioItem]) -> list[PortfolioItem]:
+    """Check that portfolio weights sum to 100."""
+    total_weight = sum(item.weight for item in portfolio)
+    if abs(total_weight - 100) > 0.01:  # Allow small floating point errors
+        raise ValueError(f"Portfolio weights must sum to 100, got {total_weight}")
+    return portfolio
+
 
 class SimulationRequest(BaseModel):
     """Simulation request model."""
@@ -44,21 +73,31 @@ class SimulationRequest(BaseModel):
     rebalancing: RebalancingFrequency = Field(
         RebalancingFrequency.NONE, description="Rebalancing frequency"
     )
+    engine: SimulationEngine = Field(
+        SimulationEngine.VECTORIZED, description="Simulation engine"
+    )
+    resolution: Resolution = Field(
+        Resolution.MONTHLY,
+        description=(
+            "Snapshot resolution (the loop engine records at most monthly "
+            "snapshots)"
+        ),
+    )
+    max_points: int | None = Field(
+        None, ge=3, description="Maximum number of snapshots (LTTB downsampled)"
+    )
 
     @field_validator("portfolio")
     @classmethod
     def validate_portfolio_weights(cls, v: list[PortfolioItem]) -> list[PortfolioItem]:
         """Validate that portfolio weights sum to 100."""
-        total_weight = sum(item.weight for item in v)
-        if abs(total_weight - 100) > 0.01:  # Allow small floating point errors
-            raise ValueError(f"Portfolio weights must sum to 100, got {total_weight}")
-        return v
+        return check_portfolio_weights(v)
 
 
 class MonthlySnapshot(BaseModel):
-    """Monthly portfolio snapshot."""
+    """Portfolio snapshot (monthly unless another resolution is requested)."""
 
-    date: date = Field(..., description="Snapshot date")
+    date: datetime.date = Field(..., description="Snapshot date")
     portfolio_value: float = Field(..., description="Total portfolio value")
     invested_amount: float = Field(..., description="Total invested amount")
     dividends_received: float = Field(..., description="Dividends received")
@@ -98,7 +137,7 @@ class ComparisonRequest(BaseModel):
     """Comparison request model."""
 
     scenarios: list[ComparisonScenario] = Field(
-        ..., min_length=2, max_length=5, description="Scenarios to compare"
+        ..., min_length=2, max_length=500, description="Scenarios to compare"
     )
     start_date: date = Field(..., description="Comparison start date")
     end_date: date = Field(..., description="Comparison end date")
@@ -122,3 +161,169 @@ class ComparisonResponse(BaseModel):
     """Comparison response model."""
 
     scenarios: list[ScenarioResult] = Field(..., description="Scenario results")
+
+
+class MonteCarloRequest(BaseModel):
+    """Monte Carlo simulation request model."""
+
+    portfolio: list[PortfolioItem] = Field(
+        ..., min_length=1, max_length=5, description="Portfolio items"
+    )
+    investment_type: InvestmentType = Field(..., description="Investment type")
+    initial_amount: float = Field(..., ge=0, description="Initial investment amount")
+    monthly_contribution: float = Field(
+        0, ge=0, description="Monthly contribution (for DCA)"
+    )
+    start_date: date = Field(..., description="Start of the sampled history")
+    end_date: date = Field(..., description="End of the sampled history")
+    rebalancing: RebalancingFrequency = Field(
+        RebalancingFrequency.NONE, description="Rebalancing frequency"
+    )
+    horizon_years: int = Field(10, ge=1, le=50, description="Years per path")
+    num_paths: int = Field(
+        1000, ge=100, le=100_000, description="Number of simulated paths"
+    )
+    block_days: int = Field(
+        21, ge=1, le=252, description="Trading days per bootstrap block"
+    )
+    seed: int | None = Field(
+        None, ge=0, description="Random seed (random if omitted)"
+    )
+
+    @field_validator("portfolio")
+    @classmethod
+    def validate_portfolio_weights(cls, v: list[PortfolioItem]) -> list[PortfolioItem]:
+        """Validate that portfolio weights sum to 100."""
+        return check_portfolio_weights(v)
+
+
+class PercentileBand(BaseModel):
+    """Percentiles of a metric over all simulated paths."""
+
+    p5: float = Field(..., description="5th percentile")
+    p25: float = Field(..., description="25th percentile")
+    p50: float = Field(..., description="Median")
+    p75: float = Field(..., description="75th percentile")
+    p95: float = Field(..., description="95th percentile")
+
+
+class MonteCarloResponse(BaseModel):
+    """Monte Carlo simulation response model."""
+
+    num_paths: int = Field(..., description="Number of simulated paths")
+    horizon_years: int = Field(..., description="Years per path")
+    seed: int = Field(..., description="Random seed that reproduces the run")
+    total_invested: float = Field(..., description="Total invested amount")
+    loss_probability: float = Field(
+        ..., description="Share of paths ending below the invested amount (%)"
+    )
+    final_value: PercentileBand = Field(..., description="Final portfolio value")
+    cagr: PercentileBand = Field(..., description="Compound Annual Growth Rate (%)")
+    mdd: PercentileBand = Field(..., description="Maximum Drawdown (%)")
+
+
+class RollingWindowRequest(BaseModel):
+    """Rolling window backtest request model."""
+
+    portfolio: list[PortfolioItem] = Field(
+        ..., min_length=1, max_length=5, description="Portfolio items"
+    )
+    investment_type: InvestmentType = Field(..., description="Investment type")
+    initial_amount: float = Field(..., ge=0, description="Initial investment amount")
+    monthly_contribution: float = Field(
+        0, ge=0, description="Monthly contribution (for DCA)"
+    )
+    start_date: date = Field(..., description="Earliest window start date")
+    end_date: date = Field(..., description="Latest window end date")
+    rebalancing: RebalancingFrequency = Field(
+        RebalancingFrequency.NONE, description="Rebalancing frequency"
+    )
+    horizon_years: int = Field(10, ge=1, le=50, description="Years per window")
+
+    @field_validator("portfolio")
+    @classmethod
+    def validate_portfolio_weights(cls, v: list[PortfolioItem]) -> list[PortfolioItem]:
+        """Validate that portfolio weights sum to 100."""
+        return check_portfolio_weights(v)
+
+
+class RollingWindowResult(BaseModel):
+    """Outcome of one rolling window."""
+
+    start_date: date = Field(..., description="Window start date")
+    end_date: date = Field(..., description="Window end date")
+    total_invested: float = Field(..., description="Total invested amount")
+    final_value: float = Field(..., description="Final portfolio value")
+    cagr: float = Field(..., description="Compound Annual Growth Rate (%)")
+    mdd: float = Field(..., description="Maximum Drawdown (%)")
+
+
+class RollingWindowResponse(BaseModel):
+    """Rolling window backtest response model."""
+
+    horizon_years: int = Field(..., description="Years per window")
+    windows: list[RollingWindowResult] = Field(
+        ..., description="Windows by start date"
+    )
+    final_value: PercentileBand = Field(..., description="Final portfolio value")
+    cagr: PercentileBand = Field(..., description="Compound Annual Growth Rate (%)")
+    mdd: PercentileBand = Field(..., description="Maximum Drawdown (%)")
+
+
+class WeightGridRequest(BaseModel):
+    """Portfolio weight grid sweep request model."""
+
+    tickers: list[str] = Field(
+        ..., min_length=2, max_length=10, description="Tickers to allocate"
+    )
+    step_pct: float = Field(
+        5, gt=0, le=50, description="Weight step (%), must divide 100"
+    )
+    investment_type: InvestmentType = Field(..., description="Investment type")
+    initial_amount: float = Field(..., ge=0, description="Initial investment amount")
+    monthly_contribution: float = Field(
+        0, ge=0, description="Monthly contribution (for DCA)"
+    )
+    start_date: date = Field(..., description="Simulation start date")
+    end_date: date = Field(..., description="Simulation end date")
+    rebalancing: RebalancingFrequency = Field(
+        RebalancingFrequency.NONE, description="Rebalancing frequency"
+    )
+
+    @field_validator("tickers")
+    @classmethod
+    def validate_unique_tickers(cls, v: list[str]) -> list[str]:
+        """Normalize tickers and validate that they are not repeated."""
+        v = [normalize_ticker(ticker) for ticker in v]
+        if len(set(v)) != len(v):
+            raise ValueError("Tickers must be unique")
+        return v
+
+    @field_validator("step_pct")
+    @classmethod
+    def validate_step(cls, v: float) -> float:
+        """Validate that the step divides 100."""
+        steps = 100 / v
+        if abs(steps - round(steps)) > 1e-9:
+            raise ValueError(f"Weight step must divide 100, got {v}")
+        return v
+
+
+class WeightGridPoint(BaseModel):
+    """Outcome of one allocation of a weight grid."""
+
+    weights: list[float] = Field(..., description="Weights (%) in ticker order")
+    total_invested: float = Field(..., description="Total invested amount")
+    final_value: float = Field(..., description="Final portfolio value")
+    cagr: float = Field(..., description="Compound Annual Growth Rate (%)")
+    mdd: float = Field(..., description="Maximum Drawdown (%)")
+
+
+class WeightGridResponse(BaseModel):
+    """Portfolio weight grid sweep response model."""
+
+    tickers: list[str] = Field(..., description="Tickers in weight order")
+    total_invested: float = Field(
+        ..., description="Largest total invested amount of any allocation"
+    )
+    points: list[WeightGridPoint] = Field(..., description="Grid allocations")
@@ -0,0 +1,347 @@
+"""Async ETF data service for async endpoints."""
+
+import asyncio
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import SessionLocal, async_engine
+from app.db.locks import async_advisory_lock
+from app.db.models import ETF, PriceCoverage
+from app.models.etf import ETFDetail, ETFSearchResult
+from app.services.etf_service import (
+    ETFService,
+    PriceFetchKey,
+    group_price_fetches,
+    price_fetch_flights,
+    price_fetch_lock_names,
+    price_series_from_rows,
+    schedule_metadata_refresh,
+    select_price_series,
+)
+from app.services.market_data import MarketDataProvider, get_market_data_provider
+from app.services.price_cache import price_cache
+from app.services.price_panel import PriceSeries
+from app.services.search_index import etf_search_index
+from app.services.ticker_popularity import ticker_popularity
+from app.utils.date_ranges import DateRange, missing_trading_ranges
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Price history fetched for one ticker and date range, or None if the
+# provider left the ticker out
+FetchedHistory = tuple[str, date, date, "pd.DataFrame | None"]
+
+
+class AsyncETFService:
+    """
+    ETF data service for async endpoints.
+
+    Reads go through the async database engine, and data already cached
+    in memory is served without leaving the event loop. Missing price
+    history is fetched with the provider's async client. Writes and reads
+    of the columnar price store stay with ETFService and run in worker
+    threads.
+    """
+
+    def __init__(
+        self, db: AsyncSession, provider: MarketDataProvider | None = None
+    ):
+        """Initialize ETF service with async database session and provider."""
+        self.db = db
+        self.provider = provider or get_market_data_provider()
+
+    async def search_etfs(self, query: str) -> list[ETFSearchResult]:
+        """
+        Search for ETFs by ticker or name.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            List of matching ETF search results, best match first
+        """
+        if etf_search_index.is_stale():
+            await self.rebuild_search_index()
+
+        return etf_search_index.search(query, limit=10)
+
+    async def rebuild_search_index(self) -> None:
+        """Rebuild the search index from POPULAR_ETFS and the database."""
+        db_etfs = (
+            await self.db.execute(select(ETF.ticker, ETF.name, ETF.category))
+        ).all()
+
+        etf_search_index.rebuild(
+            [ETFSearchResult(**etf) for etf in ETFService.POPULAR_ETFS]
+            + [
+                ETFSearchResult(
+                    ticker=etf.ticker, name=etf.name, category=etf.category
+                )
+                for etf in db_etfs
+            ]
+        )
+
+    async def get_etf_detail(self, ticker: str) -> ETFDetail | None:
+        """
+        Get detailed information about an ETF.
+
+        Stale metadata is served right away and refreshed in the
+        background, as in ETFService.
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            ETF detail or None if not found
+        """
+        ticker = ticker.upper()
+
+        db_etf = await self.db.scalar(select(ETF).where(ETF.ticker == ticker))
+        if db_etf:
+            age = datetime.utcnow() - db_etf.updated_at
+            if age > timedelta(seconds=settings.etf_metadata_ttl_seconds):
+                schedule_metadata_refresh(ticker, self.provider)
+
+            return ETFDetail.model_validate(db_etf, from_attributes=True)
+
+        try:
+            etf_detail = await self.provider.get_etf_detail_async(ticker)
+        except Exception:
+            return None
+
+        if etf_detail is not None:
+            await asyncio.to_thread(_store_etf_detail_in_session, etf_detail)
+
+        return etf_detail
+
+    async def get_price_history(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        limit: int | None = None,
+    ) -> PriceSeries:
+        """
+        Get price history for an ETF.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start date
+            end_date: End date
+            limit: Maximum number of rows from the start, or None for all
+
+        Returns:
+            Price series for the range
+        """
+        ticker = ticker.upper()
+        ticker_popularity.record(ticker)
+
+        await self.prefetch_price_history([ticker], start_date, end_date)
+
+        series = await self.query_price_series([ticker], start_date, end_date, limit)
+        return series[ticker]
+
+    async def get_price_series(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> PriceSeries:
+        """
+        Get price history for an ETF as NumPy arrays.
+
+        A price cache hit is answered on the event loop. Otherwise missing
+        date ranges are fetched first, and ETFService.get_price_series
+        loads and caches the series in a worker thread.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Price series for the range
+        """
+        ticker = ticker.upper()
+
+        cached = price_cache.get(ticker, start_date, end_date)
+        if cached is not None:
+            return cached
+
+        await self.prefetch_price_history([ticker], start_date, end_date)
+
+        return await asyncio.to_thread(
+            _get_price_series_in_session, ticker, start_date, end_date
+        )
+
+    async def query_price_series(
+        self,
+        tickers: list[str],
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+    ) -> dict[str, PriceSeries]:
+        """
+        Read stored price history for several tickers into NumPy arrays.
+
+        Args:
+            tickers: ETF ticker symbols
+            start_date: Start date, or None for the earliest stored date
+            end_date: End date, or None for the latest stored date
+            limit: Maximum number of rows in total, taken in ticker and
+                date order, or None for all rows
+
+        Returns:
+            Price series keyed by ticker, empty for tickers without rows
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        statement = select_price_series(tickers, start_date, end_date, limit)
+
+        rows = (await self.db.execute(statement)).all()
+        return price_series_from_rows(tickers, rows)
+
+    async def prefetch_price_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> None:
+        """
+        Load missing price history for several tickers into the database.
+
+        Tickers missing the same date range are fetched together, and
+        different date ranges are fetched concurrently. Fetches are shared
+        with concurrent callers, in threads and on the event loop alike, as
+        in ETFService.prefetch_price_history.
+
+        Args:
+            tickers: ETF ticker symbols
+            start_date: Start date
+            end_date: End date
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        covered = await self._price_coverage(tickers)
+        missing: list[PriceFetchKey] = [
+            (ticker, range_start, range_end)
+            for ticker in tickers
+            for range_start, range_end in missing_trading_ranges(
+                start_date, end_date, covered[ticker]
+            )
+        ]
+        if not missing:
+            return
+
+        with price_fetch_flights.claim(missing) as (claimed, pending):
+            if claimed:
+                await self._load_price_history(claimed)
+
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(flight) for flight in pending))
+
+    async def _load_price_history(self, keys: list[PriceFetchKey]) -> None:
+        """Fetch and store price history claimed by this caller."""
+        lock = (
+            async_advisory_lock(async_engine, price_fetch_lock_names(keys))
+            if settings.price_fetch_advisory_lock
+            else nullcontext()
+        )
+        async with lock:
+            # Another caller may have loaded a range since it was found missing
+            covered = await self._price_coverage(
+                list(dict.fromkeys(ticker for ticker, _, _ in keys))
+            )
+            keys = [
+                (ticker, start_date, end_date)
+                for ticker, start_date, end_date in keys
+                if missing_trading_ranges(start_date, end_date, covered[ticker])
+            ]
+
+            fetched = await asyncio.gather(
+                *(
+                    self._fetch_history(range_tickers, range_start, range_end)
+                    for (range_start, range_end), range_tickers in group_price_fetches(
+                        keys
+                    ).items()
+                )
+            )
+
+            histories = [history for batch in fetched for history in batch]
+            if histories:
+                await asyncio.to_thread(_store_price_history_in_session, histories)
+
+    async def _price_coverage(self, tickers: list[str]) -> dict[str, list[DateRange]]:
+        """Get the date ranges already loaded for several tickers."""
+        rows = (
+            await self.db.execute(
+                select(
+                    PriceCoverage.ticker,
+                    PriceCoverage.start_date,
+                    PriceCoverage.end_date,
+                ).where(PriceCoverage.ticker.in_(tickers))
+            )
+        ).all()
+
+        covered: dict[str, list[DateRange]] = {ticker: [] for ticker in tickers}
+        for row in rows:
+            covered[row.ticker].append((row.start_date, row.end_date))
+
+        return covered
+
+    async def _fetch_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> list[FetchedHistory]:
+        """
+        Fetch one date range for several tickers, skipping failures.
+
+        Tickers the provider left out are kept with no history when the
+        provider omits empty ranges, as in ETFService._load_price_history.
+        """
+        try:
+            history = await self.provider.get_history_async(
+                tickers, start_date, end_date
+            )
+        except Exception:
+            return []
+
+        return [
+            (ticker, start_date, end_date, history.get(ticker))
+            for ticker in tickers
+            if ticker in history or self.provider.omits_empty_history
+        ]
+
+
+def _store_etf_detail_in_session(etf_detail: ETFDetail) -> None:
+    """Store fetched ETF metadata using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        ETFService(db).store_etf_detail(etf_detail)
+    finally:
+        db.close()
+
+
+def _store_price_history_in_session(histories: list[FetchedHistory]) -> None:
+    """Store fetched price history using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        service = ETFService(db)
+        for ticker, start_date, end_date, history in histories:
+            if history is not None:
+                service.store_price_history(ticker, start_date, end_date, history)
+
+        # After the fetched ranges, which may hold a ticker's first price
+        for ticker, start_date, end_date, history in histories:
+            if history is None:
+                service.store_omitted_history(ticker, start_date, end_date)
+    finally:
+        db.close()
+
+
+def _get_price_series_in_session(
+    ticker: str, start_date: date, end_date: date
+) -> PriceSeries:
+    """Load one ticker's price series using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        return ETFService(db).get_price_series(ticker, start_date, end_date)
+    finally:
+        db.close()
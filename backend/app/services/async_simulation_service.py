@@ -0,0 +1,262 @@
+"""Async portfolio simulation service for async endpoints."""
+
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.etf import Resolution
+from app.models.simulation import (
+    ComparisonScenario,
+    InvestmentType,
+    MonteCarloResponse,
+    MonthlySnapshot,
+    PortfolioItem,
+    RebalancingFrequency,
+    RollingWindowResponse,
+    SimulationEngine,
+    SimulationSummary,
+    WeightGridResponse,
+)
+from app.services.async_etf_service import AsyncETFService
+from app.services.result_cache import simulation_fingerprint, simulation_result_cache
+from app.services.simulation_service import SimulationService
+
+# Threads running simulations for async endpoints
+_simulation_executor = ThreadPoolExecutor(
+    max_workers=settings.simulation_threads, thread_name_prefix="simulation"
+)
+
+
+class AsyncSimulationService:
+    """
+    Portfolio simulation service for async endpoints.
+
+    Missing price history is fetched on the event loop first, so the
+    simulation itself, which is CPU-bound, never waits on the network. It
+    then runs in SimulationService, which does not fetch it again, on a
+    dedicated thread pool, which keeps simulations from exhausting the
+    threads used by the web server.
+    Memoized results are returned without leaving the event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize simulation service with async database session."""
+        self.db = db
+        self.etf_service = AsyncETFService(db)
+
+    async def run_simulation(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        engine: SimulationEngine = SimulationEngine.VECTORIZED,
+        resolution: Resolution = Resolution.MONTHLY,
+        max_points: int | None = None,
+    ) -> tuple[SimulationSummary, list[MonthlySnapshot]]:
+        """
+        Run investment simulation.
+
+        See SimulationService.run_simulation for the arguments.
+
+        Returns:
+            Tuple of (simulation summary, snapshots)
+        """
+        key = simulation_fingerprint(
+            portfolio,
+            investment_type,
+            initial_amount,
+            monthly_contribution,
+            start_date,
+            end_date,
+            rebalancing,
+            engine,
+            resolution,
+            max_points,
+        )
+        cached = simulation_result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        await self.etf_service.prefetch_price_history(
+            [item.ticker for item in portfolio], start_date, end_date
+        )
+
+        return await _run_in_session(
+            SimulationService.run_simulation,
+            portfolio=portfolio,
+            investment_type=investment_type,
+            initial_amount=initial_amount,
+            monthly_contribution=monthly_contribution,
+            start_date=start_date,
+            end_date=end_date,
+            rebalancing=rebalancing,
+            engine=engine,
+            resolution=resolution,
+            max_points=max_points,
+        )
+
+    async def run_batch(
+        self,
+        scenarios: list[ComparisonScenario],
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+    ) -> list[SimulationSummary]:
+        """
+        Run several investment scenarios over the same period in one pass.
+
+        See SimulationService.run_batch for the arguments.
+
+        Returns:
+            Simulation summaries in scenario order
+        """
+        await self.etf_service.prefetch_price_history(
+            [item.ticker for scenario in scenarios for item in scenario.portfolio],
+            start_date,
+            end_date,
+        )
+
+        return await _run_in_session(
+            SimulationService.run_batch,
+            scenarios=scenarios,
+            start_date=start_date,
+            end_date=end_date,
+            rebalancing=rebalancing,
+        )
+
+    async def run_monte_carlo(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        horizon_years: int,
+        num_paths: int,
+        block_days: int,
+        seed: int | None = None,
+    ) -> MonteCarloResponse:
+        """
+        Simulate future paths by block-bootstrapping historical returns.
+
+        See SimulationService.run_monte_carlo for the arguments.
+
+        Returns:
+            Percentiles of final value, CAGR and MDD over all paths
+        """
+        await self.etf_service.prefetch_price_history(
+            [item.ticker for item in portfolio], start_date, end_date
+        )
+
+        return await _run_in_session(
+            SimulationService.run_monte_carlo,
+            portfolio=portfolio,
+            investment_type=investment_type,
+            initial_amount=initial_amount,
+            monthly_contribution=monthly_contribution,
+            start_date=start_date,
+            end_date=end_date,
+            rebalancing=rebalancing,
+            horizon_years=horizon_years,
+            num_paths=num_paths,
+            block_days=block_days,
+            seed=seed,
+        )
+
+    async def run_rolling_windows(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        horizon_years: int,
+    ) -> RollingWindowResponse:
+        """
+        Simulate a portfolio from every start month over a fixed horizon.
+
+        See SimulationService.run_rolling_windows for the arguments.
+
+        Returns:
+            Outcome of every window and percentiles over all windows
+        """
+        await self.etf_service.prefetch_price_history(
+            [item.ticker for item in portfolio], start_date, end_date
+        )
+
+        return await _run_in_session(
+            SimulationService.run_rolling_windows,
+            portfolio=portfolio,
+            investment_type=investment_type,
+            initial_amount=initial_amount,
+            monthly_contribution=monthly_contribution,
+            start_date=start_date,
+            end_date=end_date,
+            rebalancing=rebalancing,
+            horizon_years=horizon_years,
+        )
+
+    async def run_weight_grid(
+        self,
+        tickers: list[str],
+        step_pct: float,
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+    ) -> WeightGridResponse:
+        """
+        Simulate every allocation of a weight grid over the tickers.
+
+        See SimulationService.run_weight_grid for the arguments.
+
+        Returns:
+            Final value, CAGR and MDD of every allocation
+        """
+        await self.etf_service.prefetch_price_history(tickers, start_date, end_date)
+
+        return await _run_in_session(
+            SimulationService.run_weight_grid,
+            tickers=tickers,
+            step_pct=step_pct,
+            investment_type=investment_type,
+            initial_amount=initial_amount,
+            monthly_contribution=monthly_contribution,
+            start_date=start_date,
+            end_date=end_date,
+            rebalancing=rebalancing,
+        )
+
+
+async def _run_in_session(method: Callable[..., Any], **kwargs: Any) -> Any:
+    """Run a SimulationService method on the simulation thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _simulation_executor, functools.partial(_call_in_session, method, kwargs)
+    )
+
+
+def _call_in_session(method: Callable[..., Any], kwargs: dict[str, Any]) -> Any:
+    """Call a SimulationService method using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        return method(SimulationService(db, prefetched=True), **kwargs)
+    finally:
+        db.close()
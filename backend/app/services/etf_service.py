@@ -1,12 +1,66 @@
-"""ETF data service using yfinance."""
-
-from datetime import date, datetime
-
-import yfinance as yf
+"""ETF data service backed by a market data provider."""
+
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sqlalchemy import Row, Select, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from app.db.models import ETF, PriceHistory
-from app.models.etf import ETFDetail, ETFSearchResult, PriceData
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.locks import advisory_lock
+from app.db.models import ETF, PriceCoverage, PriceHistory
+from app.models.etf import ETFDetail, ETFSearchResult
+from app.services.market_data import (
+    HISTORY_COLUMNS,
+    MarketDataProvider,
+    empty_history,
+    get_market_data_provider,
+)
+from app.services.price_cache import price_cache
+from app.services.price_panel import PriceSeries
+from app.services.price_store import StoredPrices, price_store
+from app.services.result_cache import simulation_result_cache
+from app.services.search_index import etf_search_index
+from app.services.ticker_popularity import ticker_popularity
+from app.utils.date_ranges import (
+    DateRange,
+    merge_date_ranges,
+    missing_trading_ranges,
+)
+from app.utils.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Dialects supporting INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Minimum number of seconds between two refresh attempts of one ticker
+METADATA_REFRESH_RETRY_SECONDS = 300
+
+# Background refreshes of stale ETF metadata
+_metadata_refresh_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="etf-metadata-refresh"
+)
+_metadata_refresh_lock = threading.Lock()
+_metadata_refresh_attempts: dict[str, float] = {}
+
+# Price history fetch of one ticker and date range
+PriceFetchKey = tuple[str, date, date]
+
+# Price history fetches in flight in this worker
+price_fetch_flights = SingleFlight()
 
 
 class ETFService:
@@ -52,58 +106,51 @@ class ETFService:
         },
     ]
 
-    def __init__(self, db: Session):
-        """Initialize ETF service with database session."""
+    def __init__(self, db: Session, provider: MarketDataProvider | None = None):
+        """Initialize ETF service with database session and data provider."""
         self.db = db
+        self.provider = provider or get_market_data_provider()
 
     def search_etfs(self, query: str) -> list[ETFSearchResult]:
         """
         Search for ETFs by ticker or name.
 
+        Answered from the in-memory search index, which is (re)built from
+        the database and POPULAR_ETFS when stale.
+
         Args:
             query: Search query string
 
         Returns:
-            List of matching ETF search results
+            List of matching ETF search results, best match first
         """
-        query = query.upper().strip()
+        if etf_search_index.is_stale():
+            self.rebuild_search_index()
 
-        # First check database
-        db_etfs = (
-            self.db.query(ETF)
-            .filter(
-                (ETF.ticker.ilike(f"%{query}%")) | (ETF.name.ilike(f"%{query}%"))
-            )
-            .limit(10)
-            .all()
-        )
+        return etf_search_index.search(query, limit=10)
 
-        if db_etfs:
-            return [
+    def rebuild_search_index(self) -> None:
+        """Rebuild the search index from POPULAR_ETFS and the database."""
+        db_etfs = self.db.execute(select(ETF.ticker, ETF.name, ETF.category)).all()
+
+        etf_search_index.rebuild(
+            [ETFSearchResult(**etf) for etf in self.POPULAR_ETFS]
+            + [
                 ETFSearchResult(
                     ticker=etf.ticker, name=etf.name, category=etf.category
                 )
                 for etf in db_etfs
             ]
-
-        # If not in database, search from popular ETFs
-        results = []
-        for etf in self.POPULAR_ETFS:
-            if query in etf["ticker"] or query.lower() in etf["name"].lower():
-                results.append(
-                    ETFSearchResult(
-                        ticker=etf["ticker"],
-                        name=etf["name"],
-                        category=etf["category"],
-                    )
-                )
-
-        return results
+        )
 
     def get_etf_detail(self, ticker: str) -> ETFDetail | None:
         """
         Get detailed information about an ETF.
 
+        Metadata already in the database is returned immediately. Once it
+        is older than ETF_METADATA_TTL_SECONDS, a background refresh from
+        the market data provider is scheduled.
+
         Args:
             ticker: ETF ticker symbol
 
@@ -115,6 +162,11 @@ class ETFService:
         # Check database first
         db_etf = self.db.query(ETF).filter(ETF.ticker == ticker).first()
         if db_etf:
+            # Serve stale metadata right away and refresh it in the background
+            age = datetime.utcnow() - db_etf.updated_at
+            if age > timedelta(seconds=settings.etf_metadata_ttl_seconds):
+                self._schedule_metadata_refresh(ticker)
+
             return ETFDetail(
                 ticker=db_etf.ticker,
                 name=db_etf.name,
@@ -126,123 +178,393 @@ class ETFService:
                 description=db_etf.description,
             )
 
-        # If not in database, fetch from yfinance
+        # If not in database, fetch from the market data provider
         try:
-            yf_ticker = yf.Ticker(ticker)
-            info = yf_ticker.info
-
-            # Extract relevant information
-            name = info.get("longName", info.get("shortName", ticker))
-            category = info.get("category", info.get("quoteType", "ETF"))
-            expense_ratio = info.get("annualReportExpenseRatio")
-            if expense_ratio:
-                expense_ratio = expense_ratio * 100  # Convert to percentage
-
-            dividend_yield = info.get("yield")
-            if dividend_yield:
-                dividend_yield = dividend_yield * 100  # Convert to percentage
-
-            # Parse inception date
-            inception_date = None
-            fund_inception = info.get("fundInceptionDate")
-            if fund_inception:
-                try:
-                    inception_date = datetime.fromtimestamp(fund_inception).date()
-                except (ValueError, TypeError):
-                    pass
+            return self.refresh_etf_detail(ticker)
+        except Exception:
+            return None
 
-            aum = info.get("totalAssets")
+    def refresh_etf_detail(self, ticker: str) -> ETFDetail | None:
+        """
+        Fetch ETF metadata from the market data provider and store it.
 
-            etf_detail = ETFDetail(
-                ticker=ticker,
-                name=name,
-                category=category,
-                expense_ratio=expense_ratio,
-                dividend_yield=dividend_yield,
-                inception_date=inception_date,
-                aum=aum,
-                description=info.get("longBusinessSummary"),
-            )
+        Args:
+            ticker: ETF ticker symbol
 
-            # Cache in database
-            self._cache_etf(etf_detail)
+        Returns:
+            Fresh ETF detail, or None if the provider has none
+        """
+        etf_detail = self.provider.get_etf_detail(ticker.upper())
+        if etf_detail is not None:
+            self.store_etf_detail(etf_detail)
 
-            return etf_detail
+        return etf_detail
 
-        except Exception:
-            return None
+    def store_etf_detail(self, etf_detail: ETFDetail) -> None:
+        """
+        Store ETF metadata fetched from the market data provider.
+
+        Args:
+            etf_detail: Fresh ETF detail
+        """
+        self._cache_etf(etf_detail)
 
     def get_price_history(
-        self, ticker: str, start_date: date, end_date: date
-    ) -> list[PriceData]:
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        limit: int | None = None,
+    ) -> PriceSeries:
         """
         Get price history for an ETF.
 
+        Only date ranges that have not been loaded before are fetched from
+        the market data provider; everything else is served from the
+        database.
+
         Args:
             ticker: ETF ticker symbol
             start_date: Start date
             end_date: End date
+            limit: Maximum number of rows from the start, or None for all
 
         Returns:
-            List of price data points
+            Price series for the range
         """
         ticker = ticker.upper()
 
-        # Check database first
-        db_prices = (
-            self.db.query(PriceHistory)
-            .filter(
+        # Fetch missing date ranges from the market data provider
+        self.prefetch_price_history([ticker], start_date, end_date)
+
+        return self.query_price_series([ticker], start_date, end_date, limit)[ticker]
+
+    def get_price_series(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> PriceSeries:
+        """
+        Get price history for an ETF as NumPy arrays.
+
+        Served from the price series cache when possible, then from the
+        columnar price store. Missing date ranges are loaded first unless
+        only days from today on are missing, which callers ending today
+        have usually just prefetched. The result is cached once the range
+        is fully loaded.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Price series for the range
+        """
+        ticker = ticker.upper()
+        ticker_popularity.record(ticker)
+
+        cached = price_cache.get(ticker, start_date, end_date)
+        if cached is not None:
+            return cached
+
+        stored = self._load_stored_prices(ticker, start_date, end_date)
+        if stored is not None:
+            series = stored.series.between(start_date, end_date)
+            missing = stored.missing_ranges(start_date, end_date)
+        else:
+            missing = self._missing_price_ranges(ticker, start_date, end_date)
+            if self._has_past_gaps(missing):
+                self.prefetch_price_history([ticker], start_date, end_date)
+                missing = self._missing_price_ranges(ticker, start_date, end_date)
+            series = self.query_price_series([ticker], start_date, end_date)[ticker]
+
+        if not self._has_past_gaps(missing):
+            price_cache.put(series, start_date, end_date)
+
+        return series
+
+    def query_price_series(
+        self,
+        tickers: list[str],
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+    ) -> dict[str, PriceSeries]:
+        """
+        Read stored price history for several tickers into NumPy arrays.
+
+        Runs a single Core select of only the needed columns, so no ORM
+        objects or Pydantic models are built. Nothing is fetched from the
+        market data provider.
+
+        Args:
+            tickers: ETF ticker symbols
+            start_date: Start date, or None for the earliest stored date
+            end_date: End date, or None for the latest stored date
+            limit: Maximum number of rows in total, taken in ticker and
+                date order, or None for all rows
+
+        Returns:
+            Price series keyed by ticker, empty for tickers without rows
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        statement = select_price_series(tickers, start_date, end_date, limit)
+
+        return price_series_from_rows(tickers, self.db.execute(statement).all())
+
+    def stream_price_history(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        chunk_size: int = 1000,
+    ) -> Iterator[PriceSeries]:
+        """
+        Read stored price history of an ETF in chunks.
+
+        Rows are fetched through a server-side cursor where the database
+        driver supports one, so memory use is bounded by the chunk size
+        rather than the length of the range. Nothing is fetched from the
+        market data provider.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start date
+            end_date: End date
+            chunk_size: Number of rows per chunk
+
+        Yields:
+            Consecutive price series chunks in date order
+        """
+        ticker = ticker.upper()
+
+        result = self.db.execute(
+            select(
+                PriceHistory.date,
+                PriceHistory.adj_close,
+                PriceHistory.close,
+                PriceHistory.dividend,
+            )
+            .where(
                 PriceHistory.ticker == ticker,
                 PriceHistory.date >= start_date,
                 PriceHistory.date <= end_date,
             )
             .order_by(PriceHistory.date)
-            .all()
+            .execution_options(yield_per=chunk_size)
         )
 
-        if db_prices:
-            return [
-                PriceData(
-                    date=price.date,
-                    close=price.close,
-                    adj_close=price.adj_close,
-                    dividend=price.dividend,
-                )
-                for price in db_prices
-            ]
+        for rows in result.partitions():
+            dates, adj_close, close, dividend = zip(*rows)
+            yield PriceSeries(
+                ticker=ticker,
+                dates=np.array(dates, dtype="datetime64[D]"),
+                adj_close=np.array(adj_close, dtype=np.float64),
+                close=np.array(close, dtype=np.float64),
+                dividend=np.array(dividend, dtype=np.float64),
+            )
 
-        # If not in database, fetch from yfinance
-        try:
-            yf_ticker = yf.Ticker(ticker)
-            hist = yf_ticker.history(
-                start=start_date.isoformat(),
-                end=end_date.isoformat(),
-                auto_adjust=False,
+    def prefetch_price_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> None:
+        """
+        Load missing price history for several tickers into the database.
+
+        Tickers missing the same date range are fetched together with one
+        batch request to the market data provider. Each (ticker, range) is
+        fetched by one caller at a time: concurrent callers missing it wait
+        for that fetch instead of repeating it, and with
+        PRICE_FETCH_ADVISORY_LOCK this holds across workers too.
+
+        Args:
+            tickers: ETF ticker symbols
+            start_date: Start date
+            end_date: End date
+        """
+        # Date ranges each ticker is missing
+        missing: list[PriceFetchKey] = [
+            (ticker, range_start, range_end)
+            for ticker in dict.fromkeys(t.upper() for t in tickers)
+            for range_start, range_end in self._missing_price_ranges(
+                ticker, start_date, end_date
             )
+        ]
+        if not missing:
+            return
 
-            if hist.empty:
-                return []
+        with price_fetch_flights.claim(missing) as (claimed, pending):
+            if claimed:
+                self._load_price_history(claimed)
 
-            prices = []
-            for idx, row in hist.iterrows():
-                price_date = idx.date()
-                dividend = row.get("Dividends", 0.0)
+        wait(pending)
 
-                price_data = PriceData(
-                    date=price_date,
-                    close=row["Close"],
-                    adj_close=row["Adj Close"],
-                    dividend=dividend,
-                )
-                prices.append(price_data)
+    def store_price_history(
+        self, ticker: str, start_date: date, end_date: date, history: "pd.DataFrame"
+    ) -> None:
+        """
+        Store price history fetched from the market data provider.
 
-                # Cache in database
-                self._cache_price(ticker, price_date, row, dividend)
+        An empty frame records the range as loaded without prices, so it
+        is not fetched again.
 
-            return prices
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start of the fetched range
+            end_date: End of the fetched range
+            history: Normalized price history frame for the range
+        """
+        self._cache_prices(
+            ticker, start_date, end_date, self._to_price_rows(ticker, history)
+        )
 
-        except Exception:
-            return []
+    def store_omitted_history(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> None:
+        """
+        Record the part of a range left out by the provider with no prices.
+
+        Providers with omits_empty_history leave out a ticker both when
+        its fetch failed and when the range has no prices. The part of the
+        range before the ticker's first stored price predates its listing,
+        so it is recorded as loaded; the rest is fetched again next time.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start of the fetched range
+            end_date: End of the fetched range
+        """
+        first_date = self.db.scalar(
+            select(func.min(PriceHistory.date)).where(PriceHistory.ticker == ticker)
+        )
+        if first_date is None or first_date <= start_date:
+            return
+
+        self._cache_prices(
+            ticker,
+            start_date,
+            min(end_date, first_date - timedelta(days=1)),
+            self._to_price_rows(ticker, empty_history()),
+        )
+
+    def _load_price_history(self, keys: list[PriceFetchKey]) -> None:
+        """Fetch and store price history claimed by this caller."""
+        lock = (
+            advisory_lock(self.db.get_bind(), price_fetch_lock_names(keys))
+            if settings.price_fetch_advisory_lock
+            else nullcontext()
+        )
+        with lock:
+            # Another caller may have loaded a range since it was found missing
+            keys = [
+                (ticker, start_date, end_date)
+                for ticker, start_date, end_date in keys
+                if self._missing_price_ranges(ticker, start_date, end_date)
+            ]
+
+            omitted: list[PriceFetchKey] = []
+            for (start_date, end_date), tickers in group_price_fetches(keys).items():
+                try:
+                    history = self.provider.get_history(tickers, start_date, end_date)
+                except Exception:
+                    continue
+
+                for ticker in tickers:
+                    if ticker in history:
+                        self.store_price_history(
+                            ticker, start_date, end_date, history[ticker]
+                        )
+                    elif self.provider.omits_empty_history:
+                        omitted.append((ticker, start_date, end_date))
+
+            # After the fetched ranges, which may hold a ticker's first price
+            for ticker, start_date, end_date in omitted:
+                self.store_omitted_history(ticker, start_date, end_date)
+
+    def _schedule_metadata_refresh(self, ticker: str) -> None:
+        """Refresh a ticker's metadata in the background."""
+        schedule_metadata_refresh(ticker, self.provider)
+
+    def _has_past_gaps(self, missing: list[DateRange]) -> bool:
+        """Check whether missing ranges include days that could be loaded."""
+        # Days from today on cannot be loaded yet, so they do not count
+        return any(range_start < date.today() for range_start, _ in missing)
+
+    def _load_stored_prices(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> StoredPrices | None:
+        """
+        Load a ticker's prices from the columnar store.
+
+        Missing date ranges are loaded into the database first, which
+        syncs the store. A store still missing part of the range after
+        that is synced from the database, which may have been loaded by
+        another host or written while a store write failed. Tickers
+        loaded before the store existed are synced the same way.
+
+        Returns:
+            Stored price history, or None if the store is disabled or
+            could not be written
+        """
+        if not price_store.enabled:
+            return None
+
+        stored = price_store.load(ticker)
+        if stored is not None and not self._has_past_gaps(
+            stored.missing_ranges(start_date, end_date)
+        ):
+            return stored
+
+        self.prefetch_price_history([ticker], start_date, end_date)
+
+        stored = price_store.load(ticker)
+        if stored is None or self._has_past_gaps(
+            stored.missing_ranges(start_date, end_date)
+        ):
+            stored = self._sync_price_store(ticker)
+
+        return stored
+
+    def _sync_price_store(self, ticker: str) -> StoredPrices | None:
+        """Mirror a ticker's price_history rows and coverage to the store."""
+        series = self.query_price_series([ticker])[ticker]
+        coverage = self.db.execute(
+            select(PriceCoverage.start_date, PriceCoverage.end_date)
+            .where(PriceCoverage.ticker == ticker)
+            .order_by(PriceCoverage.start_date)
+        ).all()
+
+        return price_store.write(
+            series, [(row.start_date, row.end_date) for row in coverage]
+        )
+
+    def _missing_price_ranges(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> list[DateRange]:
+        """Get the parts of a date range not yet loaded for a ticker."""
+        covered = self.db.execute(
+            select(PriceCoverage.start_date, PriceCoverage.end_date).where(
+                PriceCoverage.ticker == ticker
+            )
+        ).all()
+
+        return missing_trading_ranges(
+            start_date, end_date, [(row.start_date, row.end_date) for row in covered]
+        )
+
+    def _to_price_rows(
+        self, ticker: str, history: "pd.DataFrame"
+    ) -> "pd.DataFrame":
+        """Convert a normalized price history frame into price_history rows."""
+        import pandas as pd
+
+        if history.empty:
+            return pd.DataFrame()
+
+        price_rows = history[HISTORY_COLUMNS].reset_index()
+        price_rows.insert(0, "ticker", ticker)
+        price_rows["date"] = price_rows["date"].dt.date
+        price_rows["volume"] = price_rows["volume"].astype("int64")
+
+        return price_rows
 
     def _cache_etf(self, etf_detail: ETFDetail) -> None:
         """Cache ETF detail in database."""
@@ -276,33 +598,235 @@ class ETFService:
             self.db.commit()
         except Exception:
             self.db.rollback()
+            return
+
+        etf_search_index.add(
+            ETFSearchResult(
+                ticker=etf_detail.ticker,
+                name=etf_detail.name,
+                category=etf_detail.category,
+            )
+        )
 
-    def _cache_price(
-        self, ticker: str, price_date: date, row: dict, dividend: float
+    def _cache_prices(
+        self,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        price_rows: "pd.DataFrame",
     ) -> None:
-        """Cache price data in database."""
+        """
+        Cache price rows for a loaded date range in a single transaction.
+
+        Rows that already exist for (ticker, date) are overwritten using
+        the unique ix_price_history_ticker_date index: only ranges not yet
+        covered are fetched, so an existing row is a bar stored before its
+        day was over, such as today's intraday bar. SQLAlchemy sends the
+        rows as batched multi-row INSERT statements. The range is recorded
+        in price_coverage in the same transaction.
+        """
+        records = price_rows.to_dict("records")
+
         try:
-            existing = (
-                self.db.query(PriceHistory)
-                .filter(
-                    PriceHistory.ticker == ticker, PriceHistory.date == price_date
+            dialect = self.db.get_bind().dialect.name
+            upsert_insert = UPSERT_INSERTS.get(dialect)
+
+            if upsert_insert is not None:
+                statement = upsert_insert(PriceHistory)
+                statement = statement.on_conflict_do_update(
+                    index_elements=["ticker", "date"],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in HISTORY_COLUMNS
+                    },
                 )
-                .first()
-            )
-
-            if not existing:
-                new_price = PriceHistory(
-                    ticker=ticker,
-                    date=price_date,
-                    open=row["Open"],
-                    high=row["High"],
-                    low=row["Low"],
-                    close=row["Close"],
-                    adj_close=row["Adj Close"],
-                    volume=int(row["Volume"]),
-                    dividend=dividend,
+            elif records:
+                # Fall back to deleting existing dates up front
+                self.db.execute(
+                    delete(PriceHistory).where(
+                        PriceHistory.ticker == ticker,
+                        PriceHistory.date.in_([r["date"] for r in records]),
+                    )
                 )
-                self.db.add(new_price)
-                self.db.commit()
+                statement = insert(PriceHistory)
+
+            if records:
+                self.db.execute(statement, records)
+            self._record_coverage(ticker, start_date, end_date)
+            self.db.commit()
         except Exception:
             self.db.rollback()
+            return
+
+        if records:
+            price_cache.invalidate(ticker)
+            simulation_result_cache.invalidate_ticker(ticker)
+        if price_store.enabled:
+            self._sync_price_store(ticker)
+
+    def _record_coverage(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> None:
+        """Merge a loaded date range into the ticker's coverage."""
+        # Today's bar may still change, so only completed days count as loaded
+        end_date = min(end_date, date.today() - timedelta(days=1))
+        if end_date < start_date:
+            return
+
+        existing = self.db.scalars(
+            select(PriceCoverage).where(PriceCoverage.ticker == ticker)
+        ).all()
+        merged = merge_date_ranges(
+            [(c.start_date, c.end_date) for c in existing] + [(start_date, end_date)]
+        )
+
+        for coverage in existing:
+            self.db.delete(coverage)
+        self.db.add_all(
+            PriceCoverage(ticker=ticker, start_date=start, end_date=end)
+            for start, end in merged
+        )
+
+
+def select_price_series(
+    tickers: list[str],
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int | None = None,
+) -> Select:
+    """
+    Build the select of stored price history read by query_price_series.
+
+    Only the needed columns are selected, sorted by ticker and date.
+
+    Args:
+        tickers: Upper-case ETF ticker symbols
+        start_date: Start date, or None for the earliest stored date
+        end_date: End date, or None for the latest stored date
+        limit: Maximum number of rows in total, or None for all rows
+
+    Returns:
+        Core select statement
+    """
+    statement = select(
+        PriceHistory.ticker,
+        PriceHistory.date,
+        PriceHistory.adj_close,
+        PriceHistory.close,
+        PriceHistory.dividend,
+    ).where(PriceHistory.ticker.in_(tickers))
+    if start_date is not None:
+        statement = statement.where(PriceHistory.date >= start_date)
+    if end_date is not None:
+        statement = statement.where(PriceHistory.date <= end_date)
+    statement = statement.order_by(PriceHistory.ticker, PriceHistory.date)
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    return statement
+
+
+def price_series_from_rows(
+    tickers: list[str], rows: Sequence[Row]
+) -> dict[str, PriceSeries]:
+    """
+    Split rows of select_price_series into one price series per ticker.
+
+    Args:
+        tickers: Upper-case ETF ticker symbols that were selected
+        rows: Selected rows
+
+    Returns:
+        Price series keyed by ticker, empty for tickers without rows
+    """
+    row_tickers, dates, adj_close, close, dividend = (
+        zip(*rows) if rows else ((),) * 5
+    )
+
+    # Rows are sorted by ticker, so each ticker is one contiguous block
+    row_tickers = np.array(row_tickers, dtype=object)
+    columns = {
+        "dates": np.array(dates, dtype="datetime64[D]"),
+        "adj_close": np.array(adj_close, dtype=np.float64),
+        "close": np.array(close, dtype=np.float64),
+        "dividend": np.array(dividend, dtype=np.float64),
+    }
+
+    series = {}
+    for ticker in tickers:
+        rows_of_ticker = row_tickers == ticker
+        series[ticker] = PriceSeries(
+            ticker=ticker,
+            **{name: values[rows_of_ticker] for name, values in columns.items()},
+        )
+
+    return series
+
+
+def group_price_fetches(keys: list[PriceFetchKey]) -> dict[DateRange, list[str]]:
+    """
+    Group price history fetches by date range.
+
+    Args:
+        keys: (ticker, start date, end date) of each fetch
+
+    Returns:
+        Tickers keyed by the date range they need fetched
+    """
+    grouped: dict[DateRange, list[str]] = {}
+    for ticker, start_date, end_date in keys:
+        grouped.setdefault((start_date, end_date), []).append(ticker)
+
+    return grouped
+
+
+def price_fetch_lock_names(keys: list[PriceFetchKey]) -> list[str]:
+    """
+    Get the advisory lock names guarding price history fetches.
+
+    Args:
+        keys: (ticker, start date, end date) of each fetch
+
+    Returns:
+        One lock name per fetch
+    """
+    return [
+        f"price_history:{ticker}:{start_date.isoformat()}:{end_date.isoformat()}"
+        for ticker, start_date, end_date in keys
+    ]
+
+
+def schedule_metadata_refresh(ticker: str, provider: MarketDataProvider) -> None:
+    """
+    Refresh a ticker's metadata in the background.
+
+    A ticker is refreshed at most once per METADATA_REFRESH_RETRY_SECONDS,
+    so concurrent requests schedule a single refresh and an unavailable
+    provider is not hit on every request.
+
+    Args:
+        ticker: Upper-case ETF ticker symbol
+        provider: Market data provider to refresh from
+    """
+    now = time.monotonic()
+    with _metadata_refresh_lock:
+        last_attempt = _metadata_refresh_attempts.get(ticker)
+        if (
+            last_attempt is not None
+            and now - last_attempt < METADATA_REFRESH_RETRY_SECONDS
+        ):
+            return
+        _metadata_refresh_attempts[ticker] = now
+
+    _metadata_refresh_executor.submit(_refresh_metadata_in_session, ticker, provider)
+
+
+def _refresh_metadata_in_session(ticker: str, provider: MarketDataProvider) -> None:
+    """Refresh one ticker's metadata using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        ETFService(db, provider).refresh_etf_detail(ticker)
+    except Exception:
+        pass
+    finally:
+        db.close()
@@ -0,0 +1,425 @@
+"""Background simulation job queue backed by the database."""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import SimulationJob
+from app.models.job import JobKind, JobStatus
+from app.models.simulation import (
+    ComparisonRequest,
+    ComparisonResponse,
+    MonteCarloRequest,
+    RollingWindowRequest,
+    ScenarioResult,
+    SimulationRequest,
+    SimulationResponse,
+    WeightGridRequest,
+)
+from app.services.process_pool import ProgressCallback
+from app.services.simulation_service import SimulationService
+
+# Request model of each job kind
+JOB_REQUEST_MODELS: dict[JobKind, type[BaseModel]] = {
+    JobKind.RUN: SimulationRequest,
+    JobKind.COMPARE: ComparisonRequest,
+    JobKind.MONTE_CARLO: MonteCarloRequest,
+    JobKind.ROLLING: RollingWindowRequest,
+    JobKind.WEIGHT_GRID: WeightGridRequest,
+}
+
+# Smallest progress change (%) written to the job table
+PROGRESS_STEP_PCT = 1.0
+
+# Worker threads running queued jobs
+_job_executor = ThreadPoolExecutor(
+    max_workers=settings.job_workers, thread_name_prefix="simulation-job"
+)
+
+# Owner of the jobs claimed by this process
+WORKER_ID = f"{socket.gethostname()[:60]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobHeartbeat:
+    """
+    Lease renewal of the jobs running in this process.
+
+    A background thread stamps heartbeat_at of every job this process
+    runs three times per JOB_LEASE_SECONDS. Running jobs whose heartbeat
+    is older than the lease belong to a process that has stopped.
+    """
+
+    def __init__(self, lease_seconds: int):
+        """Initialize an idle heartbeat for a lease duration."""
+        self.interval = lease_seconds / 3
+        self._lock = threading.Lock()
+        self._job_ids: set[str] = set()
+        self._thread: threading.Thread | None = None
+
+    def add(self, job_id: str) -> None:
+        """Start renewing a job's lease, starting the thread if needed."""
+        with self._lock:
+            self._job_ids.add(job_id)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="simulation-job-heartbeat", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, job_id: str) -> None:
+        """Stop renewing a job's lease."""
+        with self._lock:
+            self._job_ids.discard(job_id)
+
+    def _run(self) -> None:
+        """Renew the leases of running jobs until the process exits."""
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                job_ids = list(self._job_ids)
+            if not job_ids:
+                continue
+
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(SimulationJob)
+                    .where(
+                        SimulationJob.id.in_(job_ids),
+                        SimulationJob.worker_id == WORKER_ID,
+                    )
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+                db.commit()
+            except Exception:
+                # Renewed again on the next beat, within the lease
+                db.rollback()
+            finally:
+                db.close()
+
+
+job_heartbeat = JobHeartbeat(settings.job_lease_seconds)
+
+
+class JobService:
+    """Service for background simulation jobs."""
+
+    def __init__(self, db: Session):
+        """Initialize job service with database session."""
+        self.db = db
+
+    def submit(self, kind: JobKind, request: BaseModel) -> SimulationJob:
+        """
+        Queue a simulation to run in the background.
+
+        Args:
+            kind: Job kind
+            request: Request model of the job kind
+
+        Returns:
+            Queued job
+        """
+        self.purge_expired()
+
+        job = SimulationJob(
+            id=str(uuid.uuid4()),
+            kind=kind.value,
+            status=JobStatus.QUEUED.value,
+            progress=0.0,
+            request=request.model_dump_json(),
+        )
+        self.db.add(job)
+        self.db.commit()
+
+        _job_executor.submit(_run_job_in_session, job.id)
+        return job
+
+    def get_job(self, job_id: str) -> SimulationJob | None:
+        """
+        Get a job unless it does not exist or has expired.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job, or None if not found
+        """
+        job = self.db.get(SimulationJob, job_id)
+        if job is None or (
+            job.expires_at is not None and job.expires_at <= datetime.utcnow()
+        ):
+            return None
+        return job
+
+    def purge_expired(self) -> int:
+        """
+        Delete finished jobs whose result TTL has passed.
+
+        Returns:
+            Number of deleted jobs
+        """
+        result = self.db.execute(
+            delete(SimulationJob).where(SimulationJob.expires_at <= datetime.utcnow())
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def resume_jobs(self) -> int:
+        """
+        Queue again the jobs left unfinished by stopped processes.
+
+        Running jobs are only requeued once their lease has expired, so
+        jobs still running in other workers or replicas are left to them.
+        Interrupted jobs start over.
+
+        Returns:
+            Number of resumed jobs
+        """
+        lease_expired_at = datetime.utcnow() - timedelta(
+            seconds=settings.job_lease_seconds
+        )
+        self.db.execute(
+            update(SimulationJob)
+            .where(
+                SimulationJob.status == JobStatus.RUNNING.value,
+                or_(
+                    SimulationJob.heartbeat_at.is_(None),
+                    SimulationJob.heartbeat_at < lease_expired_at,
+                ),
+            )
+            .values(
+                status=JobStatus.QUEUED.value,
+                progress=0.0,
+                started_at=None,
+                worker_id=None,
+                heartbeat_at=None,
+            )
+        )
+        self.db.commit()
+
+        job_ids = self.db.scalars(
+            select(SimulationJob.id)
+            .where(SimulationJob.status == JobStatus.QUEUED.value)
+            .order_by(SimulationJob.created_at)
+        ).all()
+        for job_id in job_ids:
+            _job_executor.submit(_run_job_in_session, job_id)
+
+        return len(job_ids)
+
+    def run_job(self, job_id: str) -> None:
+        """
+        Run a queued job and store its result or failure.
+
+        A job is claimed by switching it from queued to running, so it is
+        run once even if it was submitted to the workers twice. The claim
+        takes a lease renewed by job_heartbeat while the job runs; if the
+        lease expires and another process runs the job again, this run's
+        result is discarded.
+
+        Args:
+            job_id: Job ID
+        """
+        now = datetime.utcnow()
+        claimed = self.db.execute(
+            update(SimulationJob)
+            .where(
+                SimulationJob.id == job_id,
+                SimulationJob.status == JobStatus.QUEUED.value,
+            )
+            .values(
+                status=JobStatus.RUNNING.value,
+                started_at=now,
+                worker_id=WORKER_ID,
+                heartbeat_at=now,
+            )
+        )
+        self.db.commit()
+        if claimed.rowcount == 0:
+            return
+
+        job_heartbeat.add(job_id)
+        try:
+            self._run_claimed(job_id)
+        finally:
+            job_heartbeat.remove(job_id)
+
+    def _run_claimed(self, job_id: str) -> None:
+        """Run a job claimed by this process and store the outcome."""
+        job = self.db.get(SimulationJob, job_id)
+        kind = JobKind(job.kind)
+        request = JOB_REQUEST_MODELS[kind].model_validate_json(job.request)
+
+        try:
+            result = self._execute(kind, request, _progress_reporter(job_id))
+            values = {
+                "status": JobStatus.SUCCEEDED.value,
+                "progress": 100.0,
+                "result": result.model_dump_json(),
+            }
+        except ValueError as e:
+            values = {"status": JobStatus.FAILED.value, "error": str(e)}
+        except Exception as e:
+            values = {
+                "status": JobStatus.FAILED.value,
+                "error": f"Simulation failed: {str(e)}",
+            }
+
+        # Discard whatever a failed simulation left in the session
+        self.db.rollback()
+
+        finished_at = datetime.utcnow()
+        self.db.execute(
+            update(SimulationJob)
+            .where(SimulationJob.id == job_id, SimulationJob.worker_id == WORKER_ID)
+            .values(
+                **values,
+                finished_at=finished_at,
+                expires_at=finished_at
+                + timedelta(seconds=settings.job_result_ttl_seconds),
+            )
+        )
+        self.db.commit()
+
+    def _execute(
+        self, kind: JobKind, request: BaseModel, on_progress: ProgressCallback
+    ) -> BaseModel:
+        """Run the simulation of a job and build its response model."""
+        service = SimulationService(self.db)
+
+        if kind == JobKind.RUN:
+            summary, monthly_data = service.run_simulation(
+                portfolio=request.portfolio,
+                investment_type=request.investment_type,
+                initial_amount=request.initial_amount,
+                monthly_contribution=request.monthly_contribution,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                rebalancing=request.rebalancing,
+                engine=request.engine,
+                resolution=request.resolution,
+                max_points=request.max_points,
+            )
+            return SimulationResponse(summary=summary, monthly_data=monthly_data)
+
+        if kind == JobKind.COMPARE:
+            summaries = service.run_batch(
+                scenarios=request.scenarios,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                rebalancing=request.rebalancing,
+            )
+            return ComparisonResponse(
+                scenarios=[
+                    ScenarioResult(
+                        name=scenario.name,
+                        final_value=summary.final_value,
+                        total_invested=summary.total_invested,
+                        total_return_pct=summary.total_return_pct,
+                        cagr=summary.cagr,
+                        mdd=summary.mdd,
+                    )
+                    for scenario, summary in zip(request.scenarios, summaries)
+                ]
+            )
+
+        if kind == JobKind.MONTE_CARLO:
+            return service.run_monte_carlo(
+                portfolio=request.portfolio,
+                investment_type=request.investment_type,
+                initial_amount=request.initial_amount,
+                monthly_contribution=request.monthly_contribution,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                rebalancing=request.rebalancing,
+                horizon_years=request.horizon_years,
+                num_paths=request.num_paths,
+                block_days=request.block_days,
+                seed=request.seed,
+                on_progress=on_progress,
+            )
+
+        if kind == JobKind.ROLLING:
+            return service.run_rolling_windows(
+                portfolio=request.portfolio,
+                investment_type=request.investment_type,
+                initial_amount=request.initial_amount,
+                monthly_contribution=request.monthly_contribution,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                rebalancing=request.rebalancing,
+                horizon_years=request.horizon_years,
+            )
+
+        return service.run_weight_grid(
+            tickers=request.tickers,
+            step_pct=request.step_pct,
+            investment_type=request.investment_type,
+            initial_amount=request.initial_amount,
+            monthly_contribution=request.monthly_contribution,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            rebalancing=request.rebalancing,
+            on_progress=on_progress,
+        )
+
+
+def _progress_reporter(job_id: str) -> ProgressCallback:
+    """
+    Get a callback writing a running job's progress to the job table.
+
+    Writes use their own session, so they are visible while the job's
+    session is still inside a transaction, and are skipped until progress
+    advances by PROGRESS_STEP_PCT.
+    """
+    written = 0.0
+
+    def report(fraction: float) -> None:
+        nonlocal written
+        progress = round(fraction * 100, 1)
+        if progress - written < PROGRESS_STEP_PCT and progress < 100:
+            return
+        written = progress
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(SimulationJob)
+                .where(
+                    SimulationJob.id == job_id, SimulationJob.worker_id == WORKER_ID
+                )
+                .values(progress=progress)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    return report
+
+
+def _run_job_in_session(job_id: str) -> None:
+    """Run one job using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        JobService(db).run_job(job_id)
+    finally:
+        db.close()
+
+
+def resume_jobs_in_session() -> int:
+    """Resume unfinished jobs using a dedicated database session."""
+    db = SessionLocal()
+    try:
+        return JobService(db).resume_jobs()
+    finally:
+        db.close()
@@ -0,0 +1,500 @@
+"""Market data providers."""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+import numpy as np
+
+from app.core.config import settings
+from app.models.etf import ETFDetail
+
+# pandas and yfinance take a large share of the application's import time
+# and are only needed once data is fetched, so they are imported on first use
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Columns of a normalized price history frame (indexed by date)
+HISTORY_COLUMNS = ["open", "high", "low", "close", "adj_close", "volume", "dividend"]
+
+# Yahoo Finance chart API used by YahooChartProvider
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+YAHOO_TIMEOUT_SECONDS = 30.0
+
+# Errors meaning a chart could not be fetched or parsed
+YAHOO_CHART_ERRORS = (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError)
+
+# Serializes yf.download calls, which share module-level result buffers
+_yfinance_download_lock = threading.Lock()
+
+
+def empty_history() -> "pd.DataFrame":
+    """Create an empty normalized price history frame."""
+    import pandas as pd
+
+    return pd.DataFrame(
+        columns=HISTORY_COLUMNS,
+        index=pd.DatetimeIndex([], name="date"),
+        dtype=np.float64,
+    )
+
+
+def normalize_history(frame: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Normalize a price history frame to HISTORY_COLUMNS.
+
+    Column names are matched case-insensitively, so both yfinance style
+    ("Adj Close", "Dividends") and snake_case ("adj_close", "dividend")
+    names are accepted. Rows without a close price are dropped.
+
+    Args:
+        frame: Price history indexed by date
+
+    Returns:
+        Price history with a tz-naive, sorted DatetimeIndex named "date"
+    """
+    import pandas as pd
+
+    if frame.empty:
+        return empty_history()
+
+    renamed = frame.rename(
+        columns=lambda c: str(c).strip().lower().replace(" ", "_")
+    ).rename(columns={"dividends": "dividend"})
+
+    if "adj_close" not in renamed:
+        renamed["adj_close"] = renamed["close"]
+    for column in ("open", "high", "low"):
+        if column not in renamed:
+            renamed[column] = renamed["close"]
+    if "volume" not in renamed:
+        renamed["volume"] = 0
+    if "dividend" not in renamed:
+        renamed["dividend"] = 0.0
+
+    history = renamed[HISTORY_COLUMNS].dropna(subset=["close", "adj_close"])
+    history = history.astype(np.float64)
+    history["volume"] = history["volume"].fillna(0.0)
+    history["dividend"] = history["dividend"].fillna(0.0)
+
+    index = pd.DatetimeIndex(history.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    history.index = index.normalize().rename("date")
+
+    return history.sort_index()
+
+
+class MarketDataProvider(ABC):
+    """Source of ETF metadata and daily price history."""
+
+    name: str
+
+    # Whether get_history leaves out tickers without prices in the range
+    # instead of mapping them to an empty frame
+    omits_empty_history = False
+
+    @abstractmethod
+    def get_etf_detail(self, ticker: str) -> ETFDetail | None:
+        """
+        Get detailed information about an ETF.
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            ETF detail or None if not found
+        """
+
+    @abstractmethod
+    def get_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> dict[str, "pd.DataFrame"]:
+        """
+        Get daily price history for several tickers at once.
+
+        Args:
+            tickers: ETF ticker symbols
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Normalized price history frames keyed by ticker; tickers with
+            no data in the range map to an empty frame and tickers that
+            could not be fetched are left out (providers that cannot tell
+            the two apart leave out both and set omits_empty_history)
+        """
+
+    async def get_etf_detail_async(self, ticker: str) -> ETFDetail | None:
+        """
+        Get detailed information about an ETF without blocking the loop.
+
+        Providers without an async client run get_etf_detail in a worker
+        thread.
+        """
+        return await asyncio.to_thread(self.get_etf_detail, ticker)
+
+    async def get_history_async(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> dict[str, "pd.DataFrame"]:
+        """
+        Get daily price history for several tickers without blocking the loop.
+
+        Providers without an async client run get_history in a worker
+        thread.
+        """
+        return await asyncio.to_thread(self.get_history, tickers, start_date, end_date)
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Market data provider backed by Yahoo Finance."""
+
+    name = "yfinance"
+    omits_empty_history = True
+
+    def get_etf_detail(self, ticker: str) -> ETFDetail | None:
+        """Get ETF detail from the yfinance info endpoint."""
+        import yfinance as yf
+
+        try:
+            info = yf.Ticker(ticker).info
+        except Exception:
+            return None
+
+        # Extract relevant information
+        name = info.get("longName", info.get("shortName", ticker))
+        category = info.get("category", info.get("quoteType", "ETF"))
+        expense_ratio = info.get("annualReportExpenseRatio")
+        if expense_ratio:
+            expense_ratio = expense_ratio * 100  # Convert to percentage
+
+        dividend_yield = info.get("yield")
+        if dividend_yield:
+            dividend_yield = dividend_yield * 100  # Convert to percentage
+
+        # Parse inception date
+        inception_date = None
+        fund_inception = info.get("fundInceptionDate")
+        if fund_inception:
+            try:
+                inception_date = datetime.fromtimestamp(fund_inception).date()
+            except (ValueError, TypeError):
+                pass
+
+        return ETFDetail(
+            ticker=ticker,
+            name=name,
+            category=category,
+            expense_ratio=expense_ratio,
+            dividend_yield=dividend_yield,
+            inception_date=inception_date,
+            aum=info.get("totalAssets"),
+            description=info.get("longBusinessSummary"),
+        )
+
+    def get_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> dict[str, "pd.DataFrame"]:
+        """
+        Download price history for all tickers in one yfinance request.
+
+        yf.download collects results in module globals, so concurrent calls
+        overwrite each other's tickers; downloads are serialized per process.
+        A ticker without a column or with only missing prices is left out,
+        as yfinance reports failed tickers the same way as empty ranges.
+        """
+        import pandas as pd
+        import yfinance as yf
+
+        with _yfinance_download_lock:
+            data = yf.download(
+                tickers,
+                start=start_date.isoformat(),
+                end=(end_date + timedelta(days=1)).isoformat(),
+                auto_adjust=False,
+                actions=True,
+                group_by="ticker",
+                progress=False,
+                threads=True,
+            )
+
+        if data is None or data.empty:
+            return {}
+
+        history = {}
+        for ticker in tickers:
+            if not isinstance(data.columns, pd.MultiIndex):
+                frame = normalize_history(data)
+            elif ticker in data.columns.get_level_values(0):
+                frame = normalize_history(data[ticker])
+            else:
+                continue
+
+            if not frame.empty:
+                history[ticker] = frame
+
+        return history
+
+
+class YahooChartProvider(MarketDataProvider):
+    """
+    Market data provider calling the Yahoo Finance chart API with httpx.
+
+    Unlike YFinanceProvider it has a native async client, so async
+    endpoints fetch prices without holding a thread. ETF metadata is
+    limited to the name and instrument type returned by the chart API.
+    """
+
+    name = "yahoo_chart"
+
+    # Yahoo rejects requests without a browser-like user agent
+    HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+    def get_etf_detail(self, ticker: str) -> ETFDetail | None:
+        """Get ETF detail from the chart API metadata."""
+        with httpx.Client(
+            headers=self.HEADERS, timeout=YAHOO_TIMEOUT_SECONDS
+        ) as client:
+            try:
+                response = client.get(
+                    YAHOO_CHART_URL.format(ticker=ticker), params={"range": "1d"}
+                )
+                response.raise_for_status()
+                return self._parse_detail(ticker, response.json())
+            except YAHOO_CHART_ERRORS:
+                return None
+
+    async def get_etf_detail_async(self, ticker: str) -> ETFDetail | None:
+        """Get ETF detail from the chart API metadata asynchronously."""
+        async with httpx.AsyncClient(
+            headers=self.HEADERS, timeout=YAHOO_TIMEOUT_SECONDS
+        ) as client:
+            try:
+                response = await client.get(
+                    YAHOO_CHART_URL.format(ticker=ticker), params={"range": "1d"}
+                )
+                response.raise_for_status()
+                return self._parse_detail(ticker, response.json())
+            except YAHOO_CHART_ERRORS:
+                return None
+
+    def get_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> dict[str, "pd.DataFrame"]:
+        """Download price history one ticker at a time."""
+        params = self._history_params(start_date, end_date)
+
+        history = {}
+        with httpx.Client(
+            headers=self.HEADERS, timeout=YAHOO_TIMEOUT_SECONDS
+        ) as client:
+            for ticker in tickers:
+                try:
+                    response = client.get(
+                        YAHOO_CHART_URL.format(ticker=ticker), params=params
+                    )
+                    response.raise_for_status()
+                    history[ticker] = self._parse_history(response.json())
+                except YAHOO_CHART_ERRORS:
+                    continue
+
+        return history
+
+    async def get_history_async(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> dict[str, "pd.DataFrame"]:
+        """
+        Download price history of all tickers concurrently.
+
+        At most PRICE_FETCH_CONCURRENCY requests are in flight at once.
+        """
+        params = self._history_params(start_date, end_date)
+        semaphore = asyncio.Semaphore(settings.price_fetch_concurrency)
+
+        async with httpx.AsyncClient(
+            headers=self.HEADERS, timeout=YAHOO_TIMEOUT_SECONDS
+        ) as client:
+
+            async def fetch(ticker: str) -> "pd.DataFrame | None":
+                async with semaphore:
+                    try:
+                        response = await client.get(
+                            YAHOO_CHART_URL.format(ticker=ticker), params=params
+                        )
+                        response.raise_for_status()
+                        return self._parse_history(response.json())
+                    except YAHOO_CHART_ERRORS:
+                        return None
+
+            frames = await asyncio.gather(*(fetch(ticker) for ticker in tickers))
+
+        return {
+            ticker: frame
+            for ticker, frame in zip(tickers, frames)
+            if frame is not None
+        }
+
+    def _history_params(self, start_date: date, end_date: date) -> dict[str, str]:
+        """Build chart API query parameters for daily bars in a date range."""
+        import pandas as pd
+
+        start = pd.Timestamp(start_date, tz="UTC")
+        end = pd.Timestamp(end_date + timedelta(days=1), tz="UTC")
+        return {
+            "period1": str(int(start.timestamp())),
+            "period2": str(int(end.timestamp())),
+            "interval": "1d",
+            "events": "div",
+            "includeAdjustedClose": "true",
+        }
+
+    def _parse_detail(self, ticker: str, payload: dict) -> ETFDetail:
+        """Build ETF detail from a chart API response."""
+        meta = payload["chart"]["result"][0]["meta"]
+        return ETFDetail(
+            ticker=ticker,
+            name=meta.get("longName") or meta.get("shortName") or ticker,
+            category=meta.get("instrumentType", "ETF"),
+        )
+
+    def _parse_history(self, payload: dict) -> "pd.DataFrame":
+        """Build a normalized price history frame from a chart API response."""
+        import pandas as pd
+
+        result = payload["chart"]["result"][0]
+        timestamps = result.get("timestamp")
+        if not timestamps:
+            return empty_history()
+
+        # Bars are stamped at the exchange open; shift them to local dates
+        offset = result["meta"].get("gmtoffset", 0)
+        quote = result["indicators"]["quote"][0]
+        adj_close = result["indicators"].get("adjclose", [{}])[0].get("adjclose")
+
+        frame = pd.DataFrame(
+            {
+                "open": quote["open"],
+                "high": quote["high"],
+                "low": quote["low"],
+                "close": quote["close"],
+                "adj_close": adj_close or quote["close"],
+                "volume": quote["volume"],
+            },
+            index=pd.to_datetime(np.asarray(timestamps) + offset, unit="s"),
+            dtype=np.float64,
+        )
+        history = normalize_history(frame)
+
+        dividends = result.get("events", {}).get("dividends", {}).values()
+        if dividends:
+            amounts = pd.Series(
+                [event["amount"] for event in dividends],
+                index=pd.to_datetime(
+                    np.asarray([event["date"] for event in dividends]) + offset,
+                    unit="s",
+                ).normalize(),
+            )
+            history["dividend"] = (
+                amounts.groupby(level=0).sum().reindex(history.index, fill_value=0.0)
+            )
+
+        return history
+
+
+class LocalFileProvider(MarketDataProvider):
+    """
+    Market data provider reading a local directory.
+
+    Price history is read from `<TICKER>.parquet` or `<TICKER>.csv` with a
+    date column plus close/adj_close/dividend (and optionally open, high,
+    low, volume) columns. ETF metadata is read from an optional `etfs.csv`
+    with the ETFDetail fields as columns.
+    """
+
+    name = "local"
+
+    def __init__(self, data_dir: str | Path):
+        """Initialize provider with the data directory."""
+        self.data_dir = Path(data_dir)
+
+    def get_etf_detail(self, ticker: str) -> ETFDetail | None:
+        """Get ETF detail from etfs.csv, or a minimal one if prices exist."""
+        import pandas as pd
+
+        metadata_path = self.data_dir / "etfs.csv"
+        if metadata_path.exists():
+            metadata = pd.read_csv(metadata_path, dtype={"ticker": str})
+            rows = metadata[metadata["ticker"].str.upper() == ticker]
+            if not rows.empty:
+                row = rows.iloc[0].dropna().to_dict()
+                row["ticker"] = ticker
+                return ETFDetail(**row)
+
+        if self._history_path(ticker) is None:
+            return None
+
+        return ETFDetail(ticker=ticker, name=ticker, category="ETF")
+
+    def get_history(
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> dict[str, "pd.DataFrame"]:
+        """Read price history files for all tickers, leaving out unknown ones."""
+        import pandas as pd
+
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+        history = {}
+        for ticker in tickers:
+            if self._history_path(ticker) is None:
+                continue
+
+            frame = self._read_history(ticker)
+            history[ticker] = frame[(frame.index >= start) & (frame.index <= end)]
+
+        return history
+
+    def _history_path(self, ticker: str) -> Path | None:
+        """Find the price history file of a ticker."""
+        for suffix in (".parquet", ".csv"):
+            path = self.data_dir / f"{ticker}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _read_history(self, ticker: str) -> "pd.DataFrame":
+        """Read and normalize a ticker's price history file."""
+        import pandas as pd
+
+        path = self._history_path(ticker)
+        if path is None:
+            return empty_history()
+
+        if path.suffix == ".parquet":
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_csv(path)
+
+        date_column = next(c for c in frame.columns if str(c).lower() == "date")
+        frame = frame.set_index(pd.to_datetime(frame.pop(date_column)))
+
+        return normalize_history(frame)
+
+
+@lru_cache
+def get_market_data_provider() -> MarketDataProvider:
+    """Get the market data provider configured in settings."""
+    if settings.market_data_provider == LocalFileProvider.name:
+        return LocalFileProvider(settings.market_data_dir)
+    if settings.market_data_provider == YFinanceProvider.name:
+        return YFinanceProvider()
+    if settings.market_data_provider == YahooChartProvider.name:
+        return YahooChartProvider()
+
+    raise ValueError(
+        f"Unknown market data provider: {settings.market_data_provider}"
+    )
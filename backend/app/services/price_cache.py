@@ -0,0 +1,318 @@
+"""Two-tier price series cache."""
+
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.price_panel import PRICE_FIELDS, PriceSeries
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Cached price series with the date range it was loaded for."""
+
+    series: PriceSeries
+    start_date: date
+    end_date: date
+    created_at: float
+
+    def covers(self, start_date: date, end_date: date) -> bool:
+        """Check whether the entry was loaded for a superset of a range."""
+        return self.start_date <= start_date and end_date <= self.end_date
+
+
+class PriceSeriesCache:
+    """
+    Price series cache keyed by ticker.
+
+    The first tier is an in-process LRU bounded by the total size of the
+    cached arrays. The second, optional tier is a directory of `.npz`
+    files shared by every worker on the host; files are replaced
+    atomically so readers never see partial writes. Entries in both tiers
+    expire after `ttl_seconds`.
+
+    Invalidating a ticker also stamps `<ticker>.invalidated` in the shared
+    directory with the current time. Every lookup checks the stamp, so
+    other workers drop entries cached before it instead of serving them
+    until they expire. Without a shared directory invalidation only
+    reaches the calling worker.
+    """
+
+    def __init__(
+        self, ttl_seconds: int, max_bytes: int, shared_dir: str | None = None
+    ):
+        """Initialize cache with TTL, memory bound and shared directory."""
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> PriceSeries | None:
+        """
+        Get a ticker's price series for a date range.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Cached price series restricted to the range, or None on a miss
+        """
+        invalidated_at = self.invalidated_at(ticker)
+
+        with self._lock:
+            entry = self._entries.get(ticker)
+            stale = entry is not None and self._stale_counter(entry, invalidated_at)
+            if stale:
+                self._remove(ticker)
+                self._stats[stale] += 1
+                entry = None
+
+            if entry is not None and entry.covers(start_date, end_date):
+                self._entries.move_to_end(ticker)
+                self._stats["memory_hits"] += 1
+                return entry.series.between(start_date, end_date)
+
+        entry = self._read_shared(ticker, invalidated_at)
+        if entry is not None and entry.covers(start_date, end_date):
+            with self._lock:
+                self._store(ticker, entry)
+                self._stats["shared_hits"] += 1
+            return entry.series.between(start_date, end_date)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def contains(self, ticker: str, start_date: date, end_date: date) -> bool:
+        """
+        Check whether a ticker's price series for a date range is cached.
+
+        Unlike get, this does not count as a hit or miss.
+
+        Args:
+            ticker: ETF ticker symbol
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            True if get would return the series
+        """
+        invalidated_at = self.invalidated_at(ticker)
+
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if (
+                entry is not None
+                and not self._stale_counter(entry, invalidated_at)
+                and entry.covers(start_date, end_date)
+            ):
+                return True
+
+        entry = self._read_shared(ticker, invalidated_at)
+        if entry is None or not entry.covers(start_date, end_date):
+            return False
+
+        # Keep the entry in memory for the get that usually follows
+        with self._lock:
+            self._store(ticker, entry)
+        return True
+
+    def put(self, series: PriceSeries, start_date: date, end_date: date) -> None:
+        """
+        Cache a ticker's price series loaded for a date range.
+
+        Args:
+            series: Price series
+            start_date: Start of the range the series was loaded for
+            end_date: End of the range the series was loaded for
+        """
+        entry = CacheEntry(series, start_date, end_date, time.time())
+
+        with self._lock:
+            self._store(series.ticker, entry)
+
+        self._write_shared(series.ticker, entry)
+
+    def invalidate(self, ticker: str) -> None:
+        """Drop a ticker from both cache tiers in every worker."""
+        with self._lock:
+            if ticker in self._entries:
+                self._stats["invalidations"] += 1
+            self._remove(ticker)
+
+        path = self._shared_path(ticker)
+        if path is None:
+            return
+
+        path.unlink(missing_ok=True)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stamp = path.with_suffix(".invalidated")
+            stamp.touch()
+            now = time.time()
+            os.utime(stamp, (now, now))
+        except OSError:
+            pass
+
+    def invalidated_at(self, ticker: str) -> float:
+        """
+        Get when a ticker was last invalidated by any worker.
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Unix time of the last invalidation, or 0 if unknown
+        """
+        path = self._shared_path(ticker)
+        if path is None:
+            return 0.0
+
+        try:
+            return path.with_suffix(".invalidated").stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def clear(self) -> None:
+        """Drop all entries from the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get hit, miss and eviction counters plus current memory usage."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        """Check whether an entry is older than the TTL."""
+        return time.time() - entry.created_at > self.ttl_seconds
+
+    def _stale_counter(self, entry: CacheEntry, invalidated_at: float) -> str | None:
+        """Get the counter of a stale entry, or None if it can be served."""
+        if entry.created_at <= invalidated_at:
+            return "invalidations"
+        if self._is_expired(entry):
+            return "expirations"
+        return None
+
+    def _store(self, ticker: str, entry: CacheEntry) -> None:
+        """Store an entry in the LRU tier, evicting as needed (lock held)."""
+        self._remove(ticker)
+        if entry.series.nbytes > self.max_bytes:
+            return
+
+        self._entries[ticker] = entry
+        self._bytes += entry.series.nbytes
+
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.series.nbytes
+            self._stats["evictions"] += 1
+
+    def _remove(self, ticker: str) -> None:
+        """Remove an entry from the LRU tier (lock held)."""
+        entry = self._entries.pop(ticker, None)
+        if entry is not None:
+            self._bytes -= entry.series.nbytes
+
+    def _shared_path(self, ticker: str) -> Path | None:
+        """Get the shared tier file of a ticker."""
+        if self.shared_dir is None:
+            return None
+        return self.shared_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)}.npz"
+
+    def _read_shared(self, ticker: str, invalidated_at: float) -> CacheEntry | None:
+        """Read a ticker's entry from the shared tier unless it is stale."""
+        path = self._shared_path(ticker)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with np.load(path) as data:
+                start_day, end_day, created_at = data["meta"]
+                entry = CacheEntry(
+                    series=PriceSeries(
+                        ticker=ticker,
+                        dates=data["dates"].astype("datetime64[D]"),
+                        **{field: data[field] for field in PRICE_FIELDS},
+                    ),
+                    start_date=np.datetime64(int(start_day), "D").item(),
+                    end_date=np.datetime64(int(end_day), "D").item(),
+                    created_at=float(created_at),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+        stale = self._stale_counter(entry, invalidated_at)
+        if stale:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._stats[stale] += 1
+            return None
+
+        return entry
+
+    def _write_shared(self, ticker: str, entry: CacheEntry) -> None:
+        """Write a ticker's entry to the shared tier atomically."""
+        path = self._shared_path(ticker)
+        if path is None:
+            return
+
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    dates=entry.series.dates.astype(np.int32),
+                    meta=np.array(
+                        [
+                            np.datetime64(entry.start_date, "D").astype(np.int64),
+                            np.datetime64(entry.end_date, "D").astype(np.int64),
+                            entry.created_at,
+                        ]
+                    ),
+                    **{field: getattr(entry.series, field) for field in PRICE_FIELDS},
+                )
+            os.replace(tmp_path, path)
+        except OSError:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+
+price_cache = PriceSeriesCache(
+    ttl_seconds=settings.cache_ttl_seconds,
+    max_bytes=settings.price_cache_max_bytes,
+    shared_dir=settings.price_cache_dir or None,
+)
@@ -0,0 +1,207 @@
+"""Aligned multi-ticker price data."""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PRICE_FIELDS = ("adj_close", "close", "dividend")
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Daily price data of a single ticker as NumPy arrays."""
+
+    ticker: str
+    dates: np.ndarray
+    adj_close: np.ndarray
+    close: np.ndarray
+    dividend: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of trading days in the series."""
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the series arrays."""
+        return self.dates.nbytes + sum(
+            getattr(self, field).nbytes for field in PRICE_FIELDS
+        )
+
+    @classmethod
+    def from_frame(cls, ticker: str, frame: "pd.DataFrame") -> "PriceSeries":
+        """Build a series from a DataFrame indexed by date."""
+        return cls(
+            ticker=ticker,
+            dates=frame.index.to_numpy().astype("datetime64[D]"),
+            **{field: frame[field].to_numpy(np.float64) for field in PRICE_FIELDS},
+        )
+
+    def between(self, start_date: date, end_date: date) -> "PriceSeries":
+        """
+        Get the part of the series within an inclusive date range.
+
+        Args:
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Price series sharing memory with this one
+        """
+        rows = slice(
+            np.searchsorted(self.dates, np.datetime64(start_date, "D"), "left"),
+            np.searchsorted(self.dates, np.datetime64(end_date, "D"), "right"),
+        )
+        return PriceSeries(
+            ticker=self.ticker,
+            dates=self.dates[rows],
+            **{field: getattr(self, field)[rows] for field in PRICE_FIELDS},
+        )
+
+
+@dataclass(frozen=True)
+class PricePanel:
+    """
+    Price data for several tickers on one shared trading calendar.
+
+    All 2-D arrays are C-contiguous float64 with shape (dates, tickers).
+    Prices are NaN and dividends are 0 where a ticker has no row for a
+    date; `present` marks the cells that hold real data.
+    """
+
+    dates: np.ndarray
+    tickers: tuple[str, ...]
+    adj_close: np.ndarray
+    close: np.ndarray
+    dividend: np.ndarray
+    present: np.ndarray
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, "pd.DataFrame"]) -> "PricePanel":
+        """
+        Build a panel from per-ticker DataFrames indexed by date.
+
+        Args:
+            frames: DataFrames with adj_close, close and dividend columns
+
+        Returns:
+            Price panel covering the union of all frame dates
+        """
+        return cls.from_series(
+            [PriceSeries.from_frame(ticker, df) for ticker, df in frames.items()]
+        )
+
+    @classmethod
+    def from_series(cls, series: list[PriceSeries]) -> "PricePanel":
+        """
+        Build a panel from per-ticker price series.
+
+        Args:
+            series: Price series, one per ticker, in column order
+
+        Returns:
+            Price panel covering the union of all series dates
+        """
+        tickers = tuple(s.ticker for s in series)
+        dates = (
+            np.unique(np.concatenate([s.dates for s in series]))
+            if series
+            else np.empty(0, dtype="datetime64[D]")
+        )
+
+        shape = (len(dates), len(tickers))
+        arrays = {field: np.full(shape, np.nan) for field in PRICE_FIELDS}
+        present = np.zeros(shape, dtype=bool)
+
+        for col, ticker_series in enumerate(series):
+            rows = np.searchsorted(dates, ticker_series.dates)
+            present[rows, col] = True
+            for field in PRICE_FIELDS:
+                arrays[field][rows, col] = getattr(ticker_series, field)
+
+        arrays["dividend"] = np.where(
+            present, np.nan_to_num(arrays["dividend"]), 0.0
+        )
+
+        return cls(dates=dates, tickers=tickers, present=present, **arrays)
+
+    def __len__(self) -> int:
+        """Number of trading days in the panel."""
+        return len(self.dates)
+
+    def column(self, ticker: str) -> int:
+        """Column index of a ticker."""
+        return self.tickers.index(ticker)
+
+    def select(self, tickers: list[str]) -> "PricePanel":
+        """
+        Restrict the panel to a subset of tickers.
+
+        Dates on which none of the selected tickers trade are dropped, so
+        the result is identical to a panel built from those tickers alone.
+
+        Args:
+            tickers: Tickers to keep, in column order
+
+        Returns:
+            Price panel for the selected tickers
+        """
+        if tuple(tickers) == self.tickers:
+            return self
+
+        cols = [self.column(ticker) for ticker in tickers]
+        present = self.present[:, cols]
+        rows = present.any(axis=1)
+
+        return PricePanel(
+            dates=self.dates[rows],
+            tickers=tuple(tickers),
+            adj_close=np.ascontiguousarray(self.adj_close[rows][:, cols]),
+            close=np.ascontiguousarray(self.close[rows][:, cols]),
+            dividend=np.ascontiguousarray(self.dividend[rows][:, cols]),
+            present=np.ascontiguousarray(present[rows]),
+        )
+
+    def take_rows(self, rows: slice | np.ndarray) -> "PricePanel":
+        """
+        Restrict the panel to a subset of dates.
+
+        Args:
+            rows: Slice, boolean mask or indices of the dates to keep
+
+        Returns:
+            Price panel for the selected dates
+        """
+        return PricePanel(
+            dates=self.dates[rows],
+            tickers=self.tickers,
+            adj_close=np.ascontiguousarray(self.adj_close[rows]),
+            close=np.ascontiguousarray(self.close[rows]),
+            dividend=np.ascontiguousarray(self.dividend[rows]),
+            present=np.ascontiguousarray(self.present[rows]),
+        )
+
+    def frame(self, ticker: str) -> "pd.DataFrame":
+        """
+        Get one ticker's rows as a DataFrame indexed by date.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            DataFrame with adj_close, close and dividend columns
+        """
+        import pandas as pd
+
+        col = self.column(ticker)
+        rows = self.present[:, col]
+        df = pd.DataFrame(
+            {field: getattr(self, field)[rows, col] for field in PRICE_FIELDS},
+            index=pd.DatetimeIndex(self.dates[rows], name="date"),
+        )
+        return df
@@ -0,0 +1,184 @@
+"""Memory-mapped columnar price store."""
+
+import fcntl
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.price_panel import PRICE_FIELDS, PriceSeries
+from app.utils.date_ranges import DateRange, missing_trading_ranges
+
+# Reads retried when a concurrent sync replaces the files being opened
+READ_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class StoredPrices:
+    """A ticker's full stored price history and the ranges it covers."""
+
+    series: PriceSeries
+    coverage: list[DateRange]
+
+    def missing_ranges(self, start_date: date, end_date: date) -> list[DateRange]:
+        """
+        Get the parts of a date range the stored history does not cover.
+
+        Args:
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Uncovered date ranges
+        """
+        return missing_trading_ranges(start_date, end_date, self.coverage)
+
+
+class ColumnarPriceStore:
+    """
+    On-disk columnar mirror of price_history.
+
+    Every ticker has a directory holding one `.npy` file per column: int32
+    day numbers since the epoch plus float64 adj_close, close and dividend.
+    Price columns are memory-mapped on load, so a series is a zero-copy
+    view of the page cache shared by every worker on the host.
+
+    A sync writes a new generation of column files next to the current
+    one and then atomically replaces `meta.json`, which names the current
+    generation and the covered date ranges. Readers never see a partially
+    written generation.
+    """
+
+    def __init__(self, root_dir: str | None):
+        """Initialize store rooted at a directory (None disables it)."""
+        self.root_dir = Path(root_dir) if root_dir else None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the store is configured."""
+        return self.root_dir is not None
+
+    def load(self, ticker: str) -> StoredPrices | None:
+        """
+        Load a ticker's stored price history.
+
+        Args:
+            ticker: ETF ticker symbol
+
+        Returns:
+            Memory-mapped price history, or None if the ticker is not stored
+        """
+        ticker_dir = self._ticker_dir(ticker)
+        if ticker_dir is None:
+            return None
+
+        for _ in range(READ_ATTEMPTS):
+            try:
+                meta = json.loads((ticker_dir / "meta.json").read_text())
+                generation = meta["generation"]
+                # Empty files cannot be memory-mapped
+                mmap_mode = "r" if meta["rows"] else None
+                days = np.load(ticker_dir / f"dates.{generation}.npy")
+                columns = {
+                    field: np.load(
+                        ticker_dir / f"{field}.{generation}.npy", mmap_mode=mmap_mode
+                    )
+                    for field in PRICE_FIELDS
+                }
+            except FileNotFoundError:
+                # Either not stored or replaced by a concurrent sync
+                continue
+            except (OSError, KeyError, ValueError):
+                return None
+
+            return StoredPrices(
+                series=PriceSeries(
+                    ticker=ticker,
+                    dates=days.astype("datetime64[D]"),
+                    **columns,
+                ),
+                coverage=[
+                    (date.fromisoformat(start), date.fromisoformat(end))
+                    for start, end in meta["coverage"]
+                ],
+            )
+
+        return None
+
+    def write(
+        self, series: PriceSeries, coverage: list[DateRange]
+    ) -> StoredPrices | None:
+        """
+        Replace a ticker's stored price history.
+
+        Args:
+            series: Full price history of the ticker
+            coverage: Date ranges the history covers
+
+        Returns:
+            The newly stored history, or None if it could not be written
+        """
+        ticker_dir = self._ticker_dir(series.ticker)
+        if ticker_dir is None:
+            return None
+
+        generation = f"{time.time_ns():x}"
+        columns = {
+            "dates": series.dates.astype("datetime64[D]").astype(np.int32),
+            **{
+                field: np.asarray(getattr(series, field), dtype=np.float64)
+                for field in PRICE_FIELDS
+            },
+        }
+        meta = {
+            "generation": generation,
+            "rows": len(series),
+            "coverage": [
+                [start.isoformat(), end.isoformat()] for start, end in coverage
+            ],
+        }
+
+        try:
+            ticker_dir.mkdir(parents=True, exist_ok=True)
+            with open(ticker_dir / ".lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+                for name, values in columns.items():
+                    np.save(ticker_dir / f"{name}.{generation}.npy", values)
+                self._replace(ticker_dir / "meta.json", json.dumps(meta))
+
+                # Drop older generations; open memory maps stay valid
+                for path in ticker_dir.glob("*.npy"):
+                    if path.suffixes[-2:] != [f".{generation}", ".npy"]:
+                        path.unlink(missing_ok=True)
+        except OSError:
+            return None
+
+        return self.load(series.ticker)
+
+    def _ticker_dir(self, ticker: str) -> Path | None:
+        """Get the directory of a ticker."""
+        if self.root_dir is None:
+            return None
+        return self.root_dir / re.sub(r"[^A-Za-z0-9_.-]", "_", ticker)
+
+    def _replace(self, path: Path, content: str) -> None:
+        """Write a file atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+price_store = ColumnarPriceStore(settings.price_store_dir or None)
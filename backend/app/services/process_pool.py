@@ -0,0 +1,76 @@
+"""Shared worker process pool for CPU-bound simulations."""
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+# Called with the completed fraction of a computation, from 0 to 1
+ProgressCallback = Callable[[float], None]
+
+_process_pool: ProcessPoolExecutor | None = None
+_process_pool_lock = threading.Lock()
+
+
+def map_chunks(
+    fn: Callable[..., Any],
+    *iterables: Iterable[Any],
+    max_workers: int,
+    on_progress: ProgressCallback | None = None,
+) -> list[Any]:
+    """
+    Apply a function to chunks of work, in worker processes when useful.
+
+    Work stays in the calling thread when there is a single chunk or a
+    single CPU, since shipping it to another process would only add
+    pickling overhead.
+
+    Args:
+        fn: Picklable module-level function
+        *iterables: Arguments of each call, as for `map`
+        max_workers: Worker processes, capped at the number of CPUs (0 or
+            1 runs in-process)
+        on_progress: Called with the fraction of chunks done after each
+            chunk completes
+
+    Returns:
+        Results in chunk order
+    """
+    calls = list(zip(*iterables))
+    max_workers = min(max_workers, os.cpu_count() or 1)
+
+    if max_workers <= 1 or len(calls) <= 1:
+        results = []
+        for args in calls:
+            results.append(fn(*args))
+            if on_progress is not None:
+                on_progress(len(results) / len(calls))
+        return results
+
+    pool = _get_process_pool(max_workers)
+    futures = [pool.submit(fn, *args) for args in calls]
+    if on_progress is not None:
+        for done, _ in enumerate(as_completed(futures), start=1):
+            on_progress(done / len(futures))
+
+    return [future.result() for future in futures]
+
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared worker pool, starting it on first use.
+
+    Workers are spawned rather than forked, since forking a process that
+    runs request threads may copy locks held by other threads.
+    """
+    global _process_pool
+
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
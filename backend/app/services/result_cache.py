@@ -0,0 +1,229 @@
+"""Memoized simulation results."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from app.core.config import settings
+from app.models.etf import Resolution
+from app.models.simulation import (
+    InvestmentType,
+    PortfolioItem,
+    RebalancingFrequency,
+    SimulationEngine,
+)
+from app.services.price_cache import price_cache
+
+# Decimal places kept when comparing portfolio weights
+WEIGHT_DECIMALS = 6
+
+
+def simulation_fingerprint(
+    portfolio: list[PortfolioItem],
+    investment_type: InvestmentType,
+    initial_amount: float,
+    monthly_contribution: float,
+    start_date: date,
+    end_date: date,
+    rebalancing: RebalancingFrequency,
+    engine: SimulationEngine,
+    resolution: Resolution,
+    max_points: int | None,
+) -> str:
+    """
+    Get a canonical hash of simulation parameters.
+
+    Requests that only differ in portfolio item order, ticker case,
+    floating point noise in the weights, or a monthly contribution ignored by a lump sum
+    investment get the same fingerprint.
+
+    Args:
+        portfolio: List of portfolio items with ticker and weight
+        investment_type: Type of investment (lump_sum or dca)
+        initial_amount: Initial investment amount
+        monthly_contribution: Monthly contribution for DCA
+        start_date: Simulation start date
+        end_date: Simulation end date
+        rebalancing: Rebalancing frequency
+        engine: Simulation engine
+        resolution: Snapshot resolution
+        max_points: Maximum number of snapshots
+
+    Returns:
+        Hex digest identifying the simulation
+    """
+    if investment_type == InvestmentType.LUMP_SUM:
+        monthly_contribution = 0.0
+
+    canonical = {
+        "portfolio": sorted(
+            (item.ticker.strip().upper(), round(item.weight, WEIGHT_DECIMALS))
+            for item in portfolio
+        ),
+        "investment_type": investment_type.value,
+        "initial_amount": float(initial_amount),
+        "monthly_contribution": float(monthly_contribution),
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "rebalancing": rebalancing.value,
+        "engine": engine.value,
+        "resolution": resolution.value,
+        "max_points": max_points,
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class ResultEntry:
+    """Cached simulation result with the tickers it was computed from."""
+
+    result: Any
+    tickers: frozenset[str]
+    created_at: float
+
+
+class SimulationResultCache:
+    """
+    In-process LRU cache of simulation results keyed by fingerprint.
+
+    Entries expire after `ttl_seconds` and are dropped as soon as price
+    data of any ticker they were computed from changes. Changes made by
+    other workers are seen through `invalidated_at`, which gives the last
+    time any worker invalidated a ticker.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        invalidated_at: Callable[[str], float] | None = None,
+    ):
+        """Initialize cache with TTL, maximum entries and invalidation times."""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.invalidated_at = invalidated_at
+
+        self._entries: OrderedDict[str, ResultEntry] = OrderedDict()
+        self._keys_by_ticker: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key: str) -> Any | None:
+        """
+        Get a cached result.
+
+        Args:
+            key: Simulation fingerprint
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry.created_at > self.ttl_seconds:
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+
+            if entry is not None and self._invalidated_elsewhere(entry):
+                self._remove(key)
+                self._stats["invalidations"] += 1
+                entry = None
+
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.result
+
+    def put(self, key: str, result: Any, tickers: list[str]) -> None:
+        """
+        Cache a result computed from the price data of some tickers.
+
+        Args:
+            key: Simulation fingerprint
+            result: Simulation result
+            tickers: Tickers whose price data the result depends on
+        """
+        entry = ResultEntry(
+            result=result,
+            tickers=frozenset(ticker.upper() for ticker in tickers),
+            created_at=time.time(),
+        )
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            for ticker in entry.tickers:
+                self._keys_by_ticker.setdefault(ticker, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate_ticker(self, ticker: str) -> None:
+        """Drop every result computed from a ticker's price data."""
+        with self._lock:
+            for key in list(self._keys_by_ticker.get(ticker.upper(), ())):
+                self._remove(key)
+                self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_ticker.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get hit, miss and eviction counters plus the number of entries."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def _invalidated_elsewhere(self, entry: ResultEntry) -> bool:
+        """Check whether any worker invalidated a ticker of an entry since."""
+        if self.invalidated_at is None:
+            return False
+        return any(
+            self.invalidated_at(ticker) >= entry.created_at
+            for ticker in entry.tickers
+        )
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its ticker index references (lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for ticker in entry.tickers:
+            keys = self._keys_by_ticker.get(ticker)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_ticker[ticker]
+
+
+simulation_result_cache = SimulationResultCache(
+    ttl_seconds=settings.cache_ttl_seconds,
+    max_entries=settings.simulation_cache_max_entries,
+    invalidated_at=price_cache.invalidated_at,
+)
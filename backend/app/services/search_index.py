@@ -0,0 +1,323 @@
+"""In-memory ranked ETF search index."""
+
+import bisect
+import heapq
+import itertools
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.models.etf import ETFSearchResult
+
+# Minimum trigram similarity for fuzzy matches
+FUZZY_THRESHOLD = 0.3
+
+# Sorts after every character that can appear in a key
+PREFIX_END = "\uffff"
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def trigrams(word: str) -> set[str]:
+    """
+    Get the trigrams of a word in the style of PostgreSQL pg_trgm.
+
+    The word is padded with two spaces in front and one behind, so short
+    words and word starts produce trigrams as well.
+
+    Args:
+        word: Lowercase word
+
+    Returns:
+        Set of trigrams
+    """
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class IndexedETF:
+    """ETF entry with its precomputed search keys."""
+
+    result: ETFSearchResult
+    haystack: str
+    name_tokens: tuple[str, ...]
+    words: tuple[str, ...]
+
+    @classmethod
+    def from_result(cls, result: ETFSearchResult) -> "IndexedETF":
+        """Build an entry from a search result."""
+        text = f"{result.ticker} {result.name}"
+        return cls(
+            result=result,
+            haystack=text.lower(),
+            name_tokens=tuple(dict.fromkeys(tokenize(result.name))),
+            words=tuple(dict.fromkeys(tokenize(text))),
+        )
+
+
+class ETFSearchIndex:
+    """
+    Ranked typeahead index over ETF tickers and names.
+
+    Matches are ranked exact ticker first, then ticker prefix, then name
+    token prefix, then substring and finally fuzzy trigram similarity.
+    Each tier is only evaluated while fewer than `limit` results were
+    found. Tickers and name tokens are kept in sorted lists so prefix
+    lookups are binary searches. Substring and fuzzy matching work on the
+    vocabulary of distinct words through an inverted trigram index, which
+    stays small because ETF names share most of their words.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        """Initialize an empty index rebuilt after `refresh_seconds`."""
+        self.refresh_seconds = refresh_seconds
+
+        self._entries: dict[str, IndexedETF] = {}
+        self._tickers: list[str] = []
+        self._name_tokens: list[tuple[str, str]] = []
+        self._words: dict[str, set[str]] = {}
+        self._word_trigrams: dict[str, set[str]] = {}
+        self._built_at: float | None = None
+        self._lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        """Check whether the index was never built or is due a rebuild."""
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.refresh_seconds
+        )
+
+    def rebuild(self, results: list[ETFSearchResult]) -> None:
+        """
+        Replace the index contents.
+
+        The new index is built aside and swapped in, so searches keep
+        being answered from the old contents meanwhile.
+
+        Args:
+            results: ETFs to index; later entries win for the same ticker
+        """
+        fresh = ETFSearchIndex(self.refresh_seconds)
+        for result in results:
+            fresh._add(result)
+
+        with self._lock:
+            self._entries = fresh._entries
+            self._tickers = fresh._tickers
+            self._name_tokens = fresh._name_tokens
+            self._words = fresh._words
+            self._word_trigrams = fresh._word_trigrams
+            self._built_at = time.monotonic()
+
+    def add(self, result: ETFSearchResult) -> None:
+        """
+        Add or update a single ETF.
+
+        Args:
+            result: ETF to index
+        """
+        with self._lock:
+            self._add(result)
+
+    def search(self, query: str, limit: int = 10) -> list[ETFSearchResult]:
+        """
+        Search ETFs by ticker or name.
+
+        Args:
+            query: Search query string
+            limit: Maximum number of results
+
+        Returns:
+            Best matching ETFs, best first
+        """
+        needle = query.strip().lower()
+        query_tokens = tokenize(needle)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            found: dict[str, None] = {}
+
+            def collect(tier: dict[str, tuple]) -> bool:
+                """Add a tier's best tickers in order; True once full."""
+                wanted = limit + len(found)
+                for ticker in heapq.nsmallest(wanted, tier, key=tier.__getitem__):
+                    found.setdefault(ticker)
+                return len(found) >= limit
+
+            # Lower tiers are only evaluated while results are missing
+            ticker_query = needle.upper()
+            exact = {ticker_query: ()} if ticker_query in self._entries else {}
+            if collect(exact):
+                return self._results(found, limit)
+
+            prefixed = self._prefix_matches(ticker_query)
+            if collect({ticker: (len(ticker), ticker) for ticker in prefixed}):
+                return self._results(found, limit)
+
+            # Every query token must prefix some token of the name
+            named: set[str] | None = None
+            for token in query_tokens:
+                matches = {ticker for _, ticker in self._name_token_matches(token)}
+                named = matches if named is None else named & matches
+            if collect({ticker: (len(ticker), ticker) for ticker in named or ()}):
+                return self._results(found, limit)
+
+            substrings = {
+                ticker: (len(ticker), ticker)
+                for ticker in self._substring_candidates(query_tokens)
+                if needle in self._entries[ticker].haystack
+            }
+            if collect(substrings):
+                return self._results(found, limit)
+
+            # Average over query tokens of the best word similarity; tokens
+            # shorter than a trigram are too short to hold a typo
+            fuzzy_tokens = [token for token in query_tokens if len(token) >= 3]
+            scores: Counter[str] = Counter()
+            for token in fuzzy_tokens:
+                best: dict[str, float] = {}
+                for word, similarity in self._similar_words(token):
+                    for ticker in self._words[word]:
+                        best[ticker] = max(best.get(ticker, 0.0), similarity)
+                scores.update(best)
+
+            fuzzy = {}
+            for ticker, total in scores.items():
+                similarity = total / len(fuzzy_tokens)
+                if similarity >= FUZZY_THRESHOLD:
+                    fuzzy[ticker] = (-similarity, len(ticker), ticker)
+            collect(fuzzy)
+
+            return self._results(found, limit)
+
+    def _results(
+        self, tickers: dict[str, None], limit: int
+    ) -> list[ETFSearchResult]:
+        """Get the search results of the first `limit` tickers (lock held)."""
+        return [
+            self._entries[ticker].result
+            for ticker in itertools.islice(tickers, limit)
+        ]
+
+    def _prefix_matches(self, prefix: str) -> list[str]:
+        """Get the tickers starting with a prefix (lock held)."""
+        start = bisect.bisect_left(self._tickers, prefix)
+        end = bisect.bisect_left(self._tickers, prefix + PREFIX_END)
+        return self._tickers[start:end]
+
+    def _name_token_matches(self, prefix: str) -> list[tuple[str, str]]:
+        """Get the (token, ticker) pairs whose token starts with a prefix."""
+        start = bisect.bisect_left(self._name_tokens, (prefix,))
+        end = bisect.bisect_left(self._name_tokens, (prefix + PREFIX_END,))
+        return self._name_tokens[start:end]
+
+    def _substring_candidates(self, query_tokens: list[str]) -> set[str] | dict:
+        """
+        Get the tickers that may contain the query as a substring.
+
+        Every query token lies within some word of a matching ETF, so the
+        candidates are the tickers of words containing the longest token.
+        """
+        token = max(query_tokens, key=len)
+        if len(token) < 3:
+            # Tokens shorter than a trigram may match inside any word
+            return self._entries
+
+        postings = sorted(
+            (
+                self._word_trigrams.get(token[i : i + 3], set())
+                for i in range(len(token) - 2)
+            ),
+            key=len,
+        )
+        words = postings[0].intersection(*postings[1:])
+
+        return {
+            ticker
+            for word in words
+            if token in word
+            for ticker in self._words[word]
+        }
+
+    def _similar_words(self, token: str) -> list[tuple[str, float]]:
+        """
+        Get the indexed words similar to a token.
+
+        Similarity is the Jaccard index of the trigram sets; words sharing
+        too few trigrams to reach FUZZY_THRESHOLD are skipped unscored.
+
+        Args:
+            token: Query token
+
+        Returns:
+            (word, similarity) pairs at or above FUZZY_THRESHOLD
+        """
+        grams = trigrams(token)
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            shared.update(self._word_trigrams.get(gram, ()))
+
+        min_shared = math.ceil(FUZZY_THRESHOLD * len(grams))
+        similar = []
+        for word, count in shared.items():
+            if count < min_shared:
+                continue
+            similarity = count / (len(grams) + len(trigrams(word)) - count)
+            if similarity >= FUZZY_THRESHOLD:
+                similar.append((word, similarity))
+
+        return similar
+
+    def _add(self, result: ETFSearchResult) -> None:
+        """Add an entry to all lookup structures (lock held)."""
+        self._remove(result.ticker)
+
+        entry = IndexedETF.from_result(result)
+        self._entries[result.ticker] = entry
+        bisect.insort(self._tickers, result.ticker)
+        for token in entry.name_tokens:
+            bisect.insort(self._name_tokens, (token, result.ticker))
+
+        for word in entry.words:
+            if word not in self._words:
+                self._words[word] = set()
+                for gram in trigrams(word):
+                    self._word_trigrams.setdefault(gram, set()).add(word)
+            self._words[word].add(result.ticker)
+
+    def _remove(self, ticker: str) -> None:
+        """Remove an entry from all lookup structures (lock held)."""
+        entry = self._entries.pop(ticker, None)
+        if entry is None:
+            return
+
+        self._tickers.remove(ticker)
+        for token in entry.name_tokens:
+            self._name_tokens.remove((token, ticker))
+
+        for word in entry.words:
+            tickers = self._words[word]
+            tickers.discard(ticker)
+            if tickers:
+                continue
+
+            del self._words[word]
+            for gram in trigrams(word):
+                words = self._word_trigrams[gram]
+                words.discard(word)
+                if not words:
+                    del self._word_trigrams[gram]
+
+
+etf_search_index = ETFSearchIndex(
+    refresh_seconds=settings.search_index_refresh_seconds
+)
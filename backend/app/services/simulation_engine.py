@@ -0,0 +1,486 @@
+"""Vectorized NumPy portfolio simulation engine."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.simulation import RebalancingFrequency
+from app.services.price_panel import PricePanel
+
+# Minimum number of calendar days between two rebalances
+REBALANCE_INTERVAL_DAYS = {
+    RebalancingFrequency.QUARTERLY: 90,
+    RebalancingFrequency.YEARLY: 365,
+}
+
+# Rolling windows whose daily values are materialized at once
+ROLLING_WINDOW_BLOCK = 64
+
+
+@dataclass
+class EngineResult:
+    """Daily simulation output on the shared trading calendar."""
+
+    dates: np.ndarray
+    portfolio_values: np.ndarray
+    invested_amounts: np.ndarray
+    cumulative_dividends: np.ndarray
+
+    @property
+    def total_invested(self) -> float:
+        """Total amount invested at the end of the simulation."""
+        return float(self.invested_amounts[-1])
+
+    @property
+    def final_value(self) -> float:
+        """Portfolio value on the last trading day."""
+        return float(self.portfolio_values[-1])
+
+    @property
+    def total_dividends(self) -> float:
+        """Total dividends received over the simulation."""
+        return float(self.cumulative_dividends[-1])
+
+
+@dataclass
+class BatchResult:
+    """Daily simulation output for a stack of scenarios (scenarios x dates)."""
+
+    dates: np.ndarray
+    portfolio_values: np.ndarray
+    invested_amounts: np.ndarray
+    cumulative_dividends: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of scenarios in the batch."""
+        return len(self.portfolio_values)
+
+    def scenario(self, index: int) -> EngineResult:
+        """Get the result of a single scenario."""
+        return EngineResult(
+            dates=self.dates,
+            portfolio_values=self.portfolio_values[index],
+            invested_amounts=self.invested_amounts[index],
+            cumulative_dividends=self.cumulative_dividends[index],
+        )
+
+
+@dataclass
+class RollingResult:
+    """Outcome of a set of rolling windows, one entry per window."""
+
+    start_rows: np.ndarray
+    end_rows: np.ndarray
+    final_values: np.ndarray
+    invested_amounts: np.ndarray
+    max_drawdowns: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of windows."""
+        return len(self.start_rows)
+
+
+def rebalance_rows(
+    dates: np.ndarray, rebalancing: RebalancingFrequency
+) -> np.ndarray:
+    """
+    Find the calendar rows on which the portfolio is rebalanced.
+
+    A rebalance happens on the first trading day at least the configured
+    number of days after the previous one (or the first trading day).
+
+    Args:
+        dates: Trading calendar as datetime64[D]
+        rebalancing: Rebalancing frequency
+
+    Returns:
+        Sorted row indices of rebalance days
+    """
+    interval = REBALANCE_INTERVAL_DAYS.get(rebalancing)
+    if interval is None or len(dates) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    ordinals = dates.astype("datetime64[D]").astype(np.int64)
+    rows = []
+    row = int(np.searchsorted(ordinals, ordinals[0] + interval))
+    while row < len(ordinals):
+        rows.append(row)
+        row = int(np.searchsorted(ordinals, ordinals[row] + interval))
+
+    return np.asarray(rows, dtype=np.intp)
+
+
+def contribution_rows(dates: np.ndarray) -> np.ndarray:
+    """
+    Find the first trading day of each calendar month.
+
+    Args:
+        dates: Trading calendar as datetime64[D]
+
+    Returns:
+        Sorted row indices of monthly contribution days
+    """
+    if len(dates) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    months = dates.astype("datetime64[M]")
+    return np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+
+
+def simulate_portfolio(
+    panel: PricePanel,
+    weights: np.ndarray,
+    initial_amount: float,
+    monthly_contribution: float,
+    rebalancing: RebalancingFrequency,
+) -> EngineResult:
+    """
+    Simulate a single portfolio on a price panel.
+
+    Args:
+        panel: Aligned price data for the portfolio tickers
+        weights: Target weights as fractions, one per panel column
+        initial_amount: Initial investment amount
+        monthly_contribution: Amount invested on the first trading day of
+            every month (0 for lump sum)
+        rebalancing: Rebalancing frequency
+
+    Returns:
+        Daily portfolio values, invested amounts and cumulative dividends
+    """
+    batch = simulate_batch(
+        panel,
+        np.asarray(weights, dtype=np.float64)[np.newaxis, :],
+        np.array([initial_amount], dtype=np.float64),
+        np.array([monthly_contribution], dtype=np.float64),
+        rebalancing,
+    )
+    return batch.scenario(0)
+
+
+def simulate_batch(
+    panel: PricePanel,
+    weights: np.ndarray,
+    initial_amounts: np.ndarray,
+    monthly_contributions: np.ndarray,
+    rebalancing: RebalancingFrequency,
+) -> BatchResult:
+    """
+    Simulate a stack of portfolios sharing one price panel.
+
+    Share counts evolve multiplicatively between rebalances (dividends are
+    reinvested at the adjusted close) and additively on contribution days.
+    Because contributions scale every scenario linearly, each segment
+    between two rebalances reduces to cumulative products and sums over
+    the panel followed by (scenarios x tickers) @ (tickers x dates)
+    products. Only rebalance days are visited in Python.
+
+    Args:
+        panel: Aligned price data shared by all scenarios
+        weights: Target weights as fractions, shape (scenarios, tickers)
+        initial_amounts: Initial investment per scenario
+        monthly_contributions: Amount invested on the first trading day of
+            every month per scenario (0 for lump sum)
+        rebalancing: Rebalancing frequency
+
+    Returns:
+        Daily portfolio values, invested amounts and cumulative dividends
+        with shape (scenarios, dates)
+    """
+    dates = panel.dates
+    num_days = len(dates)
+    if num_days == 0:
+        raise ValueError("No price data available")
+
+    contributions = monthly_contributions[:, np.newaxis]
+    present = panel.present
+    safe_prices = np.where(present, panel.adj_close, 1.0)
+    priced = np.where(present, panel.adj_close, 0.0)
+    dividend = panel.dividend
+    growth = 1.0 + dividend / safe_prices
+
+    # Initial investment at each ticker's first available price
+    first_rows = present.argmax(axis=0)
+    first_prices = safe_prices[first_rows, np.arange(len(panel.tickers))]
+    shares = initial_amounts[:, np.newaxis] * weights / first_prices
+
+    # Shares bought per unit of weighted monthly contribution
+    rows = contribution_rows(dates)
+    unit_additions = np.zeros_like(safe_prices)
+    unit_additions[rows] = np.where(present[rows], 1.0 / safe_prices[rows], 0.0)
+    contribution_count = np.zeros(num_days)
+    contribution_count[rows] = 1.0
+    invested = initial_amounts[:, np.newaxis] + contributions * np.cumsum(
+        contribution_count
+    )
+
+    values = np.empty((len(weights), num_days))
+    dividends_paid = np.empty((len(weights), num_days))
+
+    rebalances = rebalance_rows(dates, rebalancing)
+    segment_ends = np.r_[rebalances, num_days - 1]
+    segment_start = 0
+
+    for segment_end in segment_ends:
+        window = slice(segment_start, segment_end + 1)
+
+        # Dividend growth accumulated before each day of the segment
+        carried = np.cumprod(growth[window], axis=0)
+        carried = np.vstack([np.ones_like(carried[:1]), carried[:-1]])
+        units = np.cumsum(unit_additions[window] / carried, axis=0)
+
+        value_basis = priced[window] * carried
+        dividend_basis = dividend[window] * carried
+
+        values[:, window] = shares @ value_basis.T + contributions * (
+            weights @ (value_basis * units).T
+        )
+        dividends_paid[:, window] = shares @ dividend_basis.T + contributions * (
+            weights @ (dividend_basis * units).T
+        )
+
+        segment_start = segment_end + 1
+        if segment_start >= num_days:
+            break
+
+        # Rebalance to target weights; tickers without a price keep shares
+        held = carried[-1] * growth[segment_end] * (
+            shares + contributions * weights * units[-1]
+        )
+        shares = np.where(
+            present[segment_end],
+            values[:, segment_end, np.newaxis] * weights / safe_prices[segment_end],
+            held,
+        )
+
+    return BatchResult(
+        dates=dates,
+        portfolio_values=values,
+        invested_amounts=invested,
+        cumulative_dividends=np.cumsum(dividends_paid, axis=1),
+    )
+
+
+def rolling_window_rows(
+    dates: np.ndarray, horizon_years: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the rolling windows of a fixed horizon, one per start month.
+
+    Windows start on the first trading day of each month and end on the
+    last trading day before the same date `horizon_years` later. Windows
+    reaching past the end of the calendar are left out.
+
+    Args:
+        dates: Trading calendar as datetime64[D]
+        horizon_years: Window length in years
+
+    Returns:
+        Start and end row indices of every window
+    """
+    starts = contribution_rows(dates)
+    start_dates = dates[starts]
+    start_months = start_dates.astype("datetime64[M]")
+    limits = (start_months + 12 * horizon_years).astype("datetime64[D]") + (
+        start_dates - start_months.astype("datetime64[D]")
+    )
+
+    ends = np.searchsorted(dates, limits) - 1
+    complete = limits <= dates[-1] + np.timedelta64(1, "D")
+
+    return starts[complete], ends[complete]
+
+
+def simulate_rolling_windows(
+    panel: PricePanel,
+    weights: np.ndarray,
+    initial_amount: float,
+    monthly_contribution: float,
+    rebalancing: RebalancingFrequency,
+    start_rows: np.ndarray,
+    end_rows: np.ndarray,
+) -> RollingResult:
+    """
+    Simulate the same portfolio over many windows of one price panel.
+
+    Holdings are measured in units of a total return index over the whole
+    panel, so between two rebalances the value of window w on day t is
+    `coef[w] @ total_return[t] + monthly * contributions_value[t]`, where
+    only the coefficients depend on the window. Without rebalancing every
+    window has a single coefficient vector. With rebalancing, all windows
+    step through their rebalance days together: each step turns the
+    value on a window's rebalance day into the coefficients of its next
+    segment. Daily values of all windows are then evaluated in blocks of
+    ROLLING_WINDOW_BLOCK windows.
+
+    Args:
+        panel: Price data on which every ticker trades on every date
+        weights: Target weights as fractions, one per panel column
+        initial_amount: Initial investment amount
+        monthly_contribution: Amount invested on the first trading day of
+            every month (0 for lump sum)
+        rebalancing: Rebalancing frequency
+        start_rows: First row of every window
+        end_rows: Last row of every window
+
+    Returns:
+        Final value, invested amount and maximum drawdown per window
+    """
+    num_days = len(panel)
+
+    # Total return index with dividends reinvested at the adjusted close
+    growth = 1.0 + panel.dividend / panel.adj_close
+    carried = np.vstack([np.ones_like(growth[:1]), np.cumprod(growth[:-1], axis=0)])
+    total_return = panel.adj_close * carried
+
+    # Units of the total return index bought by contributions so far
+    contributed = np.zeros(num_days)
+    contributed[contribution_rows(panel.dates)] = 1.0
+    bought = contributed[:, np.newaxis] / total_return
+    units = np.cumsum(bought, axis=0)
+    units_before = units - bought
+    contributions_value = (total_return * units) @ weights
+
+    segment_starts, coefs = rolling_segments(
+        panel,
+        weights,
+        initial_amount,
+        monthly_contribution,
+        rebalancing,
+        start_rows,
+        end_rows,
+        total_return,
+        growth,
+        units_before,
+        contributions_value,
+    )
+
+    num_windows = len(start_rows)
+    final_values = np.empty(num_windows)
+    max_drawdowns = np.empty(num_windows)
+    days = np.arange(num_days)
+
+    for block_start in range(0, num_windows, ROLLING_WINDOW_BLOCK):
+        block = slice(block_start, block_start + ROLLING_WINDOW_BLOCK)
+        starts = start_rows[block]
+        ends = end_rows[block]
+        windows = np.arange(len(starts))
+
+        if coefs.shape[1] == 1:
+            values = coefs[block, 0] @ total_return.T
+        else:
+            # Segment of every window on every day, counted from its starts
+            marks = np.zeros((len(starts), num_days + 1), dtype=np.intp)
+            np.add.at(marks, (windows[:, np.newaxis], segment_starts[block]), 1)
+            segment = np.maximum(np.cumsum(marks[:, :num_days], axis=1) - 1, 0)
+            daily_coefs = coefs[block][windows[:, np.newaxis], segment]
+            values = np.einsum("wdt,dt->wd", daily_coefs, total_return)
+        values += monthly_contribution * contributions_value
+
+        inside = (days >= starts[:, np.newaxis]) & (days <= ends[:, np.newaxis])
+        running_max = np.maximum.accumulate(np.where(inside, values, 0.0), axis=1)
+        drawdowns = np.where(inside, values / np.where(inside, running_max, 1.0), 1.0)
+
+        final_values[block] = values[windows, ends]
+        max_drawdowns[block] = drawdowns.min(axis=1) - 1.0
+
+    contribution_counts = np.cumsum(contributed)
+    invested = initial_amount + monthly_contribution * (
+        contribution_counts[end_rows] - contribution_counts[start_rows] + 1.0
+    )
+
+    return RollingResult(
+        start_rows=start_rows,
+        end_rows=end_rows,
+        final_values=final_values,
+        invested_amounts=invested,
+        max_drawdowns=max_drawdowns,
+    )
+
+
+def rolling_segments(
+    panel: PricePanel,
+    weights: np.ndarray,
+    initial_amount: float,
+    monthly_contribution: float,
+    rebalancing: RebalancingFrequency,
+    start_rows: np.ndarray,
+    end_rows: np.ndarray,
+    total_return: np.ndarray,
+    growth: np.ndarray,
+    units_before: np.ndarray,
+    contributions_value: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the segments between rebalances of every rolling window.
+
+    A window's rebalance days follow from its start alone, as in
+    rebalance_rows, so the next rebalance after every row is looked up
+    once and all windows advance one rebalance per step.
+
+    Args:
+        panel: Price data on which every ticker trades on every date
+        weights: Target weights as fractions, one per panel column
+        initial_amount: Initial investment amount
+        monthly_contribution: Monthly contribution (0 for lump sum)
+        rebalancing: Rebalancing frequency
+        start_rows: First row of every window
+        end_rows: Last row of every window
+        total_return: Total return index per day and ticker
+        growth: Dividend growth factor per day and ticker
+        units_before: Index units bought by contributions before each day
+        contributions_value: Value of all contributions so far per day
+
+    Returns:
+        First row of every segment, shape (windows, segments), and the
+        coefficients of every segment, shape (windows, segments, tickers);
+        windows with fewer segments are padded with starts past the panel
+    """
+    num_days = len(panel)
+    coef = weights * (
+        initial_amount / total_return[start_rows]
+        - monthly_contribution * units_before[start_rows]
+    )
+    starts, coefs = [start_rows], [coef]
+
+    interval = REBALANCE_INTERVAL_DAYS.get(rebalancing)
+    if interval is None:
+        return np.stack(starts, axis=1), np.stack(coefs, axis=1)
+
+    ordinals = panel.dates.astype("datetime64[D]").astype(np.int64)
+    next_rebalance = np.searchsorted(ordinals, ordinals + interval)
+
+    rebalance = next_rebalance[start_rows]
+    while True:
+        # A rebalance on a window's last day does not change its result
+        active = rebalance < end_rows
+        if not active.any():
+            break
+
+        rows = np.minimum(rebalance, end_rows)
+        value = (total_return[rows] * coef).sum(axis=1)
+        value += monthly_contribution * contributions_value[rows]
+
+        # Rebalanced shares start earning dividends the next day
+        held = value[:, np.newaxis] * weights / (total_return[rows] * growth[rows])
+        next_rows = np.where(active, rows + 1, num_days)
+        coef = np.where(
+            active[:, np.newaxis],
+            held
+            - monthly_contribution
+            * weights
+            * units_before[np.minimum(next_rows, num_days - 1)],
+            coef,
+        )
+
+        starts.append(next_rows)
+        coefs.append(coef)
+        rebalance = next_rebalance[rows]
+
+    return np.stack(starts, axis=1), np.stack(coefs, axis=1)
+
+
+def max_drawdown(values: np.ndarray) -> float:
+    """Get the largest relative drop from a running peak (as a fraction)."""
+    running_max = np.maximum.accumulate(values)
+    return float((values / running_max).min() - 1.0)
@@ -1,18 +1,55 @@
 """Portfolio simulation service."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.etf import Resolution
 from app.models.simulation import (
+    ComparisonScenario,
     InvestmentType,
+    MonteCarloResponse,
     MonthlySnapshot,
+    PercentileBand,
     PortfolioItem,
     RebalancingFrequency,
+    RollingWindowResponse,
+    RollingWindowResult,
+    SimulationEngine,
     SimulationSummary,
+    WeightGridPoint,
+    WeightGridResponse,
+    normalize_ticker,
 )
 from app.services.etf_service import ETFService
+from app.services.monte_carlo import (
+    TRADING_DAYS_PER_YEAR,
+    historical_returns,
+    run_paths,
+)
+from app.services.price_cache import price_cache
+from app.services.price_panel import PricePanel, PriceSeries
+from app.services.process_pool import ProgressCallback
+from app.services.result_cache import simulation_fingerprint, simulation_result_cache
+from app.services.simulation_engine import (
+    EngineResult,
+    rolling_window_rows,
+    simulate_batch,
+    simulate_portfolio,
+    simulate_rolling_windows,
+)
+from app.services.weight_grid import (
+    MAX_GRID_POINTS,
+    grid_size,
+    sweep_weights,
+    weight_grid,
+)
+from app.utils.downsampling import downsample_rows
 from app.utils.finance import (
     calculate_cagr,
     calculate_mdd,
@@ -20,13 +57,24 @@ from app.utils.finance import (
     get_years_between_dates,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class SimulationService:
     """Service for portfolio simulation operations."""
 
-    def __init__(self, db: Session):
-        """Initialize simulation service with database session."""
+    def __init__(self, db: Session, prefetched: bool = False):
+        """
+        Initialize simulation service with database session.
+
+        Args:
+            db: Database session
+            prefetched: Whether the caller loads missing price history
+                before each simulation, so it is not fetched again
+        """
         self.db = db
+        self.prefetched = prefetched
         self.etf_service = ETFService(db)
 
     def run_simulation(
@@ -38,10 +86,16 @@ class SimulationService:
         start_date: date,
         end_date: date,
         rebalancing: RebalancingFrequency,
+        engine: SimulationEngine = SimulationEngine.VECTORIZED,
+        resolution: Resolution = Resolution.MONTHLY,
+        max_points: int | None = None,
     ) -> tuple[SimulationSummary, list[MonthlySnapshot]]:
         """
         Run investment simulation.
 
+        Results are memoized by a canonical fingerprint of the parameters
+        until the price data of one of the tickers changes.
+
         Args:
             portfolio: List of portfolio items with ticker and weight
             investment_type: Type of investment (lump_sum or dca)
@@ -50,23 +104,429 @@ class SimulationService:
             start_date: Simulation start date
             end_date: Simulation end date
             rebalancing: Rebalancing frequency
+            engine: Simulation engine (vectorized or reference loop)
+            resolution: Snapshot resolution
+            max_points: Maximum number of snapshots, or None for no limit
 
         Returns:
-            Tuple of (simulation summary, monthly snapshots)
+            Tuple of (simulation summary, snapshots)
         """
+        key = simulation_fingerprint(
+            portfolio,
+            investment_type,
+            initial_amount,
+            monthly_contribution,
+            start_date,
+            end_date,
+            rebalancing,
+            engine,
+            resolution,
+            max_points,
+        )
+        cached = simulation_result_cache.get(key)
+        if cached is not None:
+            return cached
+
         # Fetch price data for all tickers
-        price_data = self._fetch_portfolio_prices(portfolio, start_date, end_date)
+        tickers = [item.ticker for item in portfolio]
+        panel = self._fetch_portfolio_prices(tickers, start_date, end_date)
 
-        if not price_data:
+        if not panel.tickers:
             raise ValueError("Failed to fetch price data for portfolio")
 
+        result = self._simulate(
+            portfolio,
+            investment_type,
+            initial_amount,
+            monthly_contribution,
+            panel,
+            start_date,
+            end_date,
+            rebalancing,
+            engine,
+            resolution,
+            max_points,
+        )
+
+        # Results missing a ticker that failed to load are not reused
+        if {ticker.upper() for ticker in tickers} <= set(panel.tickers):
+            simulation_result_cache.put(key, result, tickers)
+
+        return result
+
+    def run_batch(
+        self,
+        scenarios: list[ComparisonScenario],
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+    ) -> list[SimulationSummary]:
+        """
+        Run several investment scenarios over the same period in one pass.
+
+        Price history for the union of all scenario tickers is fetched once.
+        Scenarios holding the same set of tickers share a price panel and
+        are simulated together as one stacked computation.
+
+        Args:
+            scenarios: Scenarios to simulate
+            start_date: Simulation start date
+            end_date: Simulation end date
+            rebalancing: Rebalancing frequency
+
+        Returns:
+            Simulation summaries in scenario order
+        """
+        tickers = [
+            item.ticker for scenario in scenarios for item in scenario.portfolio
+        ]
+        panel = self._fetch_portfolio_prices(tickers, start_date, end_date)
+
+        # Group scenarios by the tickers they hold
+        groups: dict[tuple[str, ...], list[int]] = {}
+        for index, scenario in enumerate(scenarios):
+            held = tuple(
+                sorted(
+                    {item.ticker for item in scenario.portfolio}
+                    & set(panel.tickers)
+                )
+            )
+            if not held:
+                raise ValueError(
+                    f"Failed to fetch price data for scenario {scenario.name}"
+                )
+            groups.setdefault(held, []).append(index)
+
+        summaries: dict[int, SimulationSummary] = {}
+        for held, indices in groups.items():
+            group_panel = panel.select(list(held))
+            group = [scenarios[index] for index in indices]
+
+            batch = simulate_batch(
+                group_panel,
+                np.stack(
+                    [
+                        self._portfolio_weights(scenario.portfolio, group_panel)
+                        for scenario in group
+                    ]
+                ),
+                np.array([scenario.initial_amount for scenario in group]),
+                np.array(
+                    [
+                        scenario.monthly_contribution
+                        if scenario.investment_type == InvestmentType.DCA
+                        else 0.0
+                        for scenario in group
+                    ]
+                ),
+                rebalancing,
+            )
+
+            for row, index in enumerate(indices):
+                summaries[index] = self._build_summary(
+                    batch.scenario(row), start_date, end_date
+                )
+
+        return [summaries[index] for index in range(len(scenarios))]
+
+    def run_monte_carlo(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        horizon_years: int,
+        num_paths: int,
+        block_days: int,
+        seed: int | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> MonteCarloResponse:
+        """
+        Simulate future paths by block-bootstrapping historical returns.
+
+        Args:
+            portfolio: List of portfolio items with ticker and weight
+            investment_type: Type of investment (lump_sum or dca)
+            initial_amount: Initial investment amount
+            monthly_contribution: Monthly contribution for DCA
+            start_date: Start of the sampled history
+            end_date: End of the sampled history
+            rebalancing: Rebalancing frequency
+            horizon_years: Years per path
+            num_paths: Number of paths
+            block_days: Trading days per bootstrap block
+            seed: Random seed, or None for a random one
+            on_progress: Called with the fraction of paths simulated
+
+        Returns:
+            Percentiles of final value, CAGR and MDD over all paths
+        """
+        tickers = [item.ticker for item in portfolio]
+        panel = self._fetch_portfolio_prices(tickers, start_date, end_date)
+
+        if not panel.tickers:
+            raise ValueError("Failed to fetch price data for portfolio")
+
+        returns = historical_returns(panel)
+        if len(returns) < block_days:
+            raise ValueError(
+                "Not enough common price history for the bootstrap block length"
+            )
+
+        if investment_type == InvestmentType.LUMP_SUM:
+            monthly_contribution = 0.0
+        if initial_amount <= 0 and monthly_contribution <= 0:
+            raise ValueError("Initial amount or monthly contribution must be positive")
+
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+
+        num_days = horizon_years * TRADING_DAYS_PER_YEAR
+        metrics = run_paths(
+            returns,
+            self._portfolio_weights(portfolio, panel),
+            initial_amount,
+            monthly_contribution,
+            num_days,
+            block_days,
+            rebalancing,
+            num_paths,
+            seed,
+            max_workers=settings.process_pool_workers,
+            chunk_bytes=settings.process_chunk_bytes,
+            on_progress=on_progress,
+        )
+
+        total_invested = initial_amount + monthly_contribution * horizon_years * 12
+
+        return MonteCarloResponse(
+            num_paths=num_paths,
+            horizon_years=horizon_years,
+            seed=seed,
+            total_invested=total_invested,
+            loss_probability=round(
+                float(np.mean(metrics.final_values < total_invested)) * 100, 2
+            ),
+            final_value=self._percentile_band(metrics.final_values),
+            cagr=self._percentile_band(metrics.cagr),
+            mdd=self._percentile_band(metrics.mdd),
+        )
+
+    def run_rolling_windows(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        horizon_years: int,
+    ) -> RollingWindowResponse:
+        """
+        Simulate a portfolio from every start month over a fixed horizon.
+
+        Windows use the trading days on which every ticker has a price.
+
+        Args:
+            portfolio: List of portfolio items with ticker and weight
+            investment_type: Type of investment (lump_sum or dca)
+            initial_amount: Initial investment amount
+            monthly_contribution: Monthly contribution for DCA
+            start_date: Earliest window start date
+            end_date: Latest window end date
+            rebalancing: Rebalancing frequency
+            horizon_years: Years per window
+
+        Returns:
+            Outcome of every window and percentiles over all windows
+        """
+        tickers = [item.ticker for item in portfolio]
+        panel = self._fetch_portfolio_prices(tickers, start_date, end_date)
+
+        if not panel.tickers:
+            raise ValueError("Failed to fetch price data for portfolio")
+
+        panel = panel.take_rows(panel.present.all(axis=1))
+        if len(panel) == 0:
+            raise ValueError("Portfolio tickers share no trading days")
+
+        start_rows, end_rows = rolling_window_rows(panel.dates, horizon_years)
+        if len(start_rows) == 0:
+            raise ValueError(
+                f"Price history is shorter than the {horizon_years} year horizon"
+            )
+
+        if investment_type == InvestmentType.LUMP_SUM:
+            monthly_contribution = 0.0
+        if initial_amount <= 0 and monthly_contribution <= 0:
+            raise ValueError("Initial amount or monthly contribution must be positive")
+
+        result = simulate_rolling_windows(
+            panel,
+            self._portfolio_weights(portfolio, panel),
+            initial_amount,
+            monthly_contribution,
+            rebalancing,
+            start_rows,
+            end_rows,
+        )
+
+        windows = []
+        for start, end, invested, final_value, drawdown in zip(
+            panel.dates[result.start_rows].tolist(),
+            panel.dates[result.end_rows].tolist(),
+            result.invested_amounts.tolist(),
+            result.final_values.tolist(),
+            result.max_drawdowns.tolist(),
+        ):
+            years = get_years_between_dates(start, end)
+            windows.append(
+                RollingWindowResult(
+                    start_date=start,
+                    end_date=end,
+                    total_invested=invested,
+                    final_value=final_value,
+                    cagr=calculate_cagr(invested, final_value, years),
+                    mdd=round(drawdown * 100, 2),
+                )
+            )
+
+        return RollingWindowResponse(
+            horizon_years=horizon_years,
+            windows=windows,
+            final_value=self._percentile_band(result.final_values),
+            cagr=self._percentile_band(np.array([w.cagr for w in windows])),
+            mdd=self._percentile_band(np.array([w.mdd for w in windows])),
+        )
+
+    def run_weight_grid(
+        self,
+        tickers: list[str],
+        step_pct: float,
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        on_progress: ProgressCallback | None = None,
+    ) -> WeightGridResponse:
+        """
+        Simulate every allocation of a weight grid over the tickers.
+
+        Allocations leaving out a ticker trade on the calendar of the
+        tickers they hold, so their invested amounts can differ.
+
+        Args:
+            tickers: Tickers to allocate
+            step_pct: Weight step in percent
+            investment_type: Type of investment (lump_sum or dca)
+            initial_amount: Initial investment amount
+            monthly_contribution: Monthly contribution for DCA
+            start_date: Simulation start date
+            end_date: Simulation end date
+            rebalancing: Rebalancing frequency
+            on_progress: Called with the fraction of the sweep done
+
+        Returns:
+            Final value, CAGR and MDD of every allocation
+        """
+        tickers = [normalize_ticker(ticker) for ticker in tickers]
+        steps = round(100 / step_pct)
+        num_points = grid_size(len(tickers), steps)
+        if num_points > MAX_GRID_POINTS:
+            raise ValueError(
+                f"Weight grid has {num_points} allocations, "
+                f"more than the limit of {MAX_GRID_POINTS}"
+            )
+
+        panel = self._fetch_portfolio_prices(tickers, start_date, end_date)
+        missing = [ticker for ticker in tickers if ticker not in panel.tickers]
+        if missing:
+            raise ValueError(f"Failed to fetch price data for {', '.join(missing)}")
+        panel = panel.select(tickers)
+
+        if investment_type == InvestmentType.LUMP_SUM:
+            monthly_contribution = 0.0
+
+        weights = weight_grid(len(tickers), steps)
+        metrics = sweep_weights(
+            panel,
+            weights,
+            initial_amount,
+            monthly_contribution,
+            rebalancing,
+            max_workers=settings.process_pool_workers,
+            chunk_bytes=settings.process_chunk_bytes,
+            on_progress=on_progress,
+        )
+
+        years = get_years_between_dates(start_date, end_date)
+
+        points = [
+            WeightGridPoint(
+                weights=point_weights,
+                total_invested=invested,
+                final_value=final_value,
+                cagr=calculate_cagr(invested, final_value, years),
+                mdd=round(drawdown * 100, 2),
+            )
+            for point_weights, invested, final_value, drawdown in zip(
+                np.round(weights * 100, 6).tolist(),
+                metrics.invested_amounts.tolist(),
+                metrics.final_values.tolist(),
+                metrics.max_drawdowns.tolist(),
+            )
+        ]
+
+        return WeightGridResponse(
+            tickers=list(panel.tickers),
+            total_invested=float(metrics.invested_amounts.max()),
+            points=points,
+        )
+
+    def _simulate(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        panel: PricePanel,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        engine: SimulationEngine,
+        resolution: Resolution,
+        max_points: int | None,
+    ) -> tuple[SimulationSummary, list[MonthlySnapshot]]:
+        """Simulate a portfolio on a price panel with the selected engine."""
+        if engine == SimulationEngine.VECTORIZED:
+            return self._simulate_vectorized(
+                portfolio,
+                investment_type,
+                initial_amount,
+                monthly_contribution,
+                panel,
+                start_date,
+                end_date,
+                rebalancing,
+                resolution,
+                max_points,
+            )
+
+        price_data = {ticker: panel.frame(ticker) for ticker in panel.tickers}
+
         # Run simulation based on investment type
         if investment_type == InvestmentType.LUMP_SUM:
-            return self._simulate_lump_sum(
+            summary, monthly_snapshots = self._simulate_lump_sum(
                 portfolio, initial_amount, price_data, start_date, end_date, rebalancing
             )
         else:
-            return self._simulate_dca(
+            summary, monthly_snapshots = self._simulate_dca(
                 portfolio,
                 initial_amount,
                 monthly_contribution,
@@ -76,35 +536,190 @@ class SimulationService:
                 rebalancing,
             )
 
+        return summary, self._downsample_snapshots(
+            monthly_snapshots, resolution, max_points
+        )
+
     def _fetch_portfolio_prices(
-        self, portfolio: list[PortfolioItem], start_date: date, end_date: date
-    ) -> dict[str, pd.DataFrame]:
-        """Fetch price data for all tickers in portfolio."""
-        price_data = {}
+        self, tickers: list[str], start_date: date, end_date: date
+    ) -> PricePanel:
+        """
+        Fetch price data for all tickers as one panel.
+
+        Unless the caller prefetched them, tickers missing from the price
+        cache are first fetched from the market data provider with one
+        batch request, as concurrent provider calls are not safe for every
+        provider (yf.download keeps its results in module globals). The
+        tickers are then read concurrently, each with its own database
+        session, so a portfolio waits for the slowest read rather than the
+        sum of all of them.
+        Cached tickers never touch the database.
+        """
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+
+        uncached = [
+            ticker
+            for ticker in tickers
+            if not self.prefetched
+            and not price_cache.contains(ticker, start_date, end_date)
+        ]
+        if uncached:
+            self.etf_service.prefetch_price_history(uncached, start_date, end_date)
+
+        max_workers = min(settings.price_fetch_concurrency, len(tickers))
+
+        if max_workers <= 1:
+            series = [
+                self.etf_service.get_price_series(ticker, start_date, end_date)
+                for ticker in tickers
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                series = list(
+                    executor.map(
+                        lambda ticker: self._load_ticker_prices_in_session(
+                            ticker, start_date, end_date
+                        ),
+                        tickers,
+                    )
+                )
+
+        return PricePanel.from_series([s for s in series if len(s) > 0])
+
+    def _load_ticker_prices_in_session(
+        self, ticker: str, start_date: date, end_date: date
+    ) -> PriceSeries:
+        """Load one ticker's prices using a dedicated database session."""
+        db = SessionLocal()
+        try:
+            etf_service = ETFService(db, self.etf_service.provider)
+            return etf_service.get_price_series(ticker, start_date, end_date)
+        finally:
+            db.close()
+
+    def _simulate_vectorized(
+        self,
+        portfolio: list[PortfolioItem],
+        investment_type: InvestmentType,
+        initial_amount: float,
+        monthly_contribution: float,
+        panel: PricePanel,
+        start_date: date,
+        end_date: date,
+        rebalancing: RebalancingFrequency,
+        resolution: Resolution = Resolution.MONTHLY,
+        max_points: int | None = None,
+    ) -> tuple[SimulationSummary, list[MonthlySnapshot]]:
+        """Simulate lump sum or DCA investment with the vectorized engine."""
+        weights = self._portfolio_weights(portfolio, panel)
 
+        if investment_type == InvestmentType.LUMP_SUM:
+            monthly_contribution = 0.0
+
+        result = simulate_portfolio(
+            panel,
+            weights,
+            initial_amount,
+            monthly_contribution,
+            rebalancing,
+        )
+
+        return self._build_results(
+            result, start_date, end_date, resolution, max_points
+        )
+
+    def _portfolio_weights(
+        self, portfolio: list[PortfolioItem], panel: PricePanel
+    ) -> np.ndarray:
+        """Get target weights as fractions aligned with panel columns."""
+        weights = np.zeros(len(panel.tickers))
         for item in portfolio:
-            prices = self.etf_service.get_price_history(
-                item.ticker, start_date, end_date
+            if item.ticker in panel.tickers:
+                weights[panel.column(item.ticker)] += item.weight / 100
+
+        return weights
+
+    def _build_results(
+        self,
+        result: EngineResult,
+        start_date: date,
+        end_date: date,
+        resolution: Resolution = Resolution.MONTHLY,
+        max_points: int | None = None,
+    ) -> tuple[SimulationSummary, list[MonthlySnapshot]]:
+        """Build summary statistics and snapshots from engine output."""
+        # Snapshot on the first trading day of each period and the last day
+        rows = downsample_rows(
+            result.dates, result.portfolio_values, resolution, max_points
+        )
+
+        monthly_snapshots = [
+            MonthlySnapshot(
+                date=result.dates[i].item(),
+                portfolio_value=result.portfolio_values[i],
+                invested_amount=result.invested_amounts[i],
+                dividends_received=result.cumulative_dividends[i],
             )
+            for i in rows
+        ]
 
-            if not prices:
-                continue
+        summary = self._build_summary(result, start_date, end_date)
 
-            # Convert to DataFrame
-            df = pd.DataFrame([p.model_dump() for p in prices])
-            df["date"] = pd.to_datetime(df["date"])
-            df.set_index("date", inplace=True)
-            df.sort_index(inplace=True)
+        return summary, monthly_snapshots
 
-            price_data[item.ticker] = df
+    def _downsample_snapshots(
+        self,
+        snapshots: list[MonthlySnapshot],
+        resolution: Resolution,
+        max_points: int | None,
+    ) -> list[MonthlySnapshot]:
+        """Reduce monthly snapshots to a coarser resolution or point count."""
+        if not snapshots:
+            return snapshots
+
+        rows = downsample_rows(
+            np.array([s.date for s in snapshots], dtype="datetime64[D]"),
+            np.array([s.portfolio_value for s in snapshots]),
+            resolution,
+            max_points,
+        )
+
+        return [snapshots[i] for i in rows]
+
+    def _percentile_band(self, values: np.ndarray) -> PercentileBand:
+        """Summarize per-path values by their percentiles."""
+        p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+
+        return PercentileBand(
+            p5=round(p5, 2),
+            p25=round(p25, 2),
+            p50=round(p50, 2),
+            p75=round(p75, 2),
+            p95=round(p95, 2),
+        )
 
-        return price_data
+    def _build_summary(
+        self, result: EngineResult, start_date: date, end_date: date
+    ) -> SimulationSummary:
+        """Calculate summary statistics from engine output."""
+        total_invested = result.total_invested
+        final_value = result.final_value
+        years = get_years_between_dates(start_date, end_date)
+
+        return SimulationSummary(
+            total_invested=total_invested,
+            final_value=final_value,
+            total_return_pct=calculate_total_return(total_invested, final_value),
+            cagr=calculate_cagr(total_invested, final_value, years),
+            mdd=calculate_mdd(result.portfolio_values),
+            total_dividends=result.total_dividends,
+        )
 
     def _simulate_lump_sum(
         self,
         portfolio: list[PortfolioItem],
         initial_amount: float,
-        price_data: dict[str, pd.DataFrame],
+        price_data: dict[str, "pd.DataFrame"],
         start_date: date,
         end_date: date,
         rebalancing: RebalancingFrequency,
@@ -134,9 +749,12 @@ class SimulationService:
         total_dividends = 0.0
         monthly_snapshots = []
 
+        last_snapshot_month = None
         last_rebalance_date = all_dates[0]
 
         for current_date in all_dates:
+            current_month = (current_date.year, current_date.month)
+
             # Calculate current portfolio value
             portfolio_value = 0.0
             for ticker, num_shares in shares.items():
@@ -170,8 +788,12 @@ class SimulationService:
                 )
                 last_rebalance_date = current_date
 
-            # Monthly snapshot
-            if current_date.day == 1 or current_date == all_dates[-1]:
+            # Monthly snapshot (first trading day of month or last day)
+            if (
+                current_month != last_snapshot_month
+                or current_date == all_dates[-1]
+            ):
+                last_snapshot_month = current_month
                 monthly_snapshots.append(
                     MonthlySnapshot(
                         date=current_date.date(),
@@ -184,9 +806,7 @@ class SimulationService:
         # Calculate summary statistics
         final_value = portfolio_values[-1] if portfolio_values else 0.0
         total_return_pct = calculate_total_return(initial_amount, final_value)
-        years = get_years_between_dates(
-            pd.Timestamp(start_date), pd.Timestamp(end_date)
-        )
+        years = get_years_between_dates(start_date, end_date)
         cagr = calculate_cagr(initial_amount, final_value, years)
         mdd = calculate_mdd(portfolio_values)
 
@@ -206,7 +826,7 @@ class SimulationService:
         portfolio: list[PortfolioItem],
         initial_amount: float,
         monthly_contribution: float,
-        price_data: dict[str, pd.DataFrame],
+        price_data: dict[str, "pd.DataFrame"],
         start_date: date,
         end_date: date,
         rebalancing: RebalancingFrequency,
@@ -243,6 +863,7 @@ class SimulationService:
         monthly_snapshots = []
 
         last_contribution_month = None
+        last_snapshot_month = None
         last_rebalance_date = all_dates[0]
 
         for current_date in all_dates:
@@ -301,8 +922,12 @@ class SimulationService:
                 )
                 last_rebalance_date = current_date
 
-            # Monthly snapshot (first day of month or last day)
-            if current_date.day == 1 or current_date == all_dates[-1]:
+            # Monthly snapshot (first trading day of month or last day)
+            if (
+                current_month != last_snapshot_month
+                or current_date == all_dates[-1]
+            ):
+                last_snapshot_month = current_month
                 monthly_snapshots.append(
                     MonthlySnapshot(
                         date=current_date.date(),
@@ -315,9 +940,7 @@ class SimulationService:
         # Calculate summary statistics
         final_value = portfolio_values[-1] if portfolio_values else 0.0
         total_return_pct = calculate_total_return(total_invested, final_value)
-        years = get_years_between_dates(
-            pd.Timestamp(start_date), pd.Timestamp(end_date)
-        )
+        years = get_years_between_dates(start_date, end_date)
         cagr = calculate_cagr(total_invested, final_value, years)
         mdd = calculate_mdd(portfolio_values)
 
@@ -334,8 +957,8 @@ class SimulationService:
 
     def _should_rebalance(
         self,
-        current_date: pd.Timestamp,
-        last_rebalance_date: pd.Timestamp,
+        current_date: "pd.Timestamp",
+        last_rebalance_date: "pd.Timestamp",
         rebalancing: RebalancingFrequency,
     ) -> bool:
         """Check if portfolio should be rebalanced."""
@@ -355,8 +978,8 @@ class SimulationService:
         self,
         portfolio: list[PortfolioItem],
         shares: dict[str, float],
-        price_data: dict[str, pd.DataFrame],
-        current_date: pd.Timestamp,
+        price_data: dict[str, "pd.DataFrame"],
+        current_date: "pd.Timestamp",
         portfolio_value: float,
     ) -> dict[str, float]:
         """Rebalance portfolio to target weights."""
@@ -0,0 +1,39 @@
+"""Runtime request counts per ticker."""
+
+import threading
+from collections import Counter
+
+
+class TickerPopularity:
+    """Thread-safe count of price series requests per ticker."""
+
+    def __init__(self):
+        """Initialize empty request counts."""
+        self._counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, ticker: str) -> None:
+        """Count one request for a ticker's prices."""
+        with self._lock:
+            self._counts[ticker] += 1
+
+    def most_requested(self, limit: int, exclude: set[str] | None = None) -> list[str]:
+        """
+        Get the most requested tickers.
+
+        Args:
+            limit: Maximum number of tickers
+            exclude: Tickers left out of the ranking
+
+        Returns:
+            Tickers, most requested first
+        """
+        exclude = exclude or set()
+        with self._lock:
+            ranking = self._counts.most_common()
+
+        return [ticker for ticker, _ in ranking if ticker not in exclude][:limit]
+
+
+# Request counts per ticker, used to pick the tickers to warm up
+ticker_popularity = TickerPopularity()
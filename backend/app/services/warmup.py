@@ -0,0 +1,170 @@
+"""Warm-up and daily refresh of frequently used price history."""
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.services.etf_service import ETFService
+from app.services.ticker_popularity import ticker_popularity
+
+
+class PriceWarmup:
+    """
+    Background preloading of hot tickers' price history.
+
+    At startup the popular ETFs and the most requested tickers are loaded
+    into the database and the price caches, so the first simulations
+    after a deploy do not wait on the market data provider. Afterwards
+    they are refreshed every day after the US market close. Coverage
+    tracking limits each refresh to the trading days added since the last
+    one. Every worker warms its own in-memory caches.
+    """
+
+    def __init__(self):
+        """Initialize an idle warm-up."""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._status: dict[str, Any] = {
+            "state": "idle",
+            "loaded": 0,
+            "failed": 0,
+            "total": 0,
+            "last_refresh": None,
+            "next_refresh": None,
+        }
+
+    def start(self) -> None:
+        """Start warming up and refreshing in a background thread."""
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="price-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after the ticker being loaded."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def status(self) -> dict[str, Any]:
+        """
+        Get the progress of the current warm-up or refresh.
+
+        Returns:
+            State ("idle", "warming", "refreshing" or "ready"), tickers
+            loaded, failed and in total, progress in percent, and the
+            times of the last and next refresh
+        """
+        with self._lock:
+            status = dict(self._status)
+
+        total = status["total"]
+        done = status["loaded"] + status["failed"]
+        status["progress"] = round(100 * done / total, 1) if total else 0.0
+        return status
+
+    def hot_tickers(self) -> list[str]:
+        """Get the popular ETFs followed by the most requested tickers."""
+        popular = [etf["ticker"] for etf in ETFService.POPULAR_ETFS]
+        requested = ticker_popularity.most_requested(
+            settings.warmup_top_tickers, exclude=set(popular)
+        )
+        return popular + requested
+
+    def load(self, state: str) -> None:
+        """
+        Load every hot ticker's price history up to today.
+
+        Only date ranges not loaded before are fetched, in one batch
+        request for tickers missing the same range. Each ticker's series
+        is then read once to fill the price caches.
+
+        Args:
+            state: State reported while loading
+        """
+        tickers = self.hot_tickers()
+        end_date = date.today()
+        start_date = end_date - timedelta(days=365 * settings.warmup_history_years)
+        self._update(state=state, loaded=0, failed=0, total=len(tickers))
+
+        db = SessionLocal()
+        try:
+            service = ETFService(db)
+            try:
+                service.prefetch_price_history(tickers, start_date, end_date)
+            except Exception:
+                # Tickers that could not be fetched are counted as failed below
+                db.rollback()
+
+            for ticker in tickers:
+                if self._stop.is_set():
+                    return
+
+                try:
+                    loaded = len(service.get_price_series(ticker, start_date, end_date))
+                except Exception:
+                    db.rollback()
+                    loaded = 0
+
+                with self._lock:
+                    self._status["loaded" if loaded else "failed"] += 1
+        finally:
+            db.close()
+
+        self._update(
+            state="ready", last_refresh=_utc_timestamp(datetime.now(timezone.utc))
+        )
+
+    def _run(self) -> None:
+        """Warm up, then refresh once a day until stopped."""
+        self.load("warming")
+
+        while True:
+            next_refresh = next_refresh_time(datetime.now(timezone.utc))
+            self._update(next_refresh=_utc_timestamp(next_refresh))
+
+            delay = (next_refresh - datetime.now(timezone.utc)).total_seconds()
+            if self._stop.wait(max(delay, 0)):
+                return
+
+            self.load("refreshing")
+
+    def _update(self, **values: Any) -> None:
+        """Update the reported status."""
+        with self._lock:
+            self._status.update(values)
+
+
+def next_refresh_time(now: datetime) -> datetime:
+    """
+    Get the next daily refresh time after a moment.
+
+    Args:
+        now: Current UTC time
+
+    Returns:
+        UTC time of the next refresh
+    """
+    refresh = now.replace(
+        hour=settings.warmup_refresh_hour_utc, minute=0, second=0, microsecond=0
+    )
+    if refresh <= now:
+        refresh += timedelta(days=1)
+    return refresh
+
+
+def _utc_timestamp(moment: datetime) -> str:
+    """Format a UTC datetime as ISO 8601."""
+    return moment.isoformat(timespec="seconds")
+
+
+# Background warm-up started by the application lifespan
+price_warmup = PriceWarmup()
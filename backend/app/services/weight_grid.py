@@ -0,0 +1,184 @@
+"""Portfolio weight grid sweep."""
+
+import functools
+import itertools
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.simulation import RebalancingFrequency
+from app.services.price_panel import PricePanel
+from app.services.process_pool import ProgressCallback, map_chunks
+from app.services.simulation_engine import simulate_batch
+
+# Largest number of portfolios evaluated by one sweep
+MAX_GRID_POINTS = 50_000
+
+# Arrays of shape (portfolios, days) alive at once while evaluating
+PORTFOLIO_ARRAYS = 7
+
+
+@dataclass
+class GridMetrics:
+    """Outcome of each portfolio of a weight grid."""
+
+    final_values: np.ndarray
+    invested_amounts: np.ndarray
+    max_drawdowns: np.ndarray
+
+    @classmethod
+    def concatenate(cls, parts: list["GridMetrics"]) -> "GridMetrics":
+        """Join the metrics of several chunks of portfolios."""
+        return cls(
+            final_values=np.concatenate([part.final_values for part in parts]),
+            invested_amounts=np.concatenate(
+                [part.invested_amounts for part in parts]
+            ),
+            max_drawdowns=np.concatenate([part.max_drawdowns for part in parts]),
+        )
+
+
+def grid_size(num_tickers: int, steps: int) -> int:
+    """Number of portfolios on a weight grid."""
+    return math.comb(steps + num_tickers - 1, num_tickers - 1)
+
+
+def weight_grid(num_tickers: int, steps: int) -> np.ndarray:
+    """
+    Enumerate every allocation of `steps` equal weight units to tickers.
+
+    Allocations are generated as "stars and bars": choosing the positions
+    of `num_tickers - 1` bars among `steps + num_tickers - 1` slots splits
+    the units into one group per ticker.
+
+    Args:
+        num_tickers: Number of tickers
+        steps: Number of weight units (100 / step in percent)
+
+    Returns:
+        Weights as fractions with shape (portfolios, tickers), in
+        lexicographic order of the bar positions
+    """
+    slots = steps + num_tickers - 1
+    bars = np.fromiter(
+        itertools.chain.from_iterable(
+            itertools.combinations(range(slots), num_tickers - 1)
+        ),
+        dtype=np.intp,
+    ).reshape(-1, num_tickers - 1)
+
+    edges = np.hstack(
+        [
+            np.full((len(bars), 1), -1),
+            bars,
+            np.full((len(bars), 1), slots),
+        ]
+    )
+
+    return (np.diff(edges, axis=1) - 1) / steps
+
+
+def evaluate_weights(
+    initial_amount: float,
+    monthly_contribution: float,
+    rebalancing: RebalancingFrequency,
+    panel: PricePanel,
+    weights: np.ndarray,
+) -> GridMetrics:
+    """
+    Simulate a stack of weight vectors on one price panel.
+
+    Args:
+        initial_amount: Initial investment amount
+        monthly_contribution: Monthly contribution (0 for lump sum)
+        rebalancing: Rebalancing frequency
+        panel: Aligned price data for the held tickers
+        weights: Weights as fractions with shape (portfolios, tickers)
+
+    Returns:
+        Final value, invested amount and maximum drawdown per portfolio
+    """
+    batch = simulate_batch(
+        panel,
+        weights,
+        np.full(len(weights), initial_amount),
+        np.full(len(weights), monthly_contribution),
+        rebalancing,
+    )
+
+    values = batch.portfolio_values
+    running_max = np.maximum.accumulate(values, axis=1)
+    ratios = np.divide(
+        values, running_max, out=np.ones_like(values), where=running_max > 0
+    )
+
+    return GridMetrics(
+        final_values=values[:, -1],
+        invested_amounts=batch.invested_amounts[:, -1],
+        max_drawdowns=ratios.min(axis=1) - 1.0,
+    )
+
+
+def sweep_weights(
+    panel: PricePanel,
+    weights: np.ndarray,
+    initial_amount: float,
+    monthly_contribution: float,
+    rebalancing: RebalancingFrequency,
+    max_workers: int,
+    chunk_bytes: int,
+    on_progress: ProgressCallback | None = None,
+) -> GridMetrics:
+    """
+    Evaluate weight vectors in memory-bounded chunks over a process pool.
+
+    As for batched scenario comparisons, portfolios holding the same set
+    of tickers are simulated together on a panel of just those tickers,
+    so every portfolio gets the result of simulating it on its own.
+
+    Args:
+        panel: Aligned price data for the grid tickers
+        weights: Weights as fractions with shape (portfolios, tickers)
+        initial_amount: Initial investment amount
+        monthly_contribution: Monthly contribution (0 for lump sum)
+        rebalancing: Rebalancing frequency
+        max_workers: Worker processes, capped at the number of CPUs
+        chunk_bytes: Memory budget of one chunk
+        on_progress: Called with the fraction of chunks evaluated
+
+    Returns:
+        Final value, invested amount and maximum drawdown per portfolio
+    """
+    held_sets, groups = np.unique(weights > 0, axis=0, return_inverse=True)
+
+    panels, chunks, rows = [], [], []
+    for group, held in enumerate(held_sets):
+        group_rows = np.flatnonzero(groups == group)
+        group_panel = panel.select(
+            [ticker for ticker, is_held in zip(panel.tickers, held) if is_held]
+        )
+
+        per_chunk = max(1, chunk_bytes // (PORTFOLIO_ARRAYS * len(group_panel) * 8))
+        for start in range(0, len(group_rows), per_chunk):
+            chunk_rows = group_rows[start : start + per_chunk]
+            panels.append(group_panel)
+            chunks.append(weights[chunk_rows][:, held])
+            rows.append(chunk_rows)
+
+    evaluate = functools.partial(
+        evaluate_weights, initial_amount, monthly_contribution, rebalancing
+    )
+    parts = map_chunks(
+        evaluate, panels, chunks, max_workers=max_workers, on_progress=on_progress
+    )
+
+    # Restore grid order
+    order = np.argsort(np.concatenate(rows))
+    metrics = GridMetrics.concatenate(parts)
+
+    return GridMetrics(
+        final_values=metrics.final_values[order],
+        invested_amounts=metrics.invested_amounts[order],
+        max_drawdowns=metrics.max_drawdowns[order],
+    )
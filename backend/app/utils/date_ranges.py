@@ -0,0 +1,84 @@
+"""Date range utilities."""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+DateRange = tuple[date, date]
+
+
+def merge_date_ranges(ranges: list[DateRange]) -> list[DateRange]:
+    """
+    Merge overlapping or adjacent inclusive date ranges.
+
+    Args:
+        ranges: List of (start, end) date ranges, both ends inclusive
+
+    Returns:
+        Sorted list of disjoint, non-adjacent date ranges
+    """
+    merged: list[DateRange] = []
+
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def subtract_date_ranges(
+    start_date: date, end_date: date, covered: list[DateRange]
+) -> list[DateRange]:
+    """
+    Find the parts of an inclusive date range not covered by other ranges.
+
+    Args:
+        start_date: Start of the requested range
+        end_date: End of the requested range
+        covered: List of (start, end) date ranges already covered
+
+    Returns:
+        Sorted list of uncovered (start, end) date ranges
+    """
+    missing: list[DateRange] = []
+    cursor = start_date
+
+    for start, end in merge_date_ranges(covered):
+        if end < cursor:
+            continue
+        if start > end_date:
+            break
+        if start > cursor:
+            missing.append((cursor, start - timedelta(days=1)))
+        cursor = end + timedelta(days=1)
+
+    if cursor <= end_date:
+        missing.append((cursor, end_date))
+
+    return missing
+
+
+def missing_trading_ranges(
+    start_date: date, end_date: date, covered: list[DateRange]
+) -> list[DateRange]:
+    """
+    Find the uncovered parts of a date range that can hold trading days.
+
+    Like subtract_date_ranges, but gaps falling entirely on a weekend are
+    left out since markets have no prices for them.
+
+    Args:
+        start_date: Start of the requested range
+        end_date: End of the requested range
+        covered: List of (start, end) date ranges already covered
+
+    Returns:
+        Sorted list of uncovered (start, end) date ranges with a weekday
+    """
+    return [
+        (start, end)
+        for start, end in subtract_date_ranges(start_date, end_date, covered)
+        if np.busday_count(start, end + timedelta(days=1)) > 0
+    ]
@@ -0,0 +1,132 @@
+"""Time series resolution and downsampling utilities."""
+
+import numpy as np
+
+from app.models.etf import Resolution
+
+
+def period_keys(dates: np.ndarray, resolution: Resolution) -> np.ndarray:
+    """
+    Map dates to the period they fall in.
+
+    Weeks start on Monday and quarters on January, April, July and
+    October.
+
+    Args:
+        dates: Dates as datetime64[D]
+        resolution: Period length
+
+    Returns:
+        Integer period key per date
+    """
+    days = dates.astype("datetime64[D]").astype(np.int64)
+
+    if resolution == Resolution.DAILY:
+        return days
+    if resolution == Resolution.WEEKLY:
+        # 1970-01-01 was a Thursday
+        return (days + 3) // 7
+
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    if resolution == Resolution.MONTHLY:
+        return months
+    return months // 3
+
+
+def resample_rows(dates: np.ndarray, resolution: Resolution) -> np.ndarray:
+    """
+    Find the first row of each period plus the last row.
+
+    Args:
+        dates: Sorted dates as datetime64[D]
+        resolution: Period length
+
+    Returns:
+        Sorted row indices
+    """
+    if len(dates) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    keys = period_keys(dates, resolution)
+    is_kept = np.r_[True, keys[1:] != keys[:-1]]
+    is_kept[-1] = True
+
+    return np.flatnonzero(is_kept)
+
+
+def lttb_rows(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept. The points in between are
+    split into equal buckets, and from each bucket the point forming the
+    largest triangle with the previously selected point and the average
+    of the next bucket is kept, which preserves peaks and troughs.
+
+    Args:
+        x: Increasing x values
+        y: Y values
+        max_points: Maximum number of points to keep (at least 3)
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    num_points = len(x)
+    if max_points >= num_points or max_points < 3:
+        return np.arange(num_points)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket boundaries over the points between the first and the last
+    bounds = np.floor(
+        np.arange(max_points - 1) * (num_points - 2) / (max_points - 2)
+    ).astype(np.intp) + 1
+    bounds[-1] = num_points - 1
+
+    rows = np.empty(max_points, dtype=np.intp)
+    rows[0] = 0
+    rows[-1] = num_points - 1
+
+    selected = 0
+    for bucket in range(max_points - 2):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        next_end = bounds[bucket + 2] if bucket + 2 < len(bounds) else num_points
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[selected] - next_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (next_y - y[selected])
+        )
+        selected = start + int(areas.argmax())
+        rows[bucket + 1] = selected
+
+    return rows
+
+
+def downsample_rows(
+    dates: np.ndarray,
+    values: np.ndarray,
+    resolution: Resolution,
+    max_points: int | None = None,
+) -> np.ndarray:
+    """
+    Select the rows of a daily series to return at a resolution.
+
+    Args:
+        dates: Sorted dates as datetime64[D]
+        values: Values used to preserve the shape of the series
+        resolution: Period length
+        max_points: Maximum number of rows, or None for no limit
+
+    Returns:
+        Sorted row indices
+    """
+    rows = resample_rows(dates, resolution)
+
+    if max_points is not None and len(rows) > max_points:
+        days = dates[rows].astype("datetime64[D]").astype(np.float64)
+        rows = rows[lttb_rows(days, values[rows], max_points)]
+
+    return rows
@@ -1,7 +1,8 @@
 """Financial calculation utilities."""
 
+from datetime import date
+
 import numpy as np
-import pandas as pd
 
 
 def calculate_cagr(
@@ -25,17 +26,17 @@ def calculate_cagr(
     return round(cagr, 2)
 
 
-def calculate_mdd(values: list[float]) -> float:
+def calculate_mdd(values: list[float] | np.ndarray) -> float:
     """
     Calculate Maximum Drawdown (MDD).
 
     Args:
-        values: List of portfolio values over time
+        values: List or array of portfolio values over time
 
     Returns:
         MDD as a percentage (negative value)
     """
-    if not values:
+    if len(values) == 0:
         return 0.0
 
     arr = np.array(values)
@@ -65,7 +66,7 @@ def calculate_total_return(
     return round(((final_value - initial_value) / initial_value) * 100, 2)
 
 
-def get_years_between_dates(start_date: pd.Timestamp, end_date: pd.Timestamp) -> float:
+def get_years_between_dates(start_date: date, end_date: date) -> float:
     """
     Calculate years between two dates.
 
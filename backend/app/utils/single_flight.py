@@ -0,0 +1,67 @@
+"""Coalescing of concurrent work on the same keys."""
+
+import threading
+from collections.abc import Hashable, Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class SingleFlight:
+    """
+    Registry of work in flight, so concurrent callers share one execution.
+
+    A caller claims the keys nobody else is working on, does the work for
+    them and releases them on exit. For keys already claimed it gets
+    futures completed when their owner releases them. The futures can be
+    waited on from threads, or awaited through asyncio.wrap_future.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._flights: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"led": 0, "joined": 0}
+
+    @contextmanager
+    def claim(
+        self, keys: Iterable[Hashable]
+    ) -> Iterator[tuple[list[Hashable], list[Future]]]:
+        """
+        Claim the keys not in flight for the duration of the block.
+
+        Callers must leave the block before waiting on the returned
+        futures, or two callers each waiting for a key the other holds
+        would deadlock.
+
+        Args:
+            keys: Keys of the work the caller needs
+
+        Yields:
+            Tuple of (keys claimed by the caller, futures of the keys
+            claimed by other callers)
+        """
+        claimed, pending = [], []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                flight = self._flights.get(key)
+                if flight is None:
+                    self._flights[key] = Future()
+                    claimed.append(key)
+                else:
+                    pending.append(flight)
+
+            self._stats["led"] += len(claimed)
+            self._stats["joined"] += len(pending)
+
+        try:
+            yield claimed, pending
+        finally:
+            with self._lock:
+                flights = [self._flights.pop(key) for key in claimed]
+            for flight in flights:
+                flight.set_result(None)
+
+    def stats(self) -> dict[str, int]:
+        """Get the number of keys claimed and joined plus those in flight."""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
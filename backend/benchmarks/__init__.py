@@ -0,0 +1 @@
+"""Offline benchmarks of the simulation and price data paths."""
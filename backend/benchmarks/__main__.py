@@ -0,0 +1,178 @@
+"""
+Run the benchmark suite against a synthetic market.
+
+Run from the backend directory:
+
+    uv run python -m benchmarks [--quick] [--baseline PATH] [--update-baseline]
+
+Everything runs offline: the market is generated from a seed into a
+temporary directory, read through LocalFileProvider and loaded into a
+temporary SQLite database. Results are written as JSON and compared with
+the baseline report, if one exists. The exit status is 1 when a benchmark
+regressed.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from benchmarks.report import (
+    build_report,
+    compare_reports,
+    format_comparisons,
+    read_report,
+    write_report,
+)
+from benchmarks.synthetic_market import write_market
+
+# Synthetic market
+MARKET_TICKERS = 5
+MARKET_START = date(1994, 1, 3)
+MARKET_END = date(2024, 12, 31)
+
+DEFAULT_OUTPUT = Path("benchmarks/results/latest.json")
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+
+
+def parse_args(argv: list[str] | None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store the results as the new baseline instead of comparing",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slowdown counted as a regression",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="run a smaller simulation matrix"
+    )
+    parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        help="only run benchmarks whose name contains this text (repeatable)",
+    )
+    return parser.parse_args(argv)
+
+
+def configure_environment(work_dir: Path, market_dir: Path) -> None:
+    """Point the application settings at the benchmark's own data."""
+    os.environ.update(
+        {
+            "DATABASE_URL": f"sqlite:///{work_dir / 'benchmarks.db'}",
+            "MARKET_DATA_PROVIDER": "local",
+            "MARKET_DATA_DIR": str(market_dir),
+            "PRICE_STORE_DIR": str(work_dir / "price-store"),
+            # Without the shared tier, uncached reads come from the price store
+            "PRICE_CACHE_DIR": "",
+            "WARMUP_ENABLED": "false",
+            "DEBUG": "false",
+        }
+    )
+
+
+def run_benchmarks(args: argparse.Namespace, work_dir: Path) -> dict[str, Any]:
+    """
+    Generate the market, then run the selected benchmarks.
+
+    Args:
+        args: Command line arguments
+        work_dir: Directory for the market, database and price store
+
+    Returns:
+        Measurements keyed by benchmark name
+    """
+    market_dir = work_dir / "market"
+    tickers = write_market(
+        market_dir, MARKET_TICKERS, MARKET_START, MARKET_END, args.seed
+    )
+    configure_environment(work_dir, market_dir)
+
+    # Imports the application, which reads the environment set above
+    from benchmarks import suite
+
+    results: dict[str, Any] = {}
+
+    def run(benchmarks: list[suite.Benchmark]) -> None:
+        for benchmark in benchmarks:
+            if args.filter and not any(f in benchmark.name for f in args.filter):
+                continue
+
+            result = suite.measure(benchmark, args.repeats, args.warmup)
+            results[benchmark.name] = result
+            print(
+                f"{benchmark.name:<48} {result['median_seconds'] * 1000:10.2f}ms",
+                flush=True,
+            )
+
+    run(suite.ingest_benchmarks(tickers, MARKET_END))
+    suite.load_market(tickers, MARKET_END)
+    run(suite.loaded_benchmarks(tickers, MARKET_END, args.seed, args.quick))
+
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks, write the report and compare it with the baseline.
+
+    Args:
+        argv: Command line arguments, or None for sys.argv
+
+    Returns:
+        Exit status, 1 if a benchmark regressed
+    """
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="etf-benchmarks-") as work_dir:
+        results = run_benchmarks(args, Path(work_dir))
+
+    report = build_report(results, args.seed, args.quick)
+    write_report(report, args.output)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        write_report(report, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline")
+        return 0
+
+    baseline = read_report(args.baseline)
+    if baseline["platform"] != report["platform"]:
+        print(
+            f"\nWarning: the baseline was recorded on {baseline['platform']}; "
+            "run --update-baseline on this machine for comparable timings"
+        )
+
+    comparisons = compare_reports(report, baseline, args.threshold)
+    print(f"\nCompared with {args.baseline}:\n{format_comparisons(comparisons)}")
+
+    regressions = [c for c in comparisons if c["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Benchmark result files and comparison against a baseline."""
+
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+# Timing differences below this many seconds are treated as noise
+NOISE_FLOOR_SECONDS = 0.001
+
+
+def build_report(
+    results: dict[str, dict[str, Any]], seed: int, quick: bool
+) -> dict[str, Any]:
+    """
+    Build a machine-readable benchmark report.
+
+    Args:
+        results: Measurements keyed by benchmark name
+        seed: Seed of the synthetic market
+        quick: Whether the smaller simulation matrix was run
+
+    Returns:
+        Report with the run environment and the results
+    """
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "quick": quick,
+        "results": results,
+    }
+
+
+def write_report(report: dict[str, Any], path: Path) -> None:
+    """Write a report as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+
+
+def read_report(path: Path) -> dict[str, Any]:
+    """Read a report written by write_report."""
+    return json.loads(path.read_text())
+
+
+def compare_reports(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[dict[str, Any]]:
+    """
+    Compare the fastest timings of two reports.
+
+    The fastest repetition is the least affected by other load on the
+    machine. A benchmark regressed when it grew by more than the threshold,
+    and improved when it shrank by as much, unless the difference is
+    within NOISE_FLOOR_SECONDS. Benchmarks missing from either report are
+    skipped.
+
+    Args:
+        current: Report of the current run
+        baseline: Report to compare against
+        threshold: Relative change counted as significant, e.g. 0.25
+
+    Returns:
+        Name, baseline and current fastest timings, ratio and status
+        ("regression", "improvement" or "unchanged") of each benchmark
+    """
+    comparisons = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        before, after = base["min_seconds"], result["min_seconds"]
+        ratio = after / before if before > 0 else float("inf")
+
+        status = "unchanged"
+        if abs(after - before) > NOISE_FLOOR_SECONDS:
+            if ratio > 1 + threshold:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold):
+                status = "improvement"
+
+        comparisons.append(
+            {
+                "name": name,
+                "baseline_seconds": before,
+                "current_seconds": after,
+                "ratio": round(ratio, 3),
+                "status": status,
+            }
+        )
+
+    return comparisons
+
+
+def format_comparisons(comparisons: list[dict[str, Any]]) -> str:
+    """Format comparisons as a text table, one benchmark per line."""
+    width = max((len(c["name"]) for c in comparisons), default=0)
+    lines = [
+        f"{c['name']:<{width}}  {c['baseline_seconds'] * 1000:10.2f}ms"
+        f"  {c['current_seconds'] * 1000:10.2f}ms  {c['ratio']:6.2f}x"
+        f"  {c['status']}"
+        for c in comparisons
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,329 @@
+"""
+Benchmark cases for the simulation and price data paths.
+
+Importing this module imports the application, so the environment has to
+point it at the synthetic market first (see benchmarks.__main__).
+"""
+
+import gc
+import itertools
+import shutil
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import Base, SessionLocal, engine
+from app.db.schema import create_tables
+from app.models.simulation import (
+    ComparisonScenario,
+    InvestmentType,
+    PortfolioItem,
+    RebalancingFrequency,
+)
+from app.services.etf_service import ETFService
+from app.services.price_cache import price_cache
+from app.services.result_cache import simulation_result_cache
+from app.services.simulation_service import SimulationService
+from app.utils.finance import calculate_mdd
+
+# Simulation matrix
+INVESTMENT_TYPES = [InvestmentType.LUMP_SUM, InvestmentType.DCA]
+HORIZON_YEARS = [1, 5, 10, 20, 30]
+TICKER_COUNTS = [1, 3, 5]
+REBALANCING = list(RebalancingFrequency)
+
+# Smaller simulation matrix of --quick runs
+QUICK_HORIZON_YEARS = [1, 10, 30]
+QUICK_TICKER_COUNTS = [1, 5]
+
+INITIAL_AMOUNT = 10_000.0
+MONTHLY_CONTRIBUTION = 500.0
+
+
+@dataclass
+class Benchmark:
+    """A timed operation with the untimed setup run before each repetition."""
+
+    name: str
+    run: Callable[[], Any]
+    setup: Callable[[], None] | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+def measure(benchmark: Benchmark, repeats: int, warmup: int) -> dict[str, Any]:
+    """
+    Time a benchmark.
+
+    As in timeit, garbage collection is disabled while timing, so
+    collections triggered by earlier benchmarks do not add noise.
+
+    Args:
+        benchmark: Benchmark to time
+        repeats: Number of timed repetitions
+        warmup: Number of untimed repetitions run first
+
+    Returns:
+        Benchmark parameters and the min, median and max seconds of the
+        timed repetitions
+    """
+    timings = []
+    for repetition in range(warmup + repeats):
+        if benchmark.setup is not None:
+            benchmark.setup()
+        gc.collect()
+
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            benchmark.run()
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+
+        if repetition >= warmup:
+            timings.append(elapsed)
+
+    return {
+        "params": benchmark.params,
+        "repeats": repeats,
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "max_seconds": max(timings),
+    }
+
+
+@contextmanager
+def session() -> Iterator[Session]:
+    """Open a database session for one benchmark repetition."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def reset_database() -> None:
+    """Empty the database, the price store and all caches."""
+    Base.metadata.drop_all(bind=engine)
+    create_tables()
+    if settings.price_store_dir:
+        shutil.rmtree(Path(settings.price_store_dir), ignore_errors=True)
+    clear_caches()
+
+
+def clear_caches() -> None:
+    """Empty the in-memory price and simulation result caches."""
+    price_cache.clear()
+    simulation_result_cache.clear()
+
+
+def equal_weights(tickers: list[str]) -> list[PortfolioItem]:
+    """Build a portfolio holding the tickers in equal weights."""
+    weights = np.diff(np.linspace(0, 100, len(tickers) + 1).round(2))
+    return [
+        PortfolioItem(ticker=ticker, weight=float(weight))
+        for ticker, weight in zip(tickers, weights)
+    ]
+
+
+def years_before(end_date: date, years: int) -> date:
+    """Get the date a number of years before another date."""
+    return end_date.replace(year=end_date.year - years)
+
+
+def ingest_benchmarks(tickers: list[str], end_date: date) -> list[Benchmark]:
+    """Loading full price histories from the provider into an empty database."""
+    start_date = years_before(end_date, 30)
+
+    def ingest(count: int) -> Callable[[], None]:
+        def run() -> None:
+            with session() as db:
+                ETFService(db).prefetch_price_history(
+                    tickers[:count], start_date, end_date
+                )
+
+        return run
+
+    return [
+        Benchmark(
+            name=f"ingest/{count}tickers/30y",
+            run=ingest(count),
+            setup=reset_database,
+            params={"tickers": count, "years": 30},
+        )
+        for count in (1, len(tickers))
+    ]
+
+
+def read_benchmarks(tickers: list[str], end_date: date) -> list[Benchmark]:
+    """Reading loaded price histories from the database, store and cache."""
+    start_date = years_before(end_date, 30)
+    params = {"tickers": len(tickers), "years": 30}
+    size = f"{len(tickers)}tickers/30y"
+
+    def query() -> None:
+        with session() as db:
+            ETFService(db).query_price_series(tickers, start_date, end_date)
+
+    def series() -> None:
+        with session() as db:
+            service = ETFService(db)
+            for ticker in tickers:
+                service.get_price_series(ticker, start_date, end_date)
+
+    return [
+        Benchmark(name=f"read/query/{size}", run=query, params=params),
+        Benchmark(
+            name=f"read/series_uncached/{size}",
+            run=series,
+            setup=price_cache.clear,
+            params=params,
+        ),
+        Benchmark(name=f"read/series_cached/{size}", run=series, params=params),
+    ]
+
+
+def simulation_benchmarks(
+    tickers: list[str], end_date: date, quick: bool
+) -> list[Benchmark]:
+    """Single simulations over the investment type, horizon, size and rebalancing."""
+    horizons = QUICK_HORIZON_YEARS if quick else HORIZON_YEARS
+    ticker_counts = QUICK_TICKER_COUNTS if quick else TICKER_COUNTS
+
+    def simulate(
+        investment_type: InvestmentType,
+        years: int,
+        count: int,
+        rebalancing: RebalancingFrequency,
+    ) -> Callable[[], None]:
+        def run() -> None:
+            with session() as db:
+                SimulationService(db).run_simulation(
+                    portfolio=equal_weights(tickers[:count]),
+                    investment_type=investment_type,
+                    initial_amount=INITIAL_AMOUNT,
+                    monthly_contribution=MONTHLY_CONTRIBUTION,
+                    start_date=years_before(end_date, years),
+                    end_date=end_date,
+                    rebalancing=rebalancing,
+                )
+
+        return run
+
+    return [
+        Benchmark(
+            name=(
+                f"simulate/{investment_type.value}/{years}y/{count}tickers/"
+                f"{rebalancing.value}"
+            ),
+            run=simulate(investment_type, years, count, rebalancing),
+            setup=simulation_result_cache.clear,
+            params={
+                "investment_type": investment_type.value,
+                "years": years,
+                "tickers": count,
+                "rebalancing": rebalancing.value,
+            },
+        )
+        for investment_type, years, count, rebalancing in itertools.product(
+            INVESTMENT_TYPES, horizons, ticker_counts, REBALANCING
+        )
+    ]
+
+
+def compare_benchmarks(tickers: list[str], end_date: date) -> list[Benchmark]:
+    """Comparisons of one scenario per investment type and ticker subset."""
+    scenarios = [
+        ComparisonScenario(
+            name=f"{investment_type.value} {count}",
+            portfolio=equal_weights(tickers[:count]),
+            investment_type=investment_type,
+            initial_amount=INITIAL_AMOUNT,
+            monthly_contribution=MONTHLY_CONTRIBUTION,
+        )
+        for investment_type in INVESTMENT_TYPES
+        for count in (1, 3, len(tickers))
+    ]
+
+    def compare(years: int) -> Callable[[], None]:
+        def run() -> None:
+            with session() as db:
+                SimulationService(db).run_batch(
+                    scenarios=scenarios,
+                    start_date=years_before(end_date, years),
+                    end_date=end_date,
+                    rebalancing=RebalancingFrequency.YEARLY,
+                )
+
+        return run
+
+    return [
+        Benchmark(
+            name=f"compare/{len(scenarios)}scenarios/{years}y",
+            run=compare(years),
+            setup=simulation_result_cache.clear,
+            params={"scenarios": len(scenarios), "years": years},
+        )
+        for years in (10, 30)
+    ]
+
+
+def finance_benchmarks(seed: int) -> list[Benchmark]:
+    """Metric calculations of app.utils.finance on a 30-year daily series."""
+    rng = np.random.default_rng(seed)
+    values = 10_000 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, 30 * 252)))
+
+    return [
+        Benchmark(
+            name="finance/mdd/30y",
+            run=lambda: calculate_mdd(values),
+            params={"values": len(values)},
+        )
+    ]
+
+
+def load_market(tickers: list[str], end_date: date) -> None:
+    """
+    Load 30 years of every ticker into an empty database.
+
+    Args:
+        tickers: Tickers of the synthetic market
+        end_date: Last date of the synthetic market
+    """
+    reset_database()
+    with session() as db:
+        ETFService(db).prefetch_price_history(
+            tickers, years_before(end_date, 30), end_date
+        )
+
+
+def loaded_benchmarks(
+    tickers: list[str], end_date: date, seed: int, quick: bool
+) -> list[Benchmark]:
+    """
+    Build the benchmarks that run against a loaded market.
+
+    Args:
+        tickers: Tickers of the synthetic market
+        end_date: Last date of the synthetic market
+        seed: Seed of the synthetic market
+        quick: Whether to run the smaller simulation matrix
+
+    Returns:
+        Benchmarks
+    """
+    return (
+        read_benchmarks(tickers, end_date)
+        + simulation_benchmarks(tickers, end_date, quick)
+        + compare_benchmarks(tickers, end_date)
+        + finance_benchmarks(seed)
+    )
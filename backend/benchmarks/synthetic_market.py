@@ -0,0 +1,117 @@
+"""Seeded synthetic market data for offline benchmarks."""
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Trading days per year used to scale annual drift and volatility
+TRADING_DAYS_PER_YEAR = 252
+
+
+def synthetic_tickers(count: int) -> list[str]:
+    """
+    Get the ticker symbols of a synthetic market.
+
+    Args:
+        count: Number of tickers
+
+    Returns:
+        Tickers SYN01, SYN02, ...
+    """
+    return [f"SYN{number:02d}" for number in range(1, count + 1)]
+
+
+def generate_history(
+    ticker_index: int, start_date: date, end_date: date, seed: int
+) -> pd.DataFrame:
+    """
+    Generate one ticker's daily price history.
+
+    Closes follow a geometric Brownian motion over business days, with
+    drift and volatility varying by ticker. A dividend is paid on the last
+    business day of each quarter, and adj_close is back-adjusted for
+    dividends the way Yahoo Finance adjusts it.
+
+    Args:
+        ticker_index: Position of the ticker in the market, which picks its
+            drift, volatility and random stream
+        start_date: First date
+        end_date: Last date
+        seed: Seed of the market
+
+    Returns:
+        Price history with date, open, high, low, close, adj_close, volume
+        and dividend columns
+    """
+    rng = np.random.default_rng([seed, ticker_index])
+    dates = pd.bdate_range(start_date, end_date)
+
+    drift = 0.04 + 0.01 * (ticker_index % 5)
+    volatility = 0.12 + 0.04 * (ticker_index % 4)
+    dividend_yield = 0.01 + 0.005 * (ticker_index % 4)
+
+    daily_returns = rng.normal(
+        (drift - volatility**2 / 2) / TRADING_DAYS_PER_YEAR,
+        volatility / np.sqrt(TRADING_DAYS_PER_YEAR),
+        len(dates),
+    )
+    close = 20.0 * (1 + ticker_index) * np.exp(np.cumsum(daily_returns))
+
+    quarter_end = dates.to_series().groupby(dates.to_period("Q")).max()
+    dividend = np.where(dates.isin(quarter_end), close * dividend_yield / 4, 0.0)
+    dividend = dividend.round(4)
+
+    # Back-adjust every close before a dividend by (1 - dividend / prior close)
+    prior_close = np.concatenate([[close[0]], close[:-1]])
+    factors = np.where(dividend > 0, 1 - dividend / prior_close, 1.0)
+    adjustment = np.concatenate([np.cumprod(factors[::-1])[::-1][1:], [1.0]])
+
+    spread = np.abs(rng.normal(0, 0.005, len(dates)))
+    return pd.DataFrame(
+        {
+            "date": dates.date,
+            "open": close * (1 - spread / 2),
+            "high": close * (1 + spread),
+            "low": close * (1 - spread),
+            "close": close,
+            "adj_close": close * adjustment,
+            "volume": rng.integers(100_000, 5_000_000, len(dates)),
+            "dividend": dividend,
+        }
+    )
+
+
+def write_market(
+    data_dir: Path, tickers: int, start_date: date, end_date: date, seed: int
+) -> list[str]:
+    """
+    Write a synthetic market in the format read by LocalFileProvider.
+
+    Args:
+        data_dir: Directory for the `<TICKER>.csv` and `etfs.csv` files
+        tickers: Number of tickers
+        start_date: First date
+        end_date: Last date
+        seed: Seed of the market
+
+    Returns:
+        Tickers written
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    symbols = synthetic_tickers(tickers)
+
+    for index, ticker in enumerate(symbols):
+        history = generate_history(index, start_date, end_date, seed)
+        history.to_csv(data_dir / f"{ticker}.csv", index=False)
+
+    pd.DataFrame(
+        {
+            "ticker": symbols,
+            "name": [f"Synthetic ETF {ticker}" for ticker in symbols],
+            "category": "Synthetic",
+        }
+    ).to_csv(data_dir / "etfs.csv", index=False)
+
+    return symbols
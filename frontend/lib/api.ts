@@ -7,6 +7,16 @@ import type {
   SimulationResponse,
   ComparisonRequest,
   ComparisonResponse,
+  MonteCarloRequest,
+  MonteCarloResponse,
+  RollingWindowRequest,
+  RollingWindowResponse,
+  WeightGridRequest,
+  WeightGridResponse,
+  Job,
+  JobKind,
+  JobResultMap,
+  JobSubmission,
 } from '@/types/api'
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
@@ -56,4 +66,37 @@ export const simulationApi = {
     const response = await api.post('/simulation/compare', request)
     return response.data
   },
+
+  monteCarlo: async (request: MonteCarloRequest): Promise<MonteCarloResponse> => {
+    const response = await api.post('/simulation/monte-carlo', request)
+    return response.data
+  },
+
+  rolling: async (request: RollingWindowRequest): Promise<RollingWindowResponse> => {
+    const response = await api.post('/simulation/rolling', request)
+    return response.data
+  },
+
+  weightGrid: async (request: WeightGridRequest): Promise<WeightGridResponse> => {
+    const response = await api.post('/simulation/weight-grid', request)
+    return response.data
+  },
+}
+
+// Background job endpoints
+export const jobApi = {
+  submit: async (submission: JobSubmission): Promise<Job> => {
+    const response = await api.post('/jobs', submission)
+    return response.data
+  },
+
+  get: async (jobId: string): Promise<Job> => {
+    const response = await api.get(`/jobs/${jobId}`)
+    return response.data
+  },
+
+  getResult: async <K extends JobKind>(jobId: string): Promise<JobResultMap[K]> => {
+    const response = await api.get(`/jobs/${jobId}/result`)
+    return response.data
+  },
 }
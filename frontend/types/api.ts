@@ -30,11 +30,14 @@ export interface PriceData {
 export interface ETFHistory {
   ticker: string
   prices: PriceData[]
+  next_cursor?: string | null
 }
 
 // Simulation types
 export type InvestmentType = 'lump_sum' | 'dca'
 export type RebalancingFrequency = 'none' | 'quarterly' | 'yearly'
+export type SimulationEngine = 'loop' | 'vectorized'
+export type Resolution = 'daily' | 'weekly' | 'monthly' | 'quarterly'
 
 export interface PortfolioItem {
   ticker: string
@@ -49,6 +52,9 @@ export interface SimulationRequest {
   start_date: string
   end_date: string
   rebalancing: RebalancingFrequency
+  engine?: SimulationEngine
+  resolution?: Resolution
+  max_points?: number | null
 }
 
 export interface MonthlySnapshot {
@@ -100,3 +106,124 @@ export interface ScenarioResult {
 export interface ComparisonResponse {
   scenarios: ScenarioResult[]
 }
+
+// Monte Carlo types
+export interface MonteCarloRequest {
+  portfolio: PortfolioItem[]
+  investment_type: InvestmentType
+  initial_amount: number
+  monthly_contribution: number
+  start_date: string
+  end_date: string
+  rebalancing: RebalancingFrequency
+  horizon_years?: number
+  num_paths?: number
+  block_days?: number
+  seed?: number | null
+}
+
+export interface PercentileBand {
+  p5: number
+  p25: number
+  p50: number
+  p75: number
+  p95: number
+}
+
+export interface MonteCarloResponse {
+  num_paths: number
+  horizon_years: number
+  seed: number
+  total_invested: number
+  loss_probability: number
+  final_value: PercentileBand
+  cagr: PercentileBand
+  mdd: PercentileBand
+}
+
+// Rolling window types
+export interface RollingWindowRequest {
+  portfolio: PortfolioItem[]
+  investment_type: InvestmentType
+  initial_amount: number
+  monthly_contribution: number
+  start_date: string
+  end_date: string
+  rebalancing: RebalancingFrequency
+  horizon_years?: number
+}
+
+export interface RollingWindowResult {
+  start_date: string
+  end_date: string
+  total_invested: number
+  final_value: number
+  cagr: number
+  mdd: number
+}
+
+export interface RollingWindowResponse {
+  horizon_years: number
+  windows: RollingWindowResult[]
+  final_value: PercentileBand
+  cagr: PercentileBand
+  mdd: PercentileBand
+}
+
+// Weight grid types
+export interface WeightGridRequest {
+  tickers: string[]
+  step_pct?: number
+  investment_type: InvestmentType
+  initial_amount: number
+  monthly_contribution: number
+  start_date: string
+  end_date: string
+  rebalancing: RebalancingFrequency
+}
+
+export interface WeightGridPoint {
+  weights: number[]
+  total_invested: number
+  final_value: number
+  cagr: number
+  mdd: number
+}
+
+export interface WeightGridResponse {
+  tickers: string[]
+  total_invested: number
+  points: WeightGridPoint[]
+}
+
+// Background job types
+export type JobKind = 'run' | 'compare' | 'monte_carlo' | 'rolling' | 'weight_grid'
+
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed'
+
+export type JobSubmission =
+  | { kind: 'run'; request: SimulationRequest }
+  | { kind: 'compare'; request: ComparisonRequest }
+  | { kind: 'monte_carlo'; request: MonteCarloRequest }
+  | { kind: 'rolling'; request: RollingWindowRequest }
+  | { kind: 'weight_grid'; request: WeightGridRequest }
+
+export interface JobResultMap {
+  run: SimulationResponse
+  compare: ComparisonResponse
+  monte_carlo: MonteCarloResponse
+  rolling: RollingWindowResponse
+  weight_grid: WeightGridResponse
+}
+
+export interface Job {
+  id: string
+  kind: JobKind
+  status: JobStatus
+  progress: number
+  error: string | null
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+  expires_at: string | null
+}